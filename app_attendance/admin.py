@@ -1,5 +1,5 @@
 from django.contrib import admin
 
-from app_attendance.models import Status,Attendance
+from app_attendance.models import Status,Attendance,StudentAttendanceSummary,GroupDailyAttendance
 
-admin.site.register([Attendance,Status])
+admin.site.register([Attendance,Status,StudentAttendanceSummary,GroupDailyAttendance])
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AppAttendanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_attendance'
+
+    def ready(self):
+        import app_attendance.signals  # noqa: F401
+        from app_common.response_cache import track_model_versions
+        from app_attendance.models import Status
+
+        track_model_versions(Status)  # Ro‘yxat javoblari keshi shu modellar o‘zgarganda eskiradi
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_attendance.rollups import rebuild_rollups
+
+
+class Command(BaseCommand): # Davomat rollup jadvallarini Attendance yozuvlaridan noldan qayta quradi
+    help = "Rebuild StudentAttendanceSummary and GroupDailyAttendance from raw Attendance rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            students, days = rebuild_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {students} student summaries and {days} group daily rows"))
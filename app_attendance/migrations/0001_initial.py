@@ -0,0 +1,45 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('app_courses', '0002_initial'),
+        ('app_users', '0003_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Status',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=255)),
+            ],
+            options={
+                'verbose_name': 'Status',
+                'verbose_name_plural': 'Statuses',
+            },
+        ),
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='app_courses.group')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='app_users.student')),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='app_attendance.status')),
+            ],
+            options={
+                'verbose_name': 'Attendance',
+                'verbose_name_plural': 'Attendances',
+            },
+        ),
+    ]
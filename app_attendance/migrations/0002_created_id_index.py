@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_attendance', '0001_initial'),
+        ('app_courses', '0002_initial'),
+        ('app_users', '0003_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['created_at', 'id'], name='attendance_created_id_idx'),
+        ),
+    ]
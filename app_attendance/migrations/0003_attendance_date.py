@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:10
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_date(apps, schema_editor): # Mavjud yozuvlar uchun sana yaratilgan vaqtdan olinadi
+    Attendance = apps.get_model('app_attendance', 'Attendance')
+    Attendance.objects.update(date=TruncDate('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_attendance', '0002_created_id_index'),
+        ('app_courses', '0002_initial'),
+        ('app_users', '0003_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.RunPython(backfill_date, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['student', 'date'], name='attendance_student_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['group', 'date'], name='attendance_group_date_idx'),
+        ),
+    ]
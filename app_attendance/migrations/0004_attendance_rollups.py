@@ -0,0 +1,52 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_attendance', '0003_attendance_date'),
+        ('app_courses', '0002_initial'),
+        ('app_users', '0003_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupDailyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('total', models.IntegerField(default=0)),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_attendance', to='app_courses.group')),
+            ],
+            options={
+                'verbose_name': 'Group daily attendance',
+                'verbose_name_plural': 'Group daily attendances',
+                'constraints': [models.UniqueConstraint(fields=('group', 'date'), name='unique_group_daily_attendance')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total', models.IntegerField(default=0)),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_attendance_summary', to='app_courses.group')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summary', to='app_users.student')),
+            ],
+            options={
+                'verbose_name': 'Student attendance summary',
+                'verbose_name_plural': 'Student attendance summaries',
+                'constraints': [models.UniqueConstraint(fields=('student', 'group'), name='unique_student_group_attendance_summary')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from app_common.models import BaseModel
 from app_users.models import Student
@@ -7,11 +8,18 @@ from app_courses.models import Group
 
 class Status(BaseModel): #Talabaning davomat holatini bildiruvchi model
 
+    PRESENT = 'present'  # Qatnashgan talabalar statusining nomi
+    ABSENT = 'absent'  # Qatnashmagan talabalar statusining nomi
+
     title = models.CharField(max_length=255)
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs): # Rollup signallari (app_attendance.signals) yozuv bilan bitta tranzaksiyada ishlaydi
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Status'
         verbose_name_plural = 'Statuses'
@@ -28,9 +36,61 @@ class Attendance(BaseModel): #Talabaning guruhdagi davomatini ifodalovchi model.
     status = models.ForeignKey(
         'Status', on_delete=models.CASCADE, related_name='attendance')  # Talabaning holatini bildiradi (Qatnashdi, Kech keldi va h.k.)
 
+    date = models.DateField(default=timezone.localdate)  # Dars (sessiya) sanasi
+
     def __str__(self):
         return f"{self.student.user.phone} - {self.group.title}"  # Talabaning telefon raqami va guruh nomini qaytaradi
 
+    def save(self, *args, **kwargs): # Rollup signallari (app_attendance.signals) yozuv bilan bitta tranzaksiyada ishlaydi
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Attendance"
         verbose_name_plural = "Attendances"
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="attendance_created_id_idx"),  # Kursorli sahifalash (created_at, id) uchun
+            models.Index(fields=["student", "date"], name="attendance_student_date_idx"),  # Talaba davomati tarixi
+            models.Index(fields=["group", "date"], name="attendance_group_date_idx"),  # Guruhning kunlik davomati
+        ]
+
+
+class StudentAttendanceSummary(BaseModel): #Talabaning guruhdagi davomati bo‘yicha yig‘ma (rollup) jadval
+
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name='attendance_summary')
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name='student_attendance_summary')
+    total = models.IntegerField(default=0)  # Jami darslar soni
+    present = models.IntegerField(default=0)  # Qatnashgan darslar soni
+    absent = models.IntegerField(default=0)  # Qatnashmagan darslar soni
+
+    def __str__(self):
+        return f"{self.student_id} - {self.group_id}: {self.present}/{self.total}"
+
+    class Meta:
+        verbose_name = "Student attendance summary"
+        verbose_name_plural = "Student attendance summaries"
+        constraints = [
+            models.UniqueConstraint(fields=["student", "group"], name="unique_student_group_attendance_summary"),
+        ]
+
+
+class GroupDailyAttendance(BaseModel): #Guruhning har bir kundagi davomati bo‘yicha yig‘ma (rollup) jadval
+
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name='daily_attendance')
+    date = models.DateField()
+    total = models.IntegerField(default=0)
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.group_id} - {self.date}: {self.present}/{self.total}"
+
+    class Meta:
+        verbose_name = "Group daily attendance"
+        verbose_name_plural = "Group daily attendances"
+        constraints = [
+            models.UniqueConstraint(fields=["group", "date"], name="unique_group_daily_attendance"),
+        ]
@@ -0,0 +1,132 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from app_attendance.models import Attendance, Status, StudentAttendanceSummary, GroupDailyAttendance
+
+UPDATE_CHUNK_SIZE = 200  # Bitta UPDATE ichidagi kalitlar soni (SQLite parametr chegarasi uchun)
+
+_suspended = ContextVar('attendance_rollups_suspended', default=False)
+
+
+@contextmanager
+def rollups_suspended(): # Ommaviy o‘chirishda signal orqali yangilash to‘xtatiladi, oxirida rebuild_rollups() chaqiriladi
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def rollups_active():
+    return not _suspended.get()
+
+
+def status_kind(title): # Status nomi bo‘yicha rollup ustuni: 'present', 'absent' yoki None
+    kind = (title or '').lower()
+    return kind if kind in (Status.PRESENT, Status.ABSENT) else None
+
+
+def attendance_row(attendance): # Rollup uchun kerakli (student_id, group_id, date, status_id)
+    return attendance.student_id, attendance.group_id, attendance.date, attendance.status_id
+
+
+def apply_attendance_delta(rows, sign=1): # Davomat yozuvlari qo‘shilganda (+1) yoki o‘chirilganda (-1) rollupni yangilaydi
+    # Chaqiruvchi transaction.atomic() ichida bo‘lishi kerak
+    rows = list(rows)
+    if not rows:
+        return
+
+    titles = dict(Status.objects.filter(id__in={row[3] for row in rows}).values_list('id', 'title'))
+
+    student_deltas = defaultdict(Counter)
+    daily_deltas = defaultdict(Counter)
+    for student_id, group_id, date, status_id in rows:
+        kind = status_kind(titles.get(status_id))
+        for delta in (student_deltas[(student_id, group_id)], daily_deltas[(group_id, date)]):
+            delta['total'] += sign
+            if kind:
+                delta[kind] += sign
+
+    _apply(StudentAttendanceSummary, ('student_id', 'group_id'), student_deltas)
+    _apply(GroupDailyAttendance, ('group_id', 'date'), daily_deltas)
+
+
+def reclassify_status(status_id, old_title, new_title): # Status nomi o‘zgarganda present/absent ustunlari ko‘chiriladi
+    old, new = status_kind(old_title), status_kind(new_title)
+    if old == new:
+        return
+
+    attendances = Attendance.objects.filter(status_id=status_id).order_by()
+    for model, key_fields in ((StudentAttendanceSummary, ('student_id', 'group_id')),
+                              (GroupDailyAttendance, ('group_id', 'date'))):
+        deltas = {}
+        for *key, count in attendances.values_list(*key_fields).annotate(count=Count('id')):
+            delta = Counter()
+            if old:
+                delta[old] -= count
+            if new:
+                delta[new] += count
+            deltas[tuple(key)] = delta
+        _apply(model, key_fields, deltas)
+
+
+def _apply(model, key_fields, deltas):
+    # Yo‘q qatorlar nol qiymat bilan yaratiladi, keyin F() orqali atomar oshiriladi
+    model.objects.bulk_create(
+        [model(**dict(zip(key_fields, key))) for key in deltas], ignore_conflicts=True)
+
+    # Bir xil o‘zgarishga ega kalitlar bitta UPDATE bilan yangilanadi
+    keys_by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        keys_by_delta[tuple(sorted((name, value) for name, value in delta.items() if value))].append(key)
+
+    now = timezone.now()
+    for delta, keys in keys_by_delta.items():
+        if not delta:
+            continue
+        changes = {name: F(name) + value for name, value in delta}
+        for start in range(0, len(keys), UPDATE_CHUNK_SIZE):
+            condition = reduce(or_, (Q(**dict(zip(key_fields, key))) for key in keys[start:start + UPDATE_CHUNK_SIZE]))
+            model.objects.filter(condition).update(updated_at=now, **changes)
+            if dict(delta).get('total', 0) < 0:
+                # Bo‘shab qolgan qatorlar o‘chiriladi, rollup qayta qurilgandagi holat bilan bir xil bo‘lishi uchun
+                model.objects.filter(condition, total__lte=0).delete()
+
+
+def _status_counts(): # Conditional aggregation uchun umumiy ifodalar
+    return {
+        'total': Count('id'),
+        'present': Count('id', filter=Q(status__title__iexact=Status.PRESENT)),
+        'absent': Count('id', filter=Q(status__title__iexact=Status.ABSENT)),
+    }
+
+
+def rebuild_rollups(batch_size=1000): # Rollup jadvallarini xom Attendance yozuvlaridan qaytadan quradi
+    StudentAttendanceSummary.objects.all().delete()
+    GroupDailyAttendance.objects.all().delete()
+
+    students = (Attendance.objects.order_by().values('student_id', 'group_id')
+                .annotate(**_status_counts()).iterator(chunk_size=batch_size))
+    _bulk_create_in_batches(StudentAttendanceSummary, students, batch_size)
+
+    days = (Attendance.objects.order_by().values('group_id', 'date')
+            .annotate(**_status_counts()).iterator(chunk_size=batch_size))
+    _bulk_create_in_batches(GroupDailyAttendance, days, batch_size)
+
+    return StudentAttendanceSummary.objects.count(), GroupDailyAttendance.objects.count()
+
+
+def _bulk_create_in_batches(model, rows, batch_size): # Butun natija xotiraga yuklanmaydi
+    while batch := list(islice(rows, batch_size)):
+        model.objects.bulk_create([model(**row) for row in batch])
+
+
+def attendance_percentage(present, total):
+    return f"{(present / total * 100) if total > 0 else 0:.2f}%"
@@ -10,3 +10,16 @@ class AttendanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Attendance
         fields = '__all__'
+
+class BulkAttendanceItemSerializer(serializers.Serializer): # Bitta talaba uchun (student_id, status_id) juftligi
+    student_id = serializers.IntegerField()
+    status_id = serializers.IntegerField()
+
+class BulkAttendanceSerializer(serializers.Serializer): # Butun guruh davomatini bitta so‘rovda belgilash uchun
+    group_id = serializers.IntegerField()
+    date = serializers.DateField(required=False)  # Berilmasa bugungi sana olinadi
+    items = BulkAttendanceItemSerializer(many=True, allow_empty=False)
+
+class DateRangeSerializer(serializers.Serializer): # Kunlik davomat uchun sana oralig‘i
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
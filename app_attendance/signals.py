@@ -0,0 +1,72 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from app_attendance.models import Attendance, Status
+from app_attendance.rollups import apply_attendance_delta, attendance_row, reclassify_status, rollups_active
+from app_users.models import Student
+
+
+# Rollup jadvallari yozuv qayerdan o‘zgarishidan qat'i nazar (API, admin, kaskad o‘chirish) shu signallar
+# orqali yangilanadi. Attendance.save() va Collector.delete() tranzaksiya ichida ishlaydi, shuning uchun
+# rollup o‘zgarishi yozuv bilan birga saqlanadi yoki birga bekor qilinadi.
+# bulk_create / bulk_update signal yubormaydi, ular BulkWriteMixin hooklarida hisoblanadi.
+
+ROW_FIELDS = ('student_id', 'group_id', 'date', 'status_id')
+
+
+@receiver(pre_save, sender=Attendance)
+def attendance_saving(sender, instance, raw=False, **kwargs): # O‘zgarishdan oldingi qator bazadan olinadi
+    instance._rollup_old_row = None
+    if not raw and not instance._state.adding and rollups_active():
+        instance._rollup_old_row = Attendance.objects.filter(pk=instance.pk).values_list(*ROW_FIELDS).first()
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, raw=False, **kwargs):
+    if raw or not rollups_active():
+        return
+    old_row, new_row = getattr(instance, '_rollup_old_row', None), attendance_row(instance)
+    if old_row == new_row:
+        return
+    if old_row is not None:
+        apply_attendance_delta([old_row], sign=-1)
+    apply_attendance_delta([new_row])
+
+
+@receiver(pre_delete, sender=Attendance)
+def attendance_deleting(sender, instance, origin=None, **kwargs):
+    if not rollups_active():
+        return
+    if isinstance(origin, Attendance):
+        apply_attendance_delta([attendance_row(instance)], sign=-1)
+    elif isinstance(origin, QuerySet) and origin.model is Attendance and not getattr(origin, '_rollup_applied', False):
+        # QuerySet.delete(): o‘chiriladigan barcha qatorlar birinchi signalda bitta so‘rov bilan hisoblanadi
+        origin._rollup_applied = True
+        apply_attendance_delta(origin.order_by().values_list(*ROW_FIELDS), sign=-1)
+    # Boshqa modeldan kaskad: Student va Status quyida hisoblanadi, Group o‘chsa uning rollup qatorlari ham o‘chadi
+
+
+@receiver(pre_delete, sender=Student)
+def student_deleting(sender, instance, **kwargs): # Talaba kaskadi: guruhlarning kunlik qatorlari kamaytiriladi
+    if rollups_active():
+        apply_attendance_delta(instance.attendance.order_by().values_list(*ROW_FIELDS), sign=-1)
+
+
+@receiver(pre_delete, sender=Status)
+def status_deleting(sender, instance, **kwargs):
+    if rollups_active():
+        apply_attendance_delta(instance.attendance.order_by().values_list(*ROW_FIELDS), sign=-1)
+
+
+@receiver(pre_save, sender=Status)
+def status_saving(sender, instance, raw=False, **kwargs): # Nom o‘zgarsa present/absent tasnifi ham o‘zgarishi mumkin
+    instance._rollup_old_title = None
+    if not raw and not instance._state.adding:
+        instance._rollup_old_title = Status.objects.filter(pk=instance.pk).values_list('title', flat=True).first()
+
+
+@receiver(post_save, sender=Status)
+def status_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and rollups_active():
+        reclassify_status(instance.pk, getattr(instance, '_rollup_old_title', None), instance.title)
@@ -1,3 +1,106 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_attendance.models import Status, Attendance, StudentAttendanceSummary, GroupDailyAttendance
+from app_attendance.rollups import rebuild_rollups
+from app_courses.models import Subject, Group
+from app_users.models import User, Student
+
+
+def rollup_snapshot():
+    return (
+        sorted(StudentAttendanceSummary.objects.values_list('student_id', 'group_id', 'total', 'present', 'absent')),
+        sorted(GroupDailyAttendance.objects.values_list('group_id', 'date', 'total', 'present', 'absent')),
+    )
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AttendanceRollupTests(APITestCase): # Signal va bulk yo‘llari bilan yangilangan rollup = noldan qurilgan rollup
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+        subject = Subject.objects.create(title='Fizika')
+        cls.groups = [Group.objects.create(title=f'G{i}', subject=subject) for i in range(2)]
+        cls.students = []
+        for i in range(4):
+            student = Student.objects.create(user=User.objects.create_user(phone=f'99890000010{i}', password='x',
+                                                                           is_student=True))
+            student.group.add(cls.groups[i % 2])
+            cls.students.append(student)
+        cls.present = Status.objects.create(title=Status.PRESENT)
+        cls.absent = Status.objects.create(title=Status.ABSENT)
+        cls.late = Status.objects.create(title='late')
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+
+    def assertRollupsMatchRebuild(self):
+        incremental = rollup_snapshot()
+        rebuild_rollups()
+        self.assertEqual(incremental, rollup_snapshot())
+
+    def mark(self, group, day, status_id):
+        items = [{'student_id': student.pk, 'status_id': status_id}
+                 for student in self.students if student.group.filter(pk=group.pk).exists()]
+        response = self.client.post(reverse('attendances:attendance-bulk-attendance'),
+                                    {'group_id': group.pk, 'date': str(day), 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_incremental_rollups_match_rebuild(self):
+        for day in (date(2026, 9, 1), date(2026, 9, 2), date(2026, 9, 3)):
+            self.mark(self.groups[0], day, self.present.pk)
+            self.mark(self.groups[1], day, self.absent.pk)
+        student, group = self.students[0], self.groups[0]
+
+        # API: yakka yaratish, yangilash, o‘chirish
+        response = self.client.post(reverse('attendances:attendance-create-attendance'),
+                                    {'student': student.pk, 'group': group.pk, 'status': self.late.pk,
+                                     'date': '2026-09-04'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = response.data['id']
+        self.client.put(reverse('attendances:attendance-update-attendance', args=[created]),
+                        {'status': self.absent.pk, 'date': '2026-09-05'}, format='json')
+        first = Attendance.objects.filter(student=student).order_by('pk').first()
+        self.client.delete(reverse('attendances:attendance-delete-attendance', args=[first.pk]))
+
+        # bulk/update va bulk/delete
+        rows = list(Attendance.objects.filter(group=self.groups[1]).order_by('pk').values_list('pk', flat=True))
+        self.client.put(reverse('attendances:attendance-bulk-update-items'),
+                        {'items': [{'id': pk, 'status': self.present.pk} for pk in rows[:2]]}, format='json')
+        self.client.post(reverse('attendances:attendance-bulk-delete-items'), {'ids': rows[2:4]}, format='json')
+        self.assertRollupsMatchRebuild()
+
+        # Admin orqali to‘g‘ridan-to‘g‘ri saqlash va QuerySet.delete()
+        attendance = Attendance.objects.filter(group=group).order_by('pk').last()
+        attendance.status = self.absent
+        attendance.save()
+        Attendance.objects.filter(group=group, date=date(2026, 9, 2)).delete()
+        self.assertRollupsMatchRebuild()
+
+        # Status nomi o‘zgarsa present/absent tasnifi ham o‘zgaradi
+        self.late.title = Status.PRESENT.upper()
+        self.late.save()
+        self.absent.title = 'excused'
+        self.absent.save()
+        self.assertRollupsMatchRebuild()
+
+        # bulk/update signal yubormaydi: nomlar almashsa StatusViewSet.bulk_updated qayta tasniflaydi
+        response = self.client.put(reverse('attendances:status-bulk-update-items'),
+                                   {'items': [{'id': self.present.pk, 'title': Status.ABSENT},
+                                              {'id': self.absent.pk, 'title': Status.PRESENT}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRollupsMatchRebuild()
+
+        # Kaskad o‘chirishlar
+        self.students[1].user.delete()
+        self.assertRollupsMatchRebuild()
+        self.late.delete()
+        self.assertRollupsMatchRebuild()
+        self.groups[1].delete()
+        self.assertRollupsMatchRebuild()
+        self.assertTrue(StudentAttendanceSummary.objects.exists())
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from app_attendance.views import StatusViewSet, AttendanceViewSet, StudentAttendanceAPIView
+from app_attendance.views import StatusViewSet, AttendanceViewSet, StudentAttendanceAPIView, GroupAttendanceAPIView
 
 app_name = 'attendances'
 router = DefaultRouter()
@@ -10,6 +10,7 @@ router.register('attendance', AttendanceViewSet, basename='attendance')
 
 urlpatterns = [
     path('student-attendance/<int:student_id>/', StudentAttendanceAPIView.as_view(), name='student_attendance'),
+    path('group-attendance/<int:group_id>/', GroupAttendanceAPIView.as_view(), name='group_attendance'),
 
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,4 +1,8 @@
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -6,28 +10,44 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from app_attendance.models import Status, Attendance
-from app_attendance.serializers import StatusSerializer, AttendanceSerializer
-from app_common.paginations import Pagination
+from app_attendance.models import Status, Attendance, GroupDailyAttendance
+from app_attendance.rollups import apply_attendance_delta, attendance_row, attendance_percentage, reclassify_status
+from app_attendance.serializers import StatusSerializer, AttendanceSerializer, BulkAttendanceSerializer, \
+    DateRangeSerializer
+from app_common.bulk import BulkWriteMixin
+from app_common.conditional import conditional_retrieve
+from app_common.paginations import Pagination, get_pagination
+from app_common.prefetch import prefetch_for
 from app_common.permissions import AdminUser, AdminOrTeacher
+from app_common.response_cache import versioned_response
+from app_common.serializers import ExportSerializer
+from app_common.streaming import export_response
+from app_courses.models import Group
 from app_users.models import Student
 
 
-class StatusViewSet(viewsets.ViewSet): #Status ma'lumotlarini boshqaruvchi ViewSet
+class StatusViewSet(BulkWriteMixin, viewsets.ViewSet): #Status ma'lumotlarini boshqaruvchi ViewSet
 
     permission_classes = [AdminUser]
+    bulk_serializer_class = StatusSerializer
 
+    def bulk_updated(self, objects, previous): # bulk_update pre_save/post_save yubormaydi: nomi o‘zgargan statuslar rollupda qayta tasniflanadi
+        for status_obj in objects:
+            reclassify_status(status_obj.pk, previous[status_obj.pk].title, status_obj.title)
+
+    @versioned_response(Status)
     def list(self, request): #Barcha statuslarni ro‘yxat ko‘rinishida chiqaradi
 
-        statuses = Status.objects.all()
-        paginator = Pagination()
+        statuses = prefetch_for(StatusSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(statuses, request)
         serializer = StatusSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Status)
     def retrieve(self, request, pk=None): #Bitta statusni ID bo‘yicha chiqaradi
 
-        status_obj = get_object_or_404(Status, pk=pk)
+        status_obj = get_object_or_404(prefetch_for(StatusSerializer), pk=pk)
         serializer = StatusSerializer(status_obj)
         return Response(serializer.data)
 
@@ -60,21 +80,32 @@ class StatusViewSet(viewsets.ViewSet): #Status ma'lumotlarini boshqaruvchi ViewS
         return Response({'status': True, 'detail': 'Status muvaffaqiyatli o‘chirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class AttendanceViewSet(viewsets.ViewSet): #Davomat ma'lumotlarini boshqaruvchi ViewSet
+class AttendanceViewSet(BulkWriteMixin, viewsets.ViewSet): #Davomat ma'lumotlarini boshqaruvchi ViewSet
 
     permission_classes = [AdminOrTeacher]
+    bulk_serializer_class = AttendanceSerializer
+
+    # bulk_create / bulk_update signal yubormaydi, rollup jadvallari shu tranzaksiya ichida yangilanadi.
+    # Yakka saqlash va o‘chirish (bulk/delete ham) app_attendance.signals orqali hisoblanadi.
+    def bulk_created(self, objects):
+        apply_attendance_delta(attendance_row(attendance) for attendance in objects)
+
+    def bulk_updated(self, objects, previous):
+        apply_attendance_delta((attendance_row(attendance) for attendance in previous.values()), sign=-1)
+        apply_attendance_delta(attendance_row(attendance) for attendance in objects)
 
     def list(self, request): # Barcha davomat yozuvlarini chiqaradi
 
-        attendances = Attendance.objects.all()
-        paginator = Pagination()
+        attendances = prefetch_for(AttendanceSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(attendances, request)
         serializer = AttendanceSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Attendance)
     def retrieve(self, request, pk=None): #Bitta davomat yozuvini ID bo‘yicha chiqaradi
 
-        attendance = get_object_or_404(Attendance, pk=pk)
+        attendance = get_object_or_404(prefetch_for(AttendanceSerializer), pk=pk)
         serializer = AttendanceSerializer(attendance)
         return Response(serializer.data)
 
@@ -88,6 +119,61 @@ class AttendanceViewSet(viewsets.ViewSet): #Davomat ma'lumotlarini boshqaruvchi
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    @swagger_auto_schema(request_body=BulkAttendanceSerializer)
+    def bulk_attendance(self, request): # Guruhning butun darsi uchun davomatni bitta so‘rovda yaratish
+
+        serializer = BulkAttendanceSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        group_id = serializer.validated_data['group_id']
+        items = serializer.validated_data['items']
+        date = serializer.validated_data.get('date') or timezone.localdate()
+
+        if not Group.objects.filter(id=group_id).exists():
+            return Response({'status': False, 'detail': 'Guruh topilmadi'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Guruh a'zoligi va statuslar bittadan so‘rov bilan tekshiriladi
+        members = set(Student.group.through.objects.filter(
+            group_id=group_id, student_id__in={item['student_id'] for item in items}
+        ).values_list('student_id', flat=True))
+        statuses = set(Status.objects.filter(
+            id__in={item['status_id'] for item in items}
+        ).values_list('id', flat=True))
+
+        results = []
+        attendances = []
+        seen = set()
+        for item in items:
+            result = {'student_id': item['student_id'], 'status_id': item['status_id']}
+            if item['student_id'] not in members:
+                result['error'] = 'Talaba ushbu guruhga tegishli emas'
+            elif item['status_id'] not in statuses:
+                result['error'] = 'Status topilmadi'
+            elif item['student_id'] in seen:
+                result['error'] = 'Talaba bir necha marta berilgan'
+            else:
+                seen.add(item['student_id'])
+                attendances.append(Attendance(group_id=group_id, student_id=item['student_id'],
+                                              status_id=item['status_id'], date=date))
+            results.append(result)
+
+        with transaction.atomic():
+            created = Attendance.objects.bulk_create(attendances)
+            apply_attendance_delta(attendance_row(attendance) for attendance in created)
+        created = iter(created)
+
+        for result in results:
+            if 'error' not in result:
+                result['id'] = next(created).id
+
+        return Response({
+            'status': bool(attendances),
+            'created': len(attendances),
+            'results': results,
+        }, status=status.HTTP_201_CREATED if attendances else status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['put'], url_path='update')
     @swagger_auto_schema(request_body=AttendanceSerializer)
     def update_attendance(self, request, pk=None): # Mavjud davomat yozuvini yangilash uchun API
@@ -106,6 +192,16 @@ class AttendanceViewSet(viewsets.ViewSet): #Davomat ma'lumotlarini boshqaruvchi
         attendance.delete()
         return Response({'status': True, 'detail': 'Davomat muvaffaqiyatli o‘chirildi'}, status=status.HTTP_204_NO_CONTENT)
 
+    # Davomat yozuvlarini CSV yoki NDJSON ko‘rinishida oqim (stream) bilan eksport qilish
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[AdminUser])
+    @swagger_auto_schema(query_serializer=ExportSerializer)
+    def export(self, request):
+        serializer = ExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        fields = ('id', 'group', 'student', 'status', 'date', 'created_at', 'updated_at')
+        return export_response(Attendance.objects.all(), fields, serializer.validated_data['output'], 'attendances')
+
 
 class StudentAttendanceAPIView(APIView): # Talabaning davomat ma'lumotlarini ko‘rish uchun API
 
@@ -113,25 +209,59 @@ class StudentAttendanceAPIView(APIView): # Talabaning davomat ma'lumotlarini ko
     pagination_class = Pagination
 
     def get(self, request, student_id): # Berilgan talabaning davomat statistikasi va foizini qaytaradi
-        student = get_object_or_404(Student, id=student_id)
+        student = get_object_or_404(Student.objects.select_related('user'), id=student_id)
 
         # Talabaning davomat ma’lumotlarini olish
-        attendance_records = student.attendance.all().order_by("-date")
+        attendance_records = student.attendance.order_by("-date", "-id").values("id", "date", "group", "status__title")
         paginator = self.pagination_class()
         result_page = paginator.paginate_queryset(attendance_records, request)
 
-        total_classes = student.attendance.count()
-        present_count = student.attendance.filter(status="present").count()
-        absent_count = student.attendance.filter(status="absent").count()
-
-        # Davomat foizini hisoblash
-        attendance_percentage = (present_count / total_classes * 100) if total_classes > 0 else 0
+        # Jami, qatnashgan va qatnashmagan darslar rollup jadvalidan olinadi (tarix hajmiga bog‘liq emas)
+        summary = student.attendance_summary.aggregate(
+            total_classes=Coalesce(Sum("total"), 0),
+            present=Coalesce(Sum("present"), 0),
+            absent=Coalesce(Sum("absent"), 0),
+        )
 
         return paginator.get_paginated_response({
             "student": student.user.full_name,
+            "total_classes": summary["total_classes"],
+            "present": summary["present"],
+            "absent": summary["absent"],
+            "attendance_percentage": attendance_percentage(summary["present"], summary["total_classes"]),
+            "attendance_records": result_page
+        })
+
+
+class GroupAttendanceAPIView(APIView): # Guruhning davomat statistikasi (rollup jadvallaridan)
+
+    permission_classes = [AdminOrTeacher]
+
+    def get(self, request, group_id): # Guruh bo‘yicha jami ko‘rsatkichlar, talabalar kesimi va kunlik davomat
+        group = get_object_or_404(Group, id=group_id)
+
+        students = list(group.student_attendance_summary.order_by("student_id").values(
+            "student_id", "total", "present", "absent"))
+        for row in students:
+            row["attendance_percentage"] = attendance_percentage(row["present"], row["total"])
+
+        total_classes = sum(row["total"] for row in students)
+        present_count = sum(row["present"] for row in students)
+        absent_count = sum(row["absent"] for row in students)
+
+        days = GroupDailyAttendance.objects.filter(group=group).order_by("-date")
+        serializer = DateRangeSerializer(data=request.query_params)
+        if serializer.is_valid():
+            days = days.filter(date__range=[serializer.validated_data["start_date"], serializer.validated_data["end_date"]])
+        else:
+            days = days[:30]  # Sana oralig‘i berilmasa oxirgi 30 ta dars kuni
+
+        return Response({
+            "group": group.title,
             "total_classes": total_classes,
             "present": present_count,
             "absent": absent_count,
-            "attendance_percentage": f"{attendance_percentage:.2f}%",
-            "attendance_records": list(result_page.values("date", "status"))
+            "attendance_percentage": attendance_percentage(present_count, total_classes),
+            "students": students,
+            "days": list(days.values("date", "total", "present", "absent")),
         })
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from app_common.cache import NamespacedCache
+from app_users.models import User, Student, Teacher
+
+USER_STATE_CACHE = NamespacedCache('user-state', timeout=settings.AUTH_USER_CACHE_SECONDS)
+
+# Har bir so‘rovda kerak bo‘ladigan foydalanuvchi maydonlari (ruxsatlar shu bayroqlarni o‘qiydi)
+USER_STATE_FIELDS = ('id', 'phone', 'full_name', 'is_active', 'is_staff', 'is_admin', 'is_teacher', 'is_student')
+
+
+def load_user_state(user_id): # Foydalanuvchi holati keshdan, bo‘lmasa bitta so‘rov bilan bazadan
+    state = USER_STATE_CACHE.get(user_id)
+    if state is None:
+        state = (User.objects.filter(pk=user_id)
+                 .values(*USER_STATE_FIELDS, student_id=F('student__id'), teacher_id=F('teacher__id'))
+                 .first()) or {}
+        USER_STATE_CACHE.set(user_id, state)  # Mavjud bo‘lmagan foydalanuvchi ham (bo‘sh) keshlanadi
+    return state
+
+
+def invalidate_user_state(user_id):
+    USER_STATE_CACHE.delete(user_id)
+
+
+def _from_db(model, values): # Model.from_db qiymatlarni concrete maydonlar tartibida kutadi
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+
+
+def user_from_state(state): # Bazaga murojaat qilmasdan deferred User obyekti
+    user = _from_db(User, {field: state[field] for field in USER_STATE_FIELDS})
+    # request.user.student / request.user.teacher qo‘shimcha so‘rovsiz ishlashi uchun. Profil yo‘qligi ham
+    # (None) keshlanadi: getattr(user, 'teacher', None) bazaga bormasdan None qaytaradi
+    for name, model in (('student', Student), ('teacher', Teacher)):
+        profile_id = state[f'{name}_id']
+        user._state.fields_cache[name] = _from_db(model, {'id': profile_id, 'user_id': user.pk}) if profile_id else None
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication): # Foydalanuvchi har so‘rovda bazadan emas, qisqa TTL li keshdan olinadi
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = load_user_state(user_id)
+        if not state:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not state['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Rollar tokendan emas, kesh/bazadagi holatdan olinadi: rol o‘zgarishi va bloklash keshdan tushgach darhol kuchga kiradi
+        return user_from_state(state)
@@ -0,0 +1,4 @@
+from app_common.cache import NamespacedCache
+
+OTP_CACHE = NamespacedCache('otp', timeout=300)  # phone -> SMS orqali yuborilgan kod
+VERIFIED_CACHE = NamespacedCache('otp-verified', timeout=900)  # phone -> OTP tasdiqlangan (parolni tiklash uchun)
@@ -0,0 +1,67 @@
+import logging
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+from app_auth.tokens import CachedRefreshToken
+from app_users.models import User
+
+logger = logging.getLogger('app_auth')
+
+# Login uchun kerakli ustunlar: parolni tekshirish, qayta xeshlash va token yaratish
+LOGIN_FIELDS = ('id', 'phone', 'password', 'is_active')
+
+
+@lru_cache(maxsize=None)
+def dummy_password_hash(): # Mavjud bo‘lmagan telefon uchun ham joriy xeshlovchi bilan bir xil vaqt sarflanadi
+    return make_password('dummy-password')
+
+
+class LoginTimer: # Login bosqichlari vaqtini o‘lchaydi va byudjetdan oshsa log yozadi
+    def __init__(self, name):
+        self.name = name
+        self.started = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self.last) * 1000, 1)
+        self.last = now
+
+    def finish(self):
+        total = round((time.perf_counter() - self.started) * 1000, 1)
+        budget = settings.LOGIN_LATENCY_BUDGET_MS
+        if budget and total > budget:
+            logger.warning('%s took %sms (budget %sms): %s', self.name, total, budget, self.phases)
+        else:
+            logger.debug('%s took %sms: %s', self.name, total, self.phases)
+        return total
+
+
+def authenticate_phone(phone, password, timer=None): # To‘g‘ri bo‘lsa User, aks holda None
+    user = User.objects.filter(phone=phone).only(*LOGIN_FIELDS).first() if phone else None
+    if timer:
+        timer.mark('lookup')
+
+    if user is None:
+        check_password(password or '', dummy_password_hash())
+        valid = False
+    else:
+        # Eski algoritm yoki kam iteratsiya bo‘lsa check_password parolni PASSWORD_HASHERS[0] bilan qayta saqlaydi
+        valid = user.check_password(password) and user.is_active
+    if timer:
+        timer.mark('hash')
+    return user if valid else None
+
+
+def issue_tokens(user, timer=None):
+    refresh = CachedRefreshToken.for_user(user)
+    tokens = {
+        "refresh": str(refresh),
+        "access": str(refresh.access_token),
+    }
+    if timer:
+        timer.mark('token')
+    return tokens
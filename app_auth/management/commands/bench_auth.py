@@ -0,0 +1,99 @@
+import json
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from app_common.benchmark import percentiles, bench_host
+from app_users.models import User
+
+
+class Command(BaseCommand): # Parallel yuklama ostida login va token refresh kechikishini o‘lchaydi
+    help = "Benchmark login and token refresh latency (p50/p95/p99) under concurrent load"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--phone', help="Mavjud foydalanuvchi telefoni")
+        parser.add_argument('--password')
+        parser.add_argument('--create', action='store_true', help="Vaqtinchalik foydalanuvchi yaratib, oxirida o‘chiradi")
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--json', action='store_true')
+        parser.add_argument('--throttle', action='store_true', help="THROTTLE_BUCKETS cheklovlarini o‘chirmaslik")
+
+    def handle(self, *args, **options):
+        user = None
+        phone, password = options['phone'], options['password']
+        if options['create']:
+            phone, password = f'99899{secrets.randbelow(10 ** 7):07d}', secrets.token_urlsafe(12)
+            user = User.objects.create_user(phone=phone, password=password, full_name='bench')
+        elif not phone or not password:
+            raise CommandError("--phone va --password yoki --create kerak")
+
+        host = bench_host()
+        login_url, refresh_url = reverse('auth:login'), reverse('auth:token_refresh')
+        samples = {'login': [], 'refresh': []}
+        failures = []
+        lock = threading.Lock()
+
+        def worker(count):
+            client = Client(raise_request_exception=False, HTTP_HOST=host)
+            try:
+                for _ in range(count):
+                    started = time.perf_counter()
+                    response = client.post(login_url, {'phone': phone, 'password': password}, content_type='application/json')
+                    login_ms = (time.perf_counter() - started) * 1000
+                    if response.status_code != 200:
+                        with lock:
+                            failures.append(('login', response.status_code))
+                        continue
+
+                    started = time.perf_counter()
+                    refreshed = client.post(refresh_url, {'refresh': response.json()['refresh']}, content_type='application/json')
+                    refresh_ms = (time.perf_counter() - started) * 1000
+                    with lock:
+                        samples['login'].append(login_ms)
+                        if refreshed.status_code == 200:
+                            samples['refresh'].append(refresh_ms)
+                        else:
+                            failures.append(('refresh', refreshed.status_code))
+            finally:
+                connections.close_all()
+
+        concurrency = max(1, options['concurrency'])
+        per_worker = [options['requests'] // concurrency + (i < options['requests'] % concurrency) for i in range(concurrency)]
+        # Bitta telefon bilan ko‘p login qilinadi, shuning uchun token bucket cheklovlari odatda o‘chiriladi
+        buckets = settings.THROTTLE_BUCKETS if options['throttle'] else {}
+        started = time.perf_counter()
+        try:
+            with override_settings(THROTTLE_BUCKETS=buckets), ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(worker, per_worker))
+        finally:
+            if user is not None:
+                user.delete()
+        elapsed = time.perf_counter() - started
+
+        report = {
+            'hasher': settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1],
+            'concurrency': concurrency,
+            'seconds': round(elapsed, 2),
+            'login': percentiles(samples['login']),
+            'refresh': percentiles(samples['refresh']),
+            'failures': len(failures),
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report))
+            return
+
+        self.stdout.write(f"{report['hasher']}, concurrency {concurrency}, {report['seconds']}s")
+        for name in ('login', 'refresh'):
+            row = report[name]
+            self.stdout.write(f"{name:<8} n={row['count']:<5} " + ' '.join(
+                f"{key}={row[key]}ms" if row[key] is not None else f"{key}=-" for key in ('p50', 'p95', 'p99')))
+        if failures:
+            self.stdout.write(self.style.WARNING(f"{len(failures)} failed requests: {failures[:5]}"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+
+
+class Command(BaseCommand): # Muddati o‘tgan outstanding va blacklisted tokenlarni partiyalab o‘chiradi (cron orqali)
+    help = "Delete expired outstanding and blacklisted JWT tokens in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # Har bir partiya alohida tranzaksiyada, jadvallar uzoq vaqt bloklanmaydi
+        expired = OutstandingToken.objects.filter(expires_at__lt=timezone.now()).order_by('id')
+        outstanding = blacklisted = 0
+        while ids := list(expired.values_list('id', flat=True)[:options['batch_size']]):
+            with transaction.atomic():
+                blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                outstanding += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {outstanding} expired outstanding and {blacklisted} blacklisted tokens"))
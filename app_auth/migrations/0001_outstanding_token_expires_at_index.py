@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # token_blacklist jadvallari uchinchi tomon ilovasiga tegishli, shuning uchun indeks RunSQL bilan qo‘shiladi.
+    # sweep_tokens buyrug‘i muddati o‘tgan tokenlarni expires_at bo‘yicha qidiradi.
+
+    dependencies = [
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS outstandingtoken_expires_at_idx '
+                'ON token_blacklist_outstandingtoken (expires_at)',
+            reverse_sql='DROP INDEX IF EXISTS outstandingtoken_expires_at_idx',
+        ),
+    ]
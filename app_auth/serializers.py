@@ -1,6 +1,11 @@
-from django.core.cache import cache
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
+from app_auth.authentication import load_user_state
+from app_auth.cache import OTP_CACHE
+from app_auth.tokens import CachedRefreshToken
 from app_users.models import User
 
 
@@ -31,7 +36,7 @@ class VerifyOTPSerializer(serializers.Serializer):
     def validate(self, data):
         phone = data.get('phone')
         otp = data.get('otp')
-        cached_data = cache.get(phone)
+        cached_data = OTP_CACHE.get(phone)
         if not cached_data or str(cached_data) != otp:
             raise serializers.ValidationError("Noto‘g‘ri yoki eskirgan OTP")
         return data
@@ -44,4 +49,30 @@ class SetNewPasswordSerializer(serializers.Serializer):
     def validate(self, data):
         if data['new_password'] != data['confirm_password']:
             raise serializers.ValidationError("Parollar mos kelmadi")
-        return data
\ No newline at end of file
+        return data
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer): # Refresh: foydalanuvchi va qora ro‘yxat keshdan tekshiriladi
+    token_class = CachedRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        state = load_user_state(refresh.payload.get(api_settings.USER_ID_CLAIM))
+        if not state or not state["is_active"]:
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data["refresh"] = str(refresh)
+
+        return data
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_auth.authentication import invalidate_user_state
+from app_users.models import User, Student, Teacher
+
+
+# Foydalanuvchi (faollik, rollar) yoki uning profili o‘zgarsa JWT autentifikatsiya keshi tozalanadi
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user_state(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_user_state(instance.user_id)
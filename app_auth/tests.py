@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from app_auth.authentication import load_user_state, user_from_state
+from app_users.models import User, Teacher
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TokenAuthTests(APITestCase): # Rollar tokendan emas, foydalanuvchi holatidan olinadi
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(phone='998900000020', password='secret')
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+
+    def login(self):
+        response = self.client.post(reverse('auth:login'), {'phone': self.user.phone, 'password': 'secret'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_role_change_applies_to_issued_token(self):
+        tokens = self.login()
+        self.assertNotIn('is_admin', AccessToken(tokens['access']).payload)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get(reverse('users:user-list')).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_admin = True
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('users:user-list')).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('users:user-list'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)  # SessionAuthentication birinchi: 401 emas
+        self.assertEqual(response.data['code'], 'user_inactive')
+
+    def test_refresh_rotates_and_blacklists(self):
+        refresh = self.login()['refresh']
+        response = self.client.post(reverse('auth:token_refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['refresh'], refresh)
+
+        response = self.client.post(reverse('auth:token_refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_latency_warning_is_opt_in(self):
+        with self.assertNoLogs('app_auth', 'WARNING'):
+            self.login()
+        with override_settings(LOGIN_LATENCY_BUDGET_MS=0.001), self.assertLogs('app_auth', 'WARNING') as logs:
+            self.login()
+        self.assertIn('login took', logs.output[0])
+
+    def test_profiles_are_resolved_without_queries(self):
+        teacher = Teacher.objects.create(user=User.objects.create_user(phone='998900000021', password='x'))
+        for user_id, expected in ((self.user.pk, None), (teacher.user_id, teacher.pk)):
+            state = load_user_state(user_id)
+            with self.subTest(user=user_id), self.assertNumQueries(0):
+                user = user_from_state(state)
+                self.assertEqual(getattr(getattr(user, 'teacher', None), 'pk', None), expected)
+                self.assertIsNone(getattr(user, 'student', None))
@@ -0,0 +1,49 @@
+import time
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from app_common.cache import NamespacedCache
+
+# jti -> True (qora ro‘yxatda, token muddati tugaguncha) yoki False (qisqa muddat, cache.add bilan)
+BLACKLIST_CACHE = NamespacedCache('token-blacklist')
+NOT_BLACKLISTED_TIMEOUT = 30
+
+
+class CachedRefreshToken(RefreshToken): # Qora ro‘yxat keshdan tekshiriladi. Rollar tokenga yozilmaydi: ular har so‘rovda foydalanuvchi holatidan o‘qiladi
+    def _seconds_left(self):
+        return max(1, int(self.payload['exp'] - time.time()))
+
+    def check_blacklist(self): # Har refresh da bazaga emas, avval keshga qaraladi
+        jti = self.payload[api_settings.JTI_CLAIM]
+        blacklisted = BLACKLIST_CACHE.get(jti)
+        if blacklisted is None:
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            if blacklisted:
+                BLACKLIST_CACHE.set(jti, True, self._seconds_left())
+            else:
+                # add: parallel blacklist() yozgan True qiymati ustidan yozilmaydi
+                BLACKLIST_CACHE.add(jti, False, NOT_BLACKLISTED_TIMEOUT)
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def outstand(self): # Foydalanuvchi obyekti yuklanmaydi, user_id to‘g‘ridan-to‘g‘ri yoziladi
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                "created_at": self.current_time,
+                "token": str(self),
+                "expires_at": datetime_from_epoch(self.payload["exp"]),
+            },
+        )
+
+    def blacklist(self):
+        token, _ = self.outstand()
+        result = BlacklistedToken.objects.get_or_create(token=token)
+        BLACKLIST_CACHE.set(self.payload[api_settings.JTI_CLAIM], True, self._seconds_left())
+        return result
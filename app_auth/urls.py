@@ -1,9 +1,8 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 
 
 from app_auth.views import LoginAPIView, CurrentUserView, ChangePasswordView, VerifyOTPView, \
-    SetNewPasswordView, LogoutView
+    SetNewPasswordView, LogoutView, TokenRefreshAPIView
 
 app_name = 'auth'
 urlpatterns = [
@@ -13,5 +12,5 @@ urlpatterns = [
     path('change-password/', ChangePasswordView.as_view(), name='change_password'),
     path('verify-otp/', VerifyOTPView.as_view(), name='verify_otp'),
     path('set-new-password/', SetNewPasswordView.as_view(), name='set_new_password'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', TokenRefreshAPIView.as_view(), name='token_refresh'),
 ]
\ No newline at end of file
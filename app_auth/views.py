@@ -1,42 +1,55 @@
-from django.core.cache import cache
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 
+from app_auth.cache import OTP_CACHE, VERIFIED_CACHE
+from app_auth.login import LoginTimer, authenticate_phone, issue_tokens
 from app_auth.serializers import (
     LoginSerializer, MeSerializer, ChangePasswordSerializer,
     VerifyOTPSerializer, SetNewPasswordSerializer
 )
+from app_auth.tokens import CachedRefreshToken
+from app_common.throttling import PhoneTokenBucketThrottle, IPTokenBucketThrottle
 from app_users.models import User
 
 
 class LoginAPIView(APIView): #Foydalanuvchini autentifikatsiya qilish (login)
 
+    throttle_classes = [IPTokenBucketThrottle, PhoneTokenBucketThrottle]  # Xeshlash va bazadan oldin tekshiriladi
+    throttle_scope = 'login'
+
     @swagger_auto_schema(request_body=LoginSerializer)
     def post(self, request):
-        phone = request.data.get("phone")
-        password = request.data.get("password")
-
-        user = User.objects.filter(phone=phone).first()
+        timer = LoginTimer('login')
+        user = authenticate_phone(request.data.get("phone"), request.data.get("password"), timer)
 
         # Agar foydalanuvchi mavjud bo‘lsa va paroli to‘g‘ri bo‘lsa
-        if user and user.check_password(password):
-            refresh = RefreshToken.for_user(user)  # JWT token generatsiya qilinadi
-            return Response({
-                "refresh": str(refresh),
-                "access": str(refresh.access_token),
-            })
+        if user:
+            tokens = issue_tokens(user, timer)  # JWT token generatsiya qilinadi
+            timer.finish()
+            return Response(tokens)
 
+        timer.finish()
         return Response(
             {"status": False, "detail": "Telefon raqam yoki parol noto‘g‘ri"},
             status=status.HTTP_401_UNAUTHORIZED
         )
 
 
+class TokenRefreshAPIView(TokenRefreshView): # Refresh token orqali yangi access token olish (vaqti o‘lchanadi)
+
+    def post(self, request, *args, **kwargs):
+        timer = LoginTimer('token refresh')
+        response = super().post(request, *args, **kwargs)
+        timer.mark('refresh')
+        timer.finish()
+        return response
+
+
 class LogoutView(APIView): #Foydalanuvchini tizimdan chiqarish (logout)
 
     permission_classes = [IsAuthenticated]
@@ -44,7 +57,7 @@ class LogoutView(APIView): #Foydalanuvchini tizimdan chiqarish (logout)
     def post(self, request):
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = CachedRefreshToken(refresh_token)
             token.blacklist()
             return Response({"message": "Logout successful"}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -91,14 +104,18 @@ class ChangePasswordView(APIView): # Foydalanuvchi parolini yangilash
 
 class VerifyOTPView(APIView): #SMS orqali yuborilgan OTP kodni tasdiqlash
 
+    throttle_classes = [IPTokenBucketThrottle, PhoneTokenBucketThrottle]  # Xeshlash va bazadan oldin tekshiriladi
+    throttle_scope = 'otp'
+
     @swagger_auto_schema(request_body=VerifyOTPSerializer)
     def post(self, request):
         serializer = VerifyOTPSerializer(data=request.data)
         if serializer.is_valid():
             phone = serializer.validated_data['phone']
 
-            # Telefon raqamni kesh ga saqlash
-            cache.set(f"verified_{phone}", True, timeout=900)
+            # Telefon raqamni kesh ga saqlash, OTP qayta ishlatilmasligi uchun o‘chiriladi
+            VERIFIED_CACHE.set(phone, True)
+            OTP_CACHE.delete(phone)
 
             return Response(
                 {"status": True, "detail": "OTP verified successfully"},
@@ -110,12 +127,15 @@ class VerifyOTPView(APIView): #SMS orqali yuborilgan OTP kodni tasdiqlash
 
 class SetNewPasswordView(APIView): #Parolni OTP tasdiqlangandan keyin yangilash
 
+    throttle_classes = [IPTokenBucketThrottle, PhoneTokenBucketThrottle]  # Xeshlash va bazadan oldin tekshiriladi
+    throttle_scope = 'password-reset'
+
     @swagger_auto_schema(request_body=SetNewPasswordSerializer)
     def post(self, request):
         serializer = SetNewPasswordSerializer(data=request.data)
         if serializer.is_valid():
             phone = serializer.validated_data['phone']
-            verified = cache.get(f"verified_{phone}")  # OTP tasdiqlanganmi tekshiramiz
+            verified = VERIFIED_CACHE.get(phone)  # OTP tasdiqlanganmi tekshiramiz
 
             if not verified:
                 return Response(
@@ -127,6 +147,7 @@ class SetNewPasswordView(APIView): #Parolni OTP tasdiqlangandan keyin yangilash
             if user:
                 user.set_password(serializer.validated_data['new_password'])
                 user.save()
+                VERIFIED_CACHE.delete(phone)
 
                 return Response(
                     {"status": True, "detail": "Password successfully set"},
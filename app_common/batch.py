@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from app_common.prefetch import prefetch_for
+
+BATCH_CHUNK_SIZE = 500  # Bitta IN (...) so‘rovidagi id lar soni (SQLite parametr chegarasidan ancha past)
+MAX_BATCH_IDS = 10000  # Bitta so‘rovda qabul qilinadigan id lar soni
+
+
+class IdentityMap: # So‘rov davomida allaqachon olingan obyektlar: (serializer, pk) -> obyekt
+    def __init__(self):
+        self._objects = defaultdict(dict)
+
+    def get_many(self, key, ids):
+        objects = self._objects[key]
+        return {pk: objects[pk] for pk in ids if pk in objects}
+
+    def add(self, key, objects):
+        self._objects[key].update((obj.pk, obj) for obj in objects)
+
+
+def get_identity_map(request): # Har bir so‘rov uchun bitta IdentityMap
+    if not hasattr(request, '_identity_map'):
+        request._identity_map = IdentityMap()
+    return request._identity_map
+
+
+def fetch_by_ids(serializer_class, ids, queryset=None, identity_map=None, chunk_size=BATCH_CHUNK_SIZE):
+    # (obyektlar chaqiruvchi bergan tartibda, topilmagan id lar). Takroriy id lar bir marta qaytariladi,
+    # har bir chunk serializer prefetch rejasi bilan alohida olinadi.
+    if queryset is None:
+        queryset = serializer_class.Meta.model.objects.all()
+    identity_map = identity_map or IdentityMap()
+
+    unique_ids = list(dict.fromkeys(ids))
+    found = identity_map.get_many(serializer_class, unique_ids)
+    pending = [pk for pk in unique_ids if pk not in found]
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = prefetch_for(serializer_class, queryset.filter(pk__in=pending[start:start + chunk_size]))
+        identity_map.add(serializer_class, chunk)
+        found.update(identity_map.get_many(serializer_class, pending[start:start + chunk_size]))
+
+    return [found[pk] for pk in unique_ids if pk in found], [pk for pk in unique_ids if pk not in found]
@@ -0,0 +1,34 @@
+import statistics
+
+from django.conf import settings
+
+
+def percentiles(samples): # millisekundlarda p50/p95/p99
+    if len(samples) < 2:
+        value = round(samples[0], 1) if samples else None
+        return {'count': len(samples), 'p50': value, 'p95': value, 'p99': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'count': len(samples), 'p50': round(cuts[49], 1), 'p95': round(cuts[94], 1), 'p99': round(cuts[98], 1)}
+
+
+def bench_host(): # Test client uchun ALLOWED_HOSTS dagi birinchi aniq host
+    return next((host for host in settings.ALLOWED_HOSTS if host and host != '*' and not host.startswith('.')),
+                'localhost')
+
+
+def compare_reports(baseline, report, threshold=0.2, min_ms=2.0):
+    # Baseline bilan solishtirish: p95 threshold ulushidan (va min_ms dan) ko‘proq sekinlashgan yoki
+    # so‘rovlar soni oshgan endpointlar [(nom, sabab), ...] ko‘rinishida qaytariladi
+    regressions = []
+    for name, row in report['endpoints'].items():
+        base = baseline.get('endpoints', {}).get(name)
+        if not base:
+            continue
+        if row['queries'] > base['queries']:
+            regressions.append((name, f"queries {base['queries']} -> {row['queries']}"))
+        if base['p95'] is not None and row['p95'] is not None \
+                and row['p95'] > base['p95'] * (1 + threshold) and row['p95'] - base['p95'] > min_ms:
+            regressions.append((name, f"p95 {base['p95']}ms -> {row['p95']}ms"))
+        if row['status'] != base['status']:
+            regressions.append((name, f"status {base['status']} -> {row['status']}"))
+    return regressions
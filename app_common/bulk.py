@@ -0,0 +1,212 @@
+import copy
+
+from django.db import transaction
+from django.utils import timezone
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from app_common.response_cache import model_changed
+from app_common.serializers import BulkItemsSerializer, BulkDeleteSerializer
+
+
+class BulkUpdateListSerializer(serializers.ListSerializer): # many=True yangilash: har bir element o‘z obyekti bilan tekshiriladi
+    def run_child_validation(self, data):
+        self.child.instance = next(self._instances)
+        self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def is_valid(self, *, raise_exception=False):
+        self._instances = iter(self.instance)
+        return super().is_valid(raise_exception=raise_exception)
+
+
+def validate_items(serializer_class, items, instances=None, context=None):
+    # (to‘g‘ri elementlar [(indeks, validated_data)], xatolar {indeks: xato}). Tekshiruv many=True
+    # serializer bilan bir marta o‘tadi, xato bo‘lsa qolgan to‘g‘ri elementlar yana bir marta tekshiriladi.
+    def run(indexes):
+        if instances is None:
+            serializer = serializer_class(data=[items[i] for i in indexes], many=True, context=context)
+        else:
+            serializer = BulkUpdateListSerializer([instances[i] for i in indexes],
+                                                  data=[items[i] for i in indexes], partial=True,
+                                                  context=context,
+                                                  child=serializer_class(partial=True, context=context))
+        serializer.is_valid()
+        return serializer
+
+    indexes = list(range(len(items)))
+    serializer = run(indexes)
+    if not serializer.errors:
+        return list(zip(indexes, serializer.validated_data)), {}
+    if not isinstance(serializer.errors, list):  # Ro‘yxat darajasidagi xato barcha elementlarga tegishli
+        return [], {i: serializer.errors for i in indexes}
+
+    errors = {i: error for i, error in zip(indexes, serializer.errors) if error}
+    indexes = [i for i in indexes if i not in errors]
+    if not indexes:
+        return [], errors
+    serializer = run(indexes)
+    if serializer.errors:  # Elementlar bir-biriga bog‘liq bo‘lsa – hammasi rad etiladi
+        errors.update({i: serializer.errors for i in indexes})
+        return [], errors
+    return list(zip(indexes, serializer.validated_data)), errors
+
+
+def split_m2m(model, data): # validated_data dan ManyToMany qiymatlarini ajratadi
+    names = {field.name for field in model._meta.many_to_many}
+    return {name: data.pop(name) for name in list(data) if name in names}
+
+
+def set_m2m(model, objects, m2m_values, replace=False): # ManyToMany bog‘lanishlari through jadvaliga bulk_create bilan yoziladi
+    for field in model._meta.many_to_many:
+        owners = [(obj, values[field.name]) for obj, values in zip(objects, m2m_values) if field.name in values]
+        if not owners:
+            continue
+        through = field.remote_field.through
+        source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+        if replace:
+            through.objects.filter(**{f'{source}__in': [obj.pk for obj, _ in owners]}).delete()
+        through.objects.bulk_create([
+            through(**{source: obj.pk, target: getattr(related, 'pk', related)})
+            for obj, related in owners for related in dict.fromkeys(related)
+        ], ignore_conflicts=True)
+
+
+class BulkWriteMixin: # ViewSet ga bulk/create, bulk/update va bulk/delete actionlarini qo‘shadi
+    # Yozuvlar bulk_create / bulk_update / filter().delete() bilan bitta tranzaksiyada saqlanadi,
+    # har bir element uchun alohida natija qaytariladi. Signal yubormaydigan amallardan keyingi
+    # qo‘shimcha ishlar (rollup, kesh) bulk_* hooklarida bajariladi.
+    bulk_serializer_class = None
+
+    def get_bulk_model(self):
+        return self.bulk_serializer_class.Meta.model
+
+    def get_bulk_extra_fields(self, request): # Har bir yangi yozuvga qo‘shiladigan maydonlar (masalan teacher), ruxsat bo‘lmasa PermissionDenied
+        return {}
+
+    def prepare_bulk_objects(self, objects): # Yozishdan oldin hisoblanadigan maydonlar, ularning nomlari qaytariladi
+        return ()
+
+    def bulk_created(self, objects):
+        pass
+
+    def bulk_updated(self, objects, previous): # previous – {pk: o‘zgarishdan oldingi nusxa}
+        pass
+
+    def bulk_deleted(self, objects):
+        pass
+
+    def _bulk_response(self, count_key, results, success_status):
+        count = sum(1 for result in results if 'errors' not in result)
+        return Response({
+            'status': bool(count),
+            count_key: count,
+            'results': results,
+        }, status=success_status if count else status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='bulk/create')
+    @swagger_auto_schema(request_body=BulkItemsSerializer)
+    def bulk_create_items(self, request): # Bir nechta yozuvni bitta so‘rovda yaratish
+        payload = BulkItemsSerializer(data=request.data)
+        if not payload.is_valid():
+            return Response(payload.errors, status=status.HTTP_400_BAD_REQUEST)
+        items = payload.validated_data['items']
+
+        model = self.get_bulk_model()
+        extra = self.get_bulk_extra_fields(request)  # PermissionDenied bo‘lsa elementlar tekshirilmaydi
+        valid, errors = validate_items(self.bulk_serializer_class, items, context={'request': request})
+
+        objects, m2m_values = [], []
+        for _, data in valid:
+            data = {**data, **extra}
+            m2m_values.append(split_m2m(model, data))
+            objects.append(model(**data))
+
+        self.prepare_bulk_objects(objects)
+        with transaction.atomic():
+            created = model.objects.bulk_create(objects)
+            set_m2m(model, created, m2m_values)
+            self.bulk_created(created)
+            if created:
+                transaction.on_commit(lambda: model_changed(model))
+
+        results = [{'index': i, 'errors': error} for i, error in errors.items()]
+        results += [{'index': i, 'id': obj.pk} for (i, _), obj in zip(valid, created)]
+        return self._bulk_response('created', sorted(results, key=lambda result: result['index']),
+                                   status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['put', 'patch'], url_path='bulk/update')
+    @swagger_auto_schema(request_body=BulkItemsSerializer)
+    def bulk_update_items(self, request): # Bir nechta yozuvni bitta so‘rovda yangilash, har bir elementda "id" bo‘lishi kerak
+        payload = BulkItemsSerializer(data=request.data)
+        if not payload.is_valid():
+            return Response(payload.errors, status=status.HTTP_400_BAD_REQUEST)
+        items = payload.validated_data['items']
+
+        model = self.get_bulk_model()
+        ids = [item.get('id') for item in items]
+        found = model.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+
+        errors, indexes, seen = {}, [], set()
+        for i, pk in enumerate(ids):
+            if not isinstance(pk, int) or pk not in found:
+                errors[i] = {'id': ['Yozuv topilmadi']}
+            elif pk in seen:
+                errors[i] = {'id': ['Yozuv bir necha marta berilgan']}
+            else:
+                seen.add(pk)
+                indexes.append(i)
+
+        valid, item_errors = validate_items(self.bulk_serializer_class, [items[i] for i in indexes],
+                                            instances=[found[ids[i]] for i in indexes],
+                                            context={'request': request})
+        errors.update({indexes[j]: error for j, error in item_errors.items()})
+
+        now = timezone.now()
+        auto_now = [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        objects, m2m_values, fields, previous = [], [], set(auto_now), {}
+        for j, data in valid:
+            obj = found[ids[indexes[j]]]
+            previous[obj.pk] = copy.copy(obj)
+            m2m_values.append(split_m2m(model, data))
+            for name, value in data.items():
+                setattr(obj, name, value)
+                fields.add(model._meta.get_field(name).name)
+            for name in auto_now:
+                setattr(obj, name, now)
+            objects.append(obj)
+        fields.update(self.prepare_bulk_objects(objects))
+
+        with transaction.atomic():
+            if objects:
+                model.objects.bulk_update(objects, sorted(fields))
+            set_m2m(model, objects, m2m_values, replace=True)
+            self.bulk_updated(objects, previous)
+            if objects:
+                transaction.on_commit(lambda: model_changed(model))
+
+        results = [{'index': i, 'errors': error} for i, error in errors.items()]
+        results += [{'index': indexes[j], 'id': obj.pk} for (j, _), obj in zip(valid, objects)]
+        return self._bulk_response('updated', sorted(results, key=lambda result: result['index']),
+                                   status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='bulk/delete')
+    @swagger_auto_schema(request_body=BulkDeleteSerializer)
+    def bulk_delete_items(self, request): # Bir nechta yozuvni id lar bo‘yicha bitta so‘rovda o‘chirish
+        payload = BulkDeleteSerializer(data=request.data)
+        if not payload.is_valid():
+            return Response(payload.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(payload.validated_data['ids']))
+
+        model = self.get_bulk_model()
+        objects = list(model.objects.filter(pk__in=ids))
+        with transaction.atomic():
+            model.objects.filter(pk__in=[obj.pk for obj in objects]).delete()
+            self.bulk_deleted(objects)
+
+        deleted = {obj.pk for obj in objects}
+        results = [{'index': i, 'id': pk} if pk in deleted else {'index': i, 'id': pk, 'errors': {'id': ['Yozuv topilmadi']}}
+                   for i, pk in enumerate(ids)]
+        return self._bulk_response('deleted', results, status.HTTP_200_OK)
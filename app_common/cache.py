@@ -0,0 +1,103 @@
+import threading
+from collections import Counter
+
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+STATS_FLUSH_EVERY = 100  # Mahalliy hit/miss hisoblagichlari shuncha murojaatdan keyin umumiy keshga yoziladi
+
+_MISSING = object()
+_registry = {}
+
+
+class NamespacedCache: # Umumiy kesh ustidagi nomlar fazosi: kalit prefiksi, standart TTL va hit/miss hisoblagichlari
+    def __init__(self, namespace, timeout=DEFAULT_TIMEOUT, alias=DEFAULT_CACHE_ALIAS):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        _registry[namespace] = self
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def get(self, key, default=None):
+        value = self.cache.get(self.make_key(key), _MISSING)
+        self._count('hits' if value is not _MISSING else 'misses')
+        return default if value is _MISSING else value
+
+    def get_many(self, keys):
+        found = self.cache.get_many([self.make_key(key) for key in keys])
+        prefix = len(self.namespace) + 1
+        found = {key[prefix:]: value for key, value in found.items()}
+        self._count('hits', len(found))
+        self._count('misses', len(keys) - len(found))
+        return found
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT): # default chaqiriluvchi bo‘lsa faqat miss bo‘lganda hisoblanadi
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default() if callable(default) else default
+            self.set(key, value, timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.cache.set(self.make_key(key), value, self._timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT): # Kalit yo‘q bo‘lsagina yoziladi, natija True/False
+        return self.cache.add(self.make_key(key), value, self._timeout(timeout))
+
+    def delete(self, key):
+        return self.cache.delete(self.make_key(key))
+
+    def delete_many(self, keys):
+        self.cache.delete_many([self.make_key(key) for key in keys])
+
+    def incr(self, key, delta=1, timeout=DEFAULT_TIMEOUT): # Kalit bo‘lmasa delta qiymati bilan yaratiladi
+        if self.add(key, delta, timeout):
+            return delta
+        try:
+            return self.cache.incr(self.make_key(key), delta)
+        except ValueError:  # add va incr orasida muddati tugagan bo‘lsa
+            self.set(key, delta, timeout)
+            return delta
+
+    def _timeout(self, timeout):
+        return self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _count(self, kind, amount=1):
+        if not amount:
+            return
+        with self._lock:
+            self._pending[kind] += amount
+            if sum(self._pending.values()) < STATS_FLUSH_EVERY:
+                return
+            pending, self._pending = self._pending, Counter()
+        self._flush(pending)
+
+    def _flush(self, pending):
+        for kind, amount in pending.items():
+            key = f'cache-stats:{self.namespace}:{kind}'
+            if not self.cache.add(key, amount, None):
+                try:
+                    self.cache.incr(key, amount)
+                except ValueError:
+                    self.cache.set(key, amount, None)
+
+    def stats(self): # Barcha protsesslar bo‘yicha yig‘ilgan va shu protsessda hali yozilmagan hisoblagichlar
+        with self._lock:
+            pending = Counter(self._pending)
+        stored = self.cache.get_many([f'cache-stats:{self.namespace}:{kind}' for kind in ('hits', 'misses')])
+        hits = stored.get(f'cache-stats:{self.namespace}:hits', 0) + pending['hits']
+        misses = stored.get(f'cache-stats:{self.namespace}:misses', 0) + pending['misses']
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total * 100, 2) if total else None}
+
+
+def cache_stats(): # {namespace: {'hits', 'misses', 'hit_rate'}}
+    return {namespace: namespaced.stats() for namespace, namespaced in sorted(_registry.items())}
@@ -0,0 +1,91 @@
+import hashlib
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.db.models import Max
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def not_modified_response(request, etag, last_modified): # If-None-Match / If-Modified-Since mos kelsa 304, aks holda None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None or response.status_code != status.HTTP_304_NOT_MODIFIED:
+        return None
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'  # Mijoz har safar ETag bilan qayta tekshiradi
+    return response
+
+
+def conditional_retrieve(model, field='updated_at', lookup='pk', related=()): # retrieve() uchun ETag/304, serializerdan oldin
+    # ETag (pk, field) dan bitta values_list so‘rovi bilan hisoblanadi. related – javobga ichma-ich
+    # kiradigan bog‘lanishlar, ularning eng so‘nggi updated_at qiymati ham shu so‘rovda olinadi.
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            queryset = model.objects.filter(pk=kwargs.get(lookup))
+            names = [f'_{name}_updated' for name in related]
+            if related:
+                queryset = queryset.annotate(**{name: Max(f'{relation}__updated_at')
+                                                for name, relation in zip(names, related)})
+            try:
+                row = queryset.values_list('pk', field, *names).first()
+            except (ValueError, TypeError, ValidationError):
+                row = None
+            if row is None:  # 404 va noto‘g‘ri id ko‘rinishning o‘zida qaytariladi
+                return view_method(self, request, *args, **kwargs)
+
+            modified = max(value for value in row[1:] if value is not None)
+            digest = hashlib.md5(f'{model._meta.label_lower}:{row}'.encode()).hexdigest()
+            etag = f'"{digest[:20]}"'
+            last_modified = int(modified.timestamp())
+
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+def _updated_field(model):
+    return 'updated_at' if any(field.name == 'updated_at' for field in model._meta.fields) else 'updated'
+
+
+def touch_on_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs): # M2M o‘zgarsa egasining updated_at yangilanadi
+    if action == 'pre_clear' and reverse:
+        # Teskari tomondan clear() da pk_set berilmaydi, egalar oldindan yig‘ib qo‘yiladi
+        owner = model
+        field = next(field for field in owner._meta.many_to_many if field.remote_field.through is sender)
+        instance._m2m_clear_pks = set(owner.objects.filter(**{field.name: instance}).values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        owner, pks = type(instance), {instance.pk}
+    elif action == 'post_clear':
+        owner, pks = model, getattr(instance, '_m2m_clear_pks', set())
+    else:
+        owner, pks = model, pk_set
+    if pks:
+        owner.objects.filter(pk__in=pks).update(**{_updated_field(owner): timezone.now()})
+
+
+def track_m2m_changes(*fields): # AppConfig.ready() dan chaqiriladi, masalan track_m2m_changes(Student.group)
+    for descriptor in fields:
+        through = descriptor.through
+        m2m_changed.connect(touch_on_m2m_change, sender=through, dispatch_uid=f'touch-{through._meta.label_lower}')
@@ -0,0 +1,170 @@
+import json
+import secrets
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_attendance.models import Status, Attendance
+from app_auth.tokens import CachedRefreshToken
+from app_common.benchmark import percentiles, bench_host, compare_reports
+from app_common.middleware import QueryRecorder
+from app_courses.models import Group, Subject, Course, Table, TableType, Homework, HomeworkSubmission, HomeworkReview
+from app_payment.models import Month, PaymentType, Payment
+from app_users.models import User, Student, Teacher, Parent
+
+LIST_ROUTES = (
+    'users:user-list', 'users:all_students', 'users:all_teachers', 'users:parent-list',
+    'courses:group-list', 'courses:subject-list', 'courses:course-list', 'courses:table-list',
+    'courses:table-type-list', 'courses:homework-list', 'courses:homework-submission-list',
+    'courses:homework-submission-pending', 'courses:homework-review-list', 'payments:month-list',
+    'payments:payment-type-list', 'payments:payment-list',
+    'attendances:status-list', 'attendances:attendance-list',
+)
+
+# route -> (model, URL argumenti nomi)
+RETRIEVE_ROUTES = {
+    'users:user-detail': (User, 'id'),
+    'users:student': (Student, 'id'),
+    'users:teacher': (Teacher, 'id'),
+    'users:student_groups': (Student, 'student_id'),
+    'users:teacher_groups': (Teacher, 'teacher_id'),
+    'users:parent-detail': (Parent, 'pk'),
+    'courses:group-detail': (Group, 'pk'),
+    'courses:subject-detail': (Subject, 'pk'),
+    'courses:course-detail': (Course, 'pk'),
+    'courses:table-detail': (Table, 'pk'),
+    'courses:table-type-detail': (TableType, 'pk'),
+    'courses:homework-detail': (Homework, 'pk'),
+    'courses:homework-submission-detail': (HomeworkSubmission, 'pk'),
+    'courses:homework-review-detail': (HomeworkReview, 'pk'),
+    'payments:month-detail': (Month, 'pk'),
+    'payments:payment-type-detail': (PaymentType, 'pk'),
+    'payments:payment-detail': (Payment, 'pk'),
+    'attendances:status-detail': (Status, 'pk'),
+    'attendances:attendance-detail': (Attendance, 'pk'),
+    'attendances:student_attendance': (Student, 'student_id'),
+    'attendances:group_attendance': (Group, 'group_id'),
+}
+
+# route -> (model, so‘rov tanasidagi kalit)
+BY_IDS_ROUTES = {
+    'users:students-by-id': (Student, 'student_ids'),
+    'users:teachers-by-id': (Teacher, 'teacher_ids'),
+    'courses:get-groups-by-ids': (Group, 'group_ids'),
+}
+
+
+def build_endpoints(ids=100): # [(nom, method, url, body)] – bazadagi mavjud yozuvlar bo‘yicha
+    endpoints = [(route, 'get', reverse(route), None) for route in LIST_ROUTES]
+
+    for route, (model, kwarg) in RETRIEVE_ROUTES.items():
+        pk = model.objects.order_by('pk').values_list('pk', flat=True).first()
+        if pk is not None:
+            endpoints.append((route, 'get', reverse(route, kwargs={kwarg: pk}), None))
+
+    for route, (model, key) in BY_IDS_ROUTES.items():
+        pks = list(model.objects.order_by('pk').values_list('pk', flat=True)[:ids])
+        if pks:
+            endpoints.append((route, 'post', reverse(route), {key: pks}))
+
+    today = timezone.localdate()
+    endpoints += [
+        ('statistics:recent-students', 'post', reverse('statistics:recent-students'),
+         {'start_date': str(today - timedelta(days=90)), 'end_date': str(today)}),
+        ('statistics:timeseries', 'get',
+         f"{reverse('statistics:timeseries')}?period=day&start_date={today - timedelta(days=30)}&end_date={today}", None),
+        ('statistics:cache-stats', 'get', reverse('statistics:cache-stats'), None),
+        ('payments:payment-report', 'get', f"{reverse('payments:payment-report')}?group_by=month&group_by=group", None),
+    ]
+    return endpoints
+
+
+class Command(BaseCommand): # Barcha list, retrieve, by-ids va statistika endpointlari kechikishi va so‘rovlar soni
+    help = "Benchmark list/retrieve/by-ids/statistics endpoints and compare against a JSON baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help="Har bir endpoint uchun o‘lchanadigan so‘rovlar")
+        parser.add_argument('--ids', type=int, default=100, help="by-ids endpointlariga yuboriladigan id lar soni")
+        parser.add_argument('--output', help="Natijani JSON faylga yozish")
+        parser.add_argument('--baseline', help="Solishtiriladigan oldingi JSON natija")
+        parser.add_argument('--threshold', type=float, default=0.2, help="p95 uchun ruxsat etilgan sekinlashish ulushi")
+        parser.add_argument('--fail-on-regression', action='store_true')
+        parser.add_argument('--filter', help="Faqat nomida shu matn bor endpointlar")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Baseline faylni o‘qib bo‘lmadi: {e}")
+
+        endpoints = [endpoint for endpoint in build_endpoints(options['ids'])
+                     if not options['filter'] or options['filter'] in endpoint[0]]
+        admin = User.objects.create_user(phone=f'99899{secrets.randbelow(10 ** 7):07d}',
+                                         password=secrets.token_urlsafe(12), full_name='bench',
+                                         is_admin=True, is_staff=True)
+        try:
+            token = CachedRefreshToken.for_user(admin).access_token
+            client = Client(raise_request_exception=False, HTTP_HOST=bench_host(), HTTP_AUTHORIZATION=f'Bearer {token}')
+            with override_settings(QUERY_BUDGET_STRICT=False):
+                report = self.run(client, endpoints, max(1, options['requests']))
+        finally:
+            admin.delete()
+
+        report['meta'] = {
+            'requests': options['requests'],
+            'ids': options['ids'],
+            'rows': {model.__name__.lower(): model.objects.count()
+                     for model in (User, Student, Teacher, Parent, Group, Homework, HomeworkSubmission,
+                                   Attendance, Payment)},
+            'finished': timezone.now().isoformat(),
+        }
+        self.print_report(report)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Saved to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare_reports(baseline, report, threshold=options['threshold'])
+            for name, reason in regressions:
+                self.stdout.write(self.style.WARNING(f"REGRESSION {name}: {reason}"))
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
+            elif options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} regressions against baseline")
+
+    def run(self, client, endpoints, requests):
+        results = {}
+        for name, method, url, body in endpoints:
+            call = getattr(client, method)
+            kwargs = {'data': json.dumps(body), 'content_type': 'application/json'} if body is not None else {}
+
+            call(url, **kwargs)  # Isitish: keshlar to‘ldiriladi
+            # request_started signali queries_log ni tozalaydi, shuning uchun execute_wrapper orqali sanaladi
+            queries = QueryRecorder()
+            with connection.execute_wrapper(queries):
+                response = call(url, **kwargs)
+
+            samples = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                call(url, **kwargs)
+                samples.append((time.perf_counter() - started) * 1000)
+
+            results[name] = {'status': response.status_code, 'queries': queries.count, **percentiles(samples)}
+        return {'endpoints': results}
+
+    def print_report(self, report):
+        self.stdout.write(f"{'endpoint':<42} {'status':>6} {'queries':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, row in report['endpoints'].items():
+            self.stdout.write(f"{name:<42} {row['status']:>6} {row['queries']:>7} "
+                              + ' '.join(f"{row[key]:>8}" for key in ('p50', 'p95', 'p99')))
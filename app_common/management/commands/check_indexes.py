@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum, Count, Q
+from django.utils import timezone
+
+from app_attendance.models import Attendance, GroupDailyAttendance
+from app_courses.models import HomeworkSubmission
+from app_courses.submissions import teacher_groups
+from app_payment.models import Payment
+from app_users.models import Student, HomeworkHistory
+
+
+def key_queries(): # (nom, queryset, kutilgan indeks nomlari) – kod ichidagi asosiy filtr va saralash yo‘llari
+    now = timezone.now()
+    today = timezone.localdate()
+    return [
+        ('student keyset page', Student.objects.order_by('created_at', 'id')[:21], 'student_created_id_idx'),
+        ('student registrations range',
+         Student.objects.filter(created_at__gte=now - timedelta(days=30), created_at__lt=now).values('id'),
+         'student_created_id_idx'),
+        ('payment revenue range',
+         Payment.objects.filter(created_at__gte=now - timedelta(days=30), created_at__lt=now).values('created_at'),
+         'payment_created_id_idx'),
+        ('payment debts by student/group/month',
+         Payment.objects.filter(student_id__in=[1, 2], group_id__in=[1], month_id__in=[1])
+         .values_list('student_id', 'group_id', 'month_id').annotate(total=Sum('price')).order_by(),
+         'payment_student_month_idx'),
+        ('attendance history of student',
+         Attendance.objects.filter(student_id=1).order_by('-date', '-id').values('id', 'date'),
+         'attendance_student_date_idx'),
+        ('group daily attendance range',
+         GroupDailyAttendance.objects.filter(group_id=1, date__range=[today - timedelta(days=30), today]),
+         # SQLite CREATE TABLE ichidagi UNIQUE cheklov indeksini o‘zi nomlaydi
+         ('unique_group_daily_attendance', 'sqlite_autoindex_app_attendance_groupdailyattendance')),
+        ('teacher review queue',
+         HomeworkSubmission.objects.filter(group__in=teacher_groups(1), is_checked=False).order_by('created_at', 'id')[:21],
+         'submission_pending_idx'),
+        ('review queue of one group',
+         HomeworkSubmission.objects.filter(group_id=1, is_checked=False).order_by('created_at', 'id')[:21],
+         'submission_pending_idx'),
+        ('homework completion range',
+         HomeworkHistory.objects.filter(due_date__gte=today - timedelta(days=30), due_date__lt=today)
+         .values('due_date').annotate(done=Count('id', filter=Q(completed=True))).order_by(),
+         'hwhistory_due_completed_idx'),
+    ]
+
+
+class Command(BaseCommand): # Asosiy so‘rovlar uchun EXPLAIN ishlatib, kutilgan indeks ishlatilayotganini tekshiradi
+    help = "Run EXPLAIN on the key queries and check that the expected indexes are used"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help="Har bir so‘rov rejasini to‘liq chiqarish")
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Kichik jadvallarda planner seq scan ni tanlaydi, bu yerda indeks ishlata olishi tekshiriladi
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for name, queryset, index in key_queries():
+                plan = queryset.explain()
+                indexes = (index,) if isinstance(index, str) else index
+                used = any(candidate in plan for candidate in indexes)
+                if not used:
+                    failures.append(name)
+                style = self.style.SUCCESS if used else self.style.ERROR
+                self.stdout.write(style(f"{'ok' if used else 'MISSING':<8} {name:<38} {indexes[0]}"))
+                if options['verbose_plans'] or not used:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries do not use the expected index: {', '.join(failures)}")
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app_common.synthetic import generate, clear_synthetic_data, PHONE_PREFIX
+from app_users.models import User
+
+
+class Command(BaseCommand): # Benchmark va yuklama sinovlari uchun sintetik LMS ma'lumotlarini yaratadi
+    help = "Generate a synthetic LMS dataset (users, groups, homework, attendance, payments) at a given scale"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help="Masshtab: talabalar soni")
+        parser.add_argument('--days', type=int, default=30, help="Necha kunlik davomat yaratiladi")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--password', default='bench-password', help="Barcha sintetik foydalanuvchilar paroli")
+        parser.add_argument('--clear', action='store_true', help="Avvalgi sintetik ma'lumotlarni o‘chirish")
+
+    def handle(self, *args, **options):
+        if not options['clear'] and User.objects.filter(phone__startswith=PHONE_PREFIX).exists():
+            raise CommandError("Sintetik ma'lumotlar allaqachon mavjud, --clear bilan qayta yarating")
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options['clear']:
+                self.stdout.write(f"Deleted {clear_synthetic_data()} synthetic rows")
+            counts = generate(students=options['students'], days=options['days'], seed=options['seed'],
+                              password=options['password'])
+
+        self.stdout.write(', '.join(f'{name}={count}' for name, count in counts.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated in {time.perf_counter() - started:.1f}s (users {PHONE_PREFIX}xxxxxxx, password {options['password']!r})"))
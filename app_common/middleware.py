@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('app_common.queries')
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+class QueryBudgetExceeded(AssertionError): # QUERY_BUDGET_STRICT yoqilganda (testlarda) so‘rovni yiqitadi
+    pass
+
+
+def fingerprint(sql): # SQL shakli: qiymatlar va IN (...) ro‘yxati uzunligi hisobga olinmaydi
+    return _IN_LIST.sub('(?)', _LITERALS.sub('?', sql))
+
+
+class QueryRecorder: # connection.execute_wrapper – so‘rovlar soni, vaqti va takrorlanayotgan shakllar
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.shapes[fingerprint(sql)] += 1
+
+    def duplicates(self, threshold): # {shakl: soni} – threshold dan ko‘p takrorlanganlar (N+1 belgisi)
+        return {shape: count for shape, count in self.shapes.most_common() if count > threshold}
+
+
+def get_query_budget(view_name): # settings.QUERY_BUDGETS[view_name], bo‘lmasa QUERY_BUDGET_DEFAULT (0 – cheklovsiz)
+    if view_name in settings.QUERY_BUDGETS:
+        return settings.QUERY_BUDGETS[view_name]
+    return settings.QUERY_BUDGET_DEFAULT or None
+
+
+class QueryInstrumentationMiddleware: # Har bir so‘rov uchun SQL statistikasi: Server-Timing header va log
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        duplicates = recorder.duplicates(settings.QUERY_DUPLICATE_THRESHOLD)
+        budget = get_query_budget(view_name)
+
+        response['Server-Timing'] = (f'db;dur={db_ms:.1f};desc="{recorder.count} queries", '
+                                     f'app;dur={max(total_ms - db_ms, 0):.1f}')
+
+        stats = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(db_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'duplicates': [
+                {'fingerprint': hashlib.md5(shape.encode()).hexdigest()[:12], 'count': count, 'sql': shape[:300]}
+                for shape, count in duplicates.items()
+            ],
+        }
+        if response.streaming:  # Oqimdagi so‘rovlar javob qaytgandan keyin bajariladi, ular hisobga kirmaydi
+            stats['streaming'] = True
+        over_budget = budget is not None and recorder.count > budget and not response.streaming
+        if over_budget:
+            stats['budget'] = budget
+
+        level = logging.WARNING if duplicates or over_budget else logging.INFO
+        logger.log(level, 'query_stats %s', json.dumps(stats), extra={'query_stats': stats})
+
+        if over_budget and settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(f'{view_name}: {recorder.count} queries (budget {budget})')
+        return response
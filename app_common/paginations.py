@@ -1,7 +1,156 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class Pagination(PageNumberPagination):
     page_size = 20 #page_size – Har bir sahifada nechta obyekt bo‘lishini belgilaydi
     page_size_query_param = 'page_size' #page_size_query_param – Foydalanuvchi URL orqali sahifa o‘lchamini o‘zgartira oladi
-    max_page_size = 50 #max_page_size – Maksimal ruxsat berilgan sahifa hajmi
\ No newline at end of file
+    max_page_size = 50 #max_page_size – Maksimal ruxsat berilgan sahifa hajmi
+
+    def get_list_response(self, data): # ViewSet list() lar avvalgidek oddiy ro‘yxat qaytaradi
+        return Response(data)
+
+
+class KeysetPagination(BasePagination): # (created_at, id) bo‘yicha kursorli sahifalash: OFFSET va COUNT(*) ishlatilmaydi
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    cursor_query_param = 'cursor' # Shaffof bo‘lmagan (opaque) kursor
+    count_query_param = 'count' # count=exact – aniq son, count=estimate – taxminiy son, aks holda hisoblanmaydi
+    ordering = ('created_at', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset, request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        results = list(queryset[:self.page_size + 1]) # Keyingi sahifa borligini bilish uchun bitta ortiqcha yozuv olinadi
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.next_position = self.get_position(results[-1]) if self.has_next else None
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            return estimate_count(queryset)
+        return None
+
+    def get_position(self, obj): # Oxirgi yozuvning ordering maydonlari qiymati
+        position = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip('-'))
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_position_filter(self, position): # (a, b) > (x, y)  =>  a > x OR (a = x AND b > y)
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            position = json.loads(raw)
+        except (binascii.Error, ValueError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        return [self.parse_position_value(field.lstrip('-'), value) for field, value in zip(self.ordering, position)]
+
+    def parse_position_value(self, name, value): # Kursor qiymati filtrga berilishidan oldin turi tekshiriladi: id – int, qolganlari – ISO vaqt
+        if name == 'id':
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+        elif isinstance(value, str):
+            try:
+                parsed = parse_datetime(value)
+            except ValueError:  # Formati to‘g‘ri, lekin sana mavjud emas (masalan 13-oy)
+                parsed = None
+            if parsed is not None:
+                return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+        raise NotFound('Invalid cursor')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, 'pagination', 'cursor')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link()}
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
+
+    def get_list_response(self, data):
+        return self.get_paginated_response(data)
+
+
+def estimate_count(queryset): # Filtrsiz jadval uchun arzon taxminiy son, filtr bo‘lsa aniq COUNT
+    if queryset.query.where:
+        return queryset.count()
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+
+    # Primary key indeksidan olinadi, o‘chirilgan yozuvlar hisobga olinmaydi
+    return queryset.aggregate(max_id=Max('pk'))['max_id'] or 0
+
+
+def get_pagination(request, default=Pagination): # ?pagination=cursor yoki ?pagination=page orqali tanlanadi
+    mode = request.query_params.get('pagination')
+    if mode == 'cursor' or (mode is None and KeysetPagination.cursor_query_param in request.query_params):
+        return KeysetPagination()
+    if mode == 'page':
+        return Pagination()
+    return default()
@@ -1,5 +1,13 @@
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import BasePermission
 
+
+def request_profile(request, name, required=True): # request.user.teacher / .student; profil bo‘lmasa (masalan admin) 500 o‘rniga 403
+    profile = getattr(request.user, name, None)  # required=False bo‘lsa profil yo‘qligida None qaytadi
+    if profile is None and required:
+        raise PermissionDenied(f"Bu amal uchun {name} profili kerak")
+    return profile
+
 class AdminUser(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.is_admin or request.user.is_staff
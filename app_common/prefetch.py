@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+from rest_framework import serializers
+
+
+# Serializer Meta ichida select_related / prefetch_related e'lon qilinadi:
+#
+#     class Meta:
+#         model = Student
+#         fields = (...)
+#         select_related = ('user',)
+#         prefetch_related = ('group', 'cource')
+#
+# Ichma-ich (nested) serializerlarning rejalari avtomatik ravishda
+# maydon nomi bilan prefiks qilinib qo'shiladi.
+
+
+@lru_cache(maxsize=None)
+def get_prefetch_plan(serializer_class): # Serializer uchun (select_related, prefetch_related) juftligini qaytaradi
+    meta = getattr(serializer_class, 'Meta', None)
+    select_related = list(getattr(meta, 'select_related', ()))
+    prefetch_related = list(getattr(meta, 'prefetch_related', ()))
+
+    for field in serializer_class().fields.values():
+        if field.source == '*':
+            continue
+
+        if isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.Serializer):
+            # many=True bo'lgan nested serializer: butun bog'lanish prefetch qilinadi
+            child_select, child_prefetch = get_prefetch_plan(type(field.child))
+            prefetch_related.append(field.source)
+            prefetch_related += [f'{field.source}__{lookup}' for lookup in child_select + child_prefetch]
+
+        elif isinstance(field, serializers.Serializer):
+            # Bitta obyektga ishora qiluvchi nested serializer: JOIN orqali olinadi
+            child_select, child_prefetch = get_prefetch_plan(type(field))
+            select_related.append(field.source)
+            select_related += [f'{field.source}__{lookup}' for lookup in child_select]
+            prefetch_related += [f'{field.source}__{lookup}' for lookup in child_prefetch]
+
+    return tuple(dict.fromkeys(select_related)), tuple(dict.fromkeys(prefetch_related))
+
+
+def apply_prefetch_plan(queryset, serializer_class): # Querysetga serializer rejasini qo'llaydi
+    select_related, prefetch_related = get_prefetch_plan(serializer_class)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+def prefetch_for(serializer_class, queryset=None): # Model.objects.all() o'rniga ishlatiladi
+    if queryset is None:
+        queryset = serializer_class.Meta.model.objects.all()
+    return apply_prefetch_plan(queryset, serializer_class)
+
+
+class PrefetchPlanMixin: # Generic viewlar uchun: get_queryset() ga serializer rejasini qo'shadi
+
+    def get_queryset(self):
+        return apply_prefetch_plan(super().get_queryset(), self.get_serializer_class())
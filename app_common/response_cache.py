@@ -0,0 +1,86 @@
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.signals import post_migrate, post_save, post_delete
+from rest_framework import status
+from rest_framework.response import Response
+
+from app_common.cache import NamespacedCache
+from app_common.conditional import not_modified_response, set_validators
+
+RESPONSE_CACHE = NamespacedCache('response', timeout=24 * 60 * 60)
+MODEL_VERSIONS = NamespacedCache('model-version', timeout=None)
+
+_tracked_models = set()
+
+
+def _version_key(model, using=DEFAULT_DB_ALIAS): # Versiyalar baza nomi bo‘yicha ajratiladi: test va dev bazalari bir keshni bo‘lishmaydi
+    database = hashlib.md5(str(connections[using].settings_dict['NAME']).encode()).hexdigest()[:8]
+    return f'{database}:{model._meta.label_lower}'
+
+
+def model_version(model): # (versiya, oxirgi o‘zgarish vaqti) – model yozuvlari o‘zgarganda yangilanadi
+    key = _version_key(model)
+    version = MODEL_VERSIONS.get(key)
+    if version is None:
+        # Kesh tozalangan bo‘lsa ham eski javoblar bilan to‘qnashmasligi uchun versiya tasodifiy
+        MODEL_VERSIONS.add(key, (uuid.uuid4().hex[:12], int(time.time())))
+        version = MODEL_VERSIONS.get(key)
+    return version
+
+
+def bump_model_version(model, using=DEFAULT_DB_ALIAS):
+    MODEL_VERSIONS.set(_version_key(model, using), (uuid.uuid4().hex[:12], int(time.time())))
+
+
+def model_changed(model, using=DEFAULT_DB_ALIAS): # Signal yubormaydigan bulk_create / bulk_update dan keyin chaqiriladi
+    if model in _tracked_models:
+        bump_model_version(model, using)
+
+
+def _record_changed(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Versiya tranzaksiya commit bo‘lgandan keyin yangilanadi: aks holda parallel so‘rov eski ma'lumotni
+    # yangi versiya bilan keshlab qo‘yishi yoki rollback bo‘lgan o‘zgarish keshni bekorga eskirtirishi mumkin
+    transaction.on_commit(lambda: model_changed(sender, using), using=using)
+
+
+def _reset_model_versions(using=DEFAULT_DB_ALIAS, **kwargs): # migrate / flush dan keyin baza yangidek: eski versiyalar o‘chiriladi
+    MODEL_VERSIONS.delete_many([_version_key(model, using) for model in _tracked_models])
+
+
+def track_model_versions(*models): # AppConfig.ready() dan chaqiriladi
+    for model in models:
+        _tracked_models.add(model)
+        post_save.connect(_record_changed, sender=model, dispatch_uid=f'version-save-{model._meta.label_lower}')
+        post_delete.connect(_record_changed, sender=model, dispatch_uid=f'version-delete-{model._meta.label_lower}')
+    post_migrate.connect(_reset_model_versions, dispatch_uid='version-reset')
+
+
+def versioned_response(*models): # ViewSet.list() javobini endpoint, query parametrlari va model versiyalari bo‘yicha keshlaydi
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            versions = [model_version(model) for model in models]
+            token = '-'.join(version for version, _ in versions)
+            last_modified = max(modified for _, modified in versions)
+            query = sorted(request.query_params.lists())
+            key = hashlib.md5(f'{request.get_host()}{request.path}?{query}'.encode()).hexdigest()
+            etag = f'"{key[:12]}-{token}"'
+
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            data = RESPONSE_CACHE.get(f'{key}:{token}')
+            if data is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                data = response.data
+                RESPONSE_CACHE.set(f'{key}:{token}', data)
+            return set_validators(Response(data), etag, last_modified)
+        return wrapper
+    return decorator
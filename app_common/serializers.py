@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from app_common.streaming import STREAM_FORMATS
+
+BULK_MAX_ITEMS = 500  # Bitta bulk so‘rovdagi elementlar soni
+
+
+class ExportSerializer(serializers.Serializer): # Eksport formati: ?output=csv yoki ?output=ndjson
+    output = serializers.ChoiceField(choices=STREAM_FORMATS, default='csv')
+
+
+class BulkItemsSerializer(serializers.Serializer): # bulk/create va bulk/update: {"items": [{...}, ...]}
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class BulkDeleteSerializer(serializers.Serializer): # bulk/delete: {"ids": [1, 2, 3]}
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
@@ -0,0 +1,39 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+STREAM_FORMATS = ('csv', 'ndjson')
+EXPORT_CHUNK_SIZE = 2000  # Bazadan bir marta o‘qiladigan qatorlar soni
+
+
+class Echo: # csv.writer yozgan qatorni saqlamasdan qaytaradi
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(header, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + '\n'
+
+
+def streaming_response(header, rows, output, filename): # rows – tuple/list lar generatori, xotirada to‘planmaydi
+    if output == 'csv':
+        response = StreamingHttpResponse(csv_lines(header, rows), content_type='text/csv; charset=utf-8')
+    else:
+        response = StreamingHttpResponse(ndjson_lines(header, rows), content_type='application/x-ndjson; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
+
+
+def export_response(queryset, fields, output, filename, chunk_size=EXPORT_CHUNK_SIZE): # Model obyektlari yaratilmaydi, faqat values_list
+    rows = queryset.order_by('pk').values_list(*fields).iterator(chunk_size=chunk_size)
+    return streaming_response(fields, rows, output, filename)
@@ -0,0 +1,166 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from app_attendance.models import Status, Attendance
+from app_attendance.rollups import rebuild_rollups, rollups_suspended
+from app_common.response_cache import model_changed
+from app_courses.models import Course, Subject, TableType, Table, Group, Homework, HomeworkSubmission, HomeworkReview
+from app_payment.models import Month, PaymentType, Payment
+from app_statistics.models import TimeSeriesBucket
+from app_users.models import User, Student, StudentGroup, Teacher, Parent
+
+PHONE_PREFIX = '99877'  # Sintetik foydalanuvchilar telefon raqami shu bilan boshlanadi (--clear ular bo‘yicha o‘chiradi)
+TITLE_PREFIX = 'bench'  # Sintetik kurs, fan, guruh va boshqa yozuvlar nomi shu bilan boshlanadi
+BATCH_SIZE = 1000
+
+STATUS_WEIGHTS = {Status.PRESENT: 85, Status.ABSENT: 10, 'late': 5}
+MONTHS = ('Yanvar', 'Fevral', 'Mart', 'Aprel', 'May', 'Iyun', 'Iyul', 'Avgust', 'Sentabr', 'Oktabr', 'Noyabr', 'Dekabr')
+
+
+def clear_synthetic_data(): # Avval yaratilgan sintetik ma'lumotlarni o‘chiradi (CASCADE orqali bog‘liq yozuvlar ham)
+    with rollups_suspended():  # Har bir talaba uchun alohida hisoblash o‘rniga rollup oxirida qayta quriladi
+        deleted = User.objects.filter(phone__startswith=PHONE_PREFIX).delete()[0]
+        deleted += Parent.objects.filter(description=TITLE_PREFIX).delete()[0]
+        for model in (Group, Course, Subject, Table, TableType, Month, PaymentType):
+            field = 'room' if model is Table else 'title'
+            deleted += model.objects.filter(**{f'{field}__startswith': TITLE_PREFIX}).delete()[0]
+    rebuild_rollups()
+    return deleted
+
+
+def _bulk(model, objects):
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def _link(descriptor, pairs): # M2M through jadvaliga (egasi, bog‘lanuvchi) juftliklarini yozadi
+    field = descriptor.field
+    through = descriptor.through
+    source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+    through.objects.bulk_create([through(**{source: a, target: b}) for a, b in pairs],
+                                batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+def _backdate(model, objects, rng, days): # auto_now_add ni chetlab o‘tib created_at o‘tgan sanalarga tarqatiladi
+    now = timezone.now()
+    for obj in objects:
+        obj.created_at = now - timedelta(days=rng.randrange(days), minutes=rng.randrange(24 * 60))
+    model.objects.bulk_update(objects, ['created_at'], batch_size=BATCH_SIZE)
+
+
+def generate(students=1000, days=30, seed=0, password='bench-password'):
+    # Masshtab talabalar soni bo‘yicha: har 20 talabaga 1 o‘qituvchi, har 15 talabaga 1 guruh.
+    # Har bir guruhda 8 ta uy vazifasi, talabalar har kuni davomat qilinadi va har oy to‘lov qiladi.
+    rng = random.Random(seed)
+    counts = {}
+    today = timezone.localdate()
+    password = make_password(password)  # Bitta xesh barcha foydalanuvchilar uchun, aks holda xeshlash asosiy vaqtni oladi
+
+    courses = _bulk(Course, [Course(title=f'{TITLE_PREFIX} course {i}') for i in range(10)])
+    subjects = _bulk(Subject, [Subject(title=f'{TITLE_PREFIX} subject {i}') for i in range(10)])
+    table_types = _bulk(TableType, [TableType(title=f'{TITLE_PREFIX} {kind}') for kind in ('odd', 'even', 'weekend')])
+    tables = _bulk(Table, [
+        Table(room=f'{TITLE_PREFIX} room {i}', start_time=f'{9 + i % 8}:00', finish_time=f'{11 + i % 8}:00',
+              type=table_types[i % len(table_types)])
+        for i in range(24)
+    ])
+    months = _bulk(Month, [  # Har bir oy nomi uchun bugungacha bo‘lgan eng so‘nggi hisob oyi
+        Month(title=f'{TITLE_PREFIX} {title}', period=today.replace(year=today.year - (i >= today.month), month=i + 1, day=1))
+        for i, title in enumerate(MONTHS)
+    ])
+    payment_types = _bulk(PaymentType, [PaymentType(title=f'{TITLE_PREFIX} {title}') for title in ('cash', 'card', 'transfer')])
+    statuses = {status.title: status for status in Status.objects.filter(title__in=STATUS_WEIGHTS)}
+    statuses.update({status.title: status for status in _bulk(Status, [
+        Status(title=title) for title in STATUS_WEIGHTS if title not in statuses])})
+
+    teacher_count, group_count = max(1, students // 20), max(1, students // 15)
+    users = _bulk(User, [
+        User(phone=f'{PHONE_PREFIX}{i:07d}', password=password, full_name=f'Teacher {i}', is_teacher=True)
+        for i in range(teacher_count)
+    ] + [
+        User(phone=f'{PHONE_PREFIX}{teacher_count + i:07d}', password=password, full_name=f'Student {i}', is_student=True)
+        for i in range(students)
+    ])
+    teachers = _bulk(Teacher, [Teacher(user=user) for user in users[:teacher_count]])
+    student_rows = _bulk(Student, [Student(user=user) for user in users[teacher_count:]])
+    _backdate(Student, student_rows, rng, 365)
+    _link(Teacher.cource, [(teacher.pk, rng.choice(courses).pk) for teacher in teachers])
+
+    groups = _bulk(Group, [
+        Group(title=f'{TITLE_PREFIX} group {i}', subject=rng.choice(subjects), table=rng.choice(tables),
+              active=rng.random() < 0.8, fee=Decimal(rng.choice((300000, 400000, 500000))))
+        for i in range(group_count)
+    ])
+    group_courses = {group.pk: rng.choice(courses) for group in groups}
+    group_teachers = {group.pk: rng.sample(teachers, min(len(teachers), rng.choice((1, 1, 2)))) for group in groups}
+    _link(Group.teacher, [(group_id, teacher.pk) for group_id, rows in group_teachers.items() for teacher in rows])
+
+    # Har bir talaba 1 ta, ba'zilari 2 ta guruhda o‘qiydi
+    members = {group.pk: [] for group in groups}
+    for index, student in enumerate(student_rows):
+        joined = {groups[index % group_count].pk}
+        if rng.random() < 0.2:
+            joined.add(rng.choice(groups).pk)
+        for group_id in joined:
+            members[group_id].append(student)
+    StudentGroup.objects.bulk_create([  # A'zolik ro‘yxatdan o‘tgan kundan keyin, oxirgi yil ichida boshlangan
+        StudentGroup(student=student, group_id=group_id,
+                     joined_on=max(timezone.localdate(student.created_at), today - timedelta(days=rng.randrange(365))))
+        for group_id, rows in members.items() for student in rows
+    ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+    _link(Student.cource, [(student.pk, group_courses[group_id].pk) for group_id, rows in members.items() for student in rows])
+
+    parents = _bulk(Parent, [
+        Parent(name=f'Parent {i}', surname='Bench', phone=f'+{PHONE_PREFIX}{i:07d}', address='Toshkent',
+               description=TITLE_PREFIX)
+        for i in range(int(students * 0.8))
+    ])
+    _link(Parent.students, [(parent.pk, student_rows[i].pk) for i, parent in enumerate(parents)])
+
+    homeworks = _bulk(Homework, [
+        Homework(title=f'{TITLE_PREFIX} homework {i}', course=group_courses[group.pk], group=group,
+                 teacher=group_teachers[group.pk][0])
+        for group in groups for i in range(8)
+    ])
+    submissions = _bulk(HomeworkSubmission, [
+        HomeworkSubmission(homework=homework, group_id=homework.group_id, student=student,
+                           link=f'https://example.com/{homework.pk}/{student.pk}', is_checked=rng.random() < 0.5)
+        for homework in homeworks for student in members[homework.group_id] if rng.random() < 0.7
+    ])
+    reviews = _bulk(HomeworkReview, [
+        HomeworkReview(submission=submission, teacher=group_teachers[submission.homework.group_id][0],
+                       grade=rng.randint(2, 5), comment='ok')
+        for submission in submissions if submission.is_checked
+    ])
+
+    titles, weights = zip(*STATUS_WEIGHTS.items())
+    attendance = 0
+    for group_id, rows in members.items():
+        attendance += len(_bulk(Attendance, [
+            Attendance(group_id=group_id, student=student, status=statuses[rng.choices(titles, weights)[0]],
+                       date=today - timedelta(days=day))
+            for day in range(days) for student in rows
+        ]))
+
+    payments = _bulk(Payment, [
+        Payment(student=student, group_id=group_id, month=months[(today.month - 1 - back) % 12],
+                payment_type=rng.choice(payment_types), price=Decimal(rng.choice((300000, 400000, 500000))))
+        for group_id, rows in members.items() for student in rows for back in range(6) if rng.random() < 0.9
+    ])
+    _backdate(Payment, payments, rng, 180)
+
+    # bulk_create signal yubormaydi: rollup, saqlangan statistika va ro‘yxat keshlari shu yerda yangilanadi
+    rebuild_rollups()
+    TimeSeriesBucket.objects.all().delete()
+    for model in (Course, Subject, TableType, Month, PaymentType, Status):
+        model_changed(model)
+
+    counts.update({
+        'users': len(users), 'teachers': len(teachers), 'students': len(student_rows), 'parents': len(parents),
+        'groups': len(groups), 'homeworks': len(homeworks), 'submissions': len(submissions), 'reviews': len(reviews),
+        'attendance': attendance, 'payments': len(payments),
+    })
+    return counts
@@ -1,3 +1,268 @@
-from django.test import TestCase
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+
+from app_attendance.models import Status, Attendance
+from app_common.batch import BATCH_CHUNK_SIZE, IdentityMap, fetch_by_ids
+from app_common.middleware import QueryBudgetExceeded, QueryRecorder, fingerprint
+from app_common.paginations import KeysetPagination
+from app_common.response_cache import model_version
+from app_common.synthetic import generate
+from app_common.throttling import IPTokenBucketThrottle, THROTTLE_CACHE, _local_buckets
+from app_courses.models import Group, Subject
+from app_courses.serializers import GroupSerializer
+from app_users.models import User, Student, Teacher
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTests(APITestCase): # Ro‘yxat endpointlari QUERY_BUDGETS dan oshmasligi va N+1 yo‘qligi
+    @classmethod
+    def setUpTestData(cls):
+        generate(students=60, days=3, seed=1)
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', full_name='admin',
+                                             is_admin=True, is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+
+    def count_queries(self, method, url, **kwargs):
+        # force_authenticate bir xil obyektni qaytaradi, uning keshi keyingi so‘rovlar sonini kamaytirmasligi uchun
+        self.client.force_authenticate(User.objects.get(pk=self.admin.pk))
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = getattr(self.client, method)(url, **kwargs)
+        return response, recorder.count
+
+    def test_list_endpoints_stay_within_budget(self):
+        self.assertTrue(settings.QUERY_BUDGET_STRICT)
+        for view_name, budget in settings.QUERY_BUDGETS.items():
+            for params in ({}, {'pagination': 'cursor'}):
+                with self.subTest(view=view_name, **params):
+                    response, queries = self.count_queries('get', reverse(view_name), data=params)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertLessEqual(queries, budget)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for view_name in settings.QUERY_BUDGETS:
+            with self.subTest(view=view_name):
+                _, small = self.count_queries('get', reverse(view_name), data={'page_size': 1})
+                _, large = self.count_queries('get', reverse(view_name), data={'page_size': 50})
+                self.assertEqual(small, large)
+
+    def test_bulk_attendance_query_count_is_constant(self):
+        date = timezone.localdate() + timedelta(days=1)
+        present = Status.objects.get(title=Status.PRESENT)
+        counts = []
+        for group in Group.objects.order_by('pk')[:2]:
+            students = list(Student.objects.filter(group=group).values_list('pk', flat=True))
+            items = [{'student_id': pk, 'status_id': present.pk} for pk in students]
+            response, queries = self.count_queries('post', reverse('attendances:attendance-bulk-attendance'),
+                                                   data={'group_id': group.pk, 'date': str(date), 'items': items},
+                                                   format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['created'], len(students))
+            counts.append(queries)
+        self.assertEqual(counts[0], counts[1])
+
+    @override_settings(QUERY_BUDGETS={'courses:group-list': 1})
+    def test_budget_exceeded_raises_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('courses:group-list'))
+
+    @override_settings(QUERY_BUDGETS={'courses:group-list': 1}, QUERY_BUDGET_STRICT=False)
+    def test_budget_exceeded_is_logged_when_not_strict(self):
+        with self.assertLogs('app_common.queries', 'WARNING') as logs:
+            response = self.client.get(reverse('courses:group-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('"budget": 1', logs.output[0])
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ queries"')
+
+    def test_fingerprint_ignores_literals_and_in_list_length(self):
+        self.assertEqual(fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a'"),
+                         fingerprint("SELECT * FROM t WHERE id IN (7) AND name = 'bb'"))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class KeysetPaginationTests(APITestCase): # Kursor (created_at, id) bo‘yicha davom etadi, buzilgan kursor 404
+    @classmethod
+    def setUpTestData(cls):
+        generate(students=10, days=2, seed=2)
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('attendances:attendance-list')
+
+    def test_next_page_continues_after_cursor(self):
+        expected = list(Attendance.objects.order_by('created_at', 'id').values_list('id', flat=True)[:10])
+        first = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 5})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        second = self.client.get(first.data['next'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in first.data['results'] + second.data['results']], expected)
+
+    def test_tampered_cursor_is_not_found(self):
+        created = timezone.now().isoformat()
+        encode = KeysetPagination().encode_cursor
+        cursors = [encode(position) for position in (
+            ['abc', 1], [{'a': 1}, 1], [created, 'x'], [None, None], [created, True], ['2026-13-01T00:00:00', 1], [created])]
+        for cursor in cursors + ['%%%', 'bm90IGpzb24']:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {'pagination': 'cursor', 'cursor': cursor})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ConditionalRetrieveTests(APITestCase): # retrieve(): ETag / 304 va M2M o‘zgarishida yangi ETag
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+        cls.group = Group.objects.create(title='G1', subject=Subject.objects.create(title='Fizika'))
+        cls.teacher = Teacher.objects.create(user=User.objects.create_user(phone='998900000002', password='x'))
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('courses:group-detail', args=[self.group.pk])
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['ETag']
+
+    def test_matching_etag_returns_304(self):
+        etag = self.etag()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+    def test_update_and_m2m_changes_give_new_etag(self):
+        etags = [self.etag()]
+        self.group.title = 'G2'
+        self.group.save()
+        etags.append(self.etag())
+        self.group.teacher.add(self.teacher)  # To‘g‘ri tomondan
+        etags.append(self.etag())
+        self.teacher.groups.clear()  # Teskari tomondan clear(): pk_set berilmaydi
+        etags.append(self.etag())
+        self.assertEqual(len(set(etags)), len(etags))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_object_is_404(self):
+        response = self.client.get(reverse('courses:group-detail', args=[self.group.pk + 100]), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+
+class FetchByIdsTests(TestCase): # Chaqiruvchi tartibi, takrorlar, topilmaganlar va chunk bo‘yicha so‘rovlar soni
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(title='Fizika')
+        cls.groups = Group.objects.bulk_create([Group(title=f'G{i}', subject=subject) for i in range(BATCH_CHUNK_SIZE + 5)])
+        teacher = Teacher.objects.create(user=User.objects.create_user(phone='998900000002', password='x'))
+        for group in cls.groups[:10]:
+            group.teacher.add(teacher)
+
+    def test_order_duplicates_and_missing(self):
+        first, second, third = (group.pk for group in self.groups[:3])
+        missing = self.groups[-1].pk + 1
+        objects, not_found = fetch_by_ids(GroupSerializer, [third, first, third, missing, second])
+        self.assertEqual([group.pk for group in objects], [third, first, second])
+        self.assertEqual(not_found, [missing])
+
+    def test_more_ids_than_chunk_size(self):
+        ids = [group.pk for group in reversed(self.groups)]
+        with self.assertNumQueries(4):  # 2 chunk × (guruhlar + teacher prefetch)
+            objects, not_found = fetch_by_ids(GroupSerializer, ids)
+        self.assertEqual([group.pk for group in objects], ids)
+        self.assertEqual(not_found, [])
+
+    def test_query_count_does_not_depend_on_relations(self):
+        with_teachers = [group.pk for group in self.groups[:10]]
+        without_teachers = [group.pk for group in self.groups[-10:]]
+        for ids in (with_teachers, without_teachers, with_teachers[:1]):
+            with self.subTest(ids=len(ids)), self.assertNumQueries(2):
+                objects, _ = fetch_by_ids(GroupSerializer, ids)
+                GroupSerializer(objects, many=True).data  # teacher lar prefetch dan o‘qiladi
+
+    def test_identity_map_skips_fetched_objects(self):
+        identity_map = IdentityMap()
+        ids = [group.pk for group in self.groups[:5]]
+        fetch_by_ids(GroupSerializer, ids, identity_map=identity_map)
+        with self.assertNumQueries(0):
+            objects, _ = fetch_by_ids(GroupSerializer, ids[::-1], identity_map=identity_map)
+        self.assertEqual([group.pk for group in objects], ids[::-1])
+
+
+class ModelVersionTests(TestCase): # Ro‘yxat keshi versiyasi faqat commit bo‘lgan o‘zgarishdan keyin yangilanadi
+    def test_version_is_bumped_on_commit(self):
+        before = model_version(Status)
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(title='late')
+            self.assertEqual(model_version(Status), before)  # commitgacha eski versiya
+        self.assertNotEqual(model_version(Status), before)
+
+    def test_rolled_back_change_keeps_version(self):
+        before = model_version(Status)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Status.objects.create(title='late')
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(model_version(Status), before)
+
+    def test_migrate_resets_versions(self):
+        before = model_version(Status)
+        emit_post_migrate_signal(verbosity=0, interactive=False, db='default')  # migrate va flush shuni yuboradi
+        self.assertNotEqual(model_version(Status), before)
+
+
+@override_settings(THROTTLE_BUCKETS={'login': {'ip': '5/min'}})
+class TokenBucketThrottleTests(SimpleTestCase): # Parallel so‘rovlar sig‘imdan ortiq o‘tib ketmasligi
+    workers = 20
+
+    def setUp(self):
+        _local_buckets.clear()
+
+    def parallel_attempts(self, address):
+        factory = APIRequestFactory()
+        view = SimpleNamespace(throttle_scope='login')
+        barrier = threading.Barrier(self.workers)
+
+        def attempt(_):
+            request = Request(factory.post('/api/v1/auth/login/', REMOTE_ADDR=address))
+            barrier.wait()  # Barcha oqimlar bir vaqtda boshlaydi
+            return IPTokenBucketThrottle().allow_request(request, view)
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            return list(pool.map(attempt, range(self.workers)))
+
+    def test_parallel_requests_beyond_capacity_are_rejected(self):
+        self.assertEqual(sum(self.parallel_attempts('10.0.0.1')), 5)
+        self.assertEqual(sum(self.parallel_attempts('10.0.0.2')), 5)  # Boshqa IP o‘z limitiga ega
+
+    @skipUnless(os.environ.get('REDIS_URL'), 'REDIS_URL berilmagan')
+    def test_parallel_requests_beyond_capacity_are_rejected_with_redis(self):
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                             'LOCATION': os.environ['REDIS_URL'], 'KEY_PREFIX': 'n57-test'}}
+        with override_settings(CACHES=redis):
+            THROTTLE_CACHE.delete('login:ip:10.0.0.3')
+            self.assertEqual(sum(self.parallel_attempts('10.0.0.3')), 5)
+            self.assertFalse(_local_buckets)
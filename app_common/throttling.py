@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import BaseThrottle
+
+from app_common.cache import NamespacedCache
+
+logger = logging.getLogger('app_common')
+
+THROTTLE_CACHE = NamespacedCache('throttle')
+LOCAL_BUCKETS_LIMIT = 10000  # Protsess ichida saqlanadigan kalitlar soni
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+# Token bucket Redis ichida bitta atomar amal sifatida: parallel so‘rovlar bir xil qiymatni o‘qiy olmaydi.
+# Vaqt Redis serveridan olinadi, shuning uchun ilova serverlari soatlari farqi ta'sir qilmaydi.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * capacity / period)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(period * 2))
+return {allowed, tostring(tokens)}
+"""
+
+_local_buckets = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def parse_rate(rate): # "5/min" -> (5, 60): 5 ta token sig‘imi, 60 sekundda to‘liq to‘ladi
+    count, period = rate.split('/')
+    return int(count), PERIODS[period.strip()[0]]
+
+
+def _refill(state, capacity, period, now):
+    tokens, updated = state if state else (capacity, now)
+    return min(capacity, tokens + (now - updated) * capacity / period)
+
+
+def _take_shared(cache, key, capacity, period): # Redis: Lua skripti orqali atomar
+    key = cache.make_and_validate_key(THROTTLE_CACHE.make_key(key))
+    client = cache._cache.get_client(key, write=True)
+    allowed, tokens = client.register_script(TOKEN_BUCKET_LUA)(keys=[key], args=[capacity, period])
+    return bool(allowed), float(tokens)
+
+
+def _take_local(key, capacity, period): # Protsess ichida, qulf ostida atomar
+    now = time.monotonic()
+    with _local_lock:
+        tokens = _refill(_local_buckets.pop(key, None), capacity, period, now)
+        allowed = tokens >= 1
+        _local_buckets[key] = (tokens - 1 if allowed else tokens, now)
+        while len(_local_buckets) > LOCAL_BUCKETS_LIMIT:
+            _local_buckets.popitem(last=False)
+    return allowed, tokens - 1 if allowed else tokens
+
+
+def take_token(key, capacity, period): # (ruxsat, kutish sekundlari) – token bucket
+    # Umumiy hisob faqat Redis bilan: fayl keshida get+set atomar emas va parallel so‘rovlar bir xil
+    # token sonini o‘qib o‘tib ketadi. Redis bo‘lmasa (DEBUG) har bir protsess o‘z hisobini yuritadi.
+    cache = THROTTLE_CACHE.cache
+    if isinstance(cache, RedisCache):
+        try:
+            allowed, tokens = _take_shared(cache, key, capacity, period)
+        except Exception:  # Redis ishlamasa cheklov protsess ichida davom etadi
+            logger.warning('Shared throttle cache unavailable, using local buckets', exc_info=True)
+            allowed, tokens = _take_local(key, capacity, period)
+    else:
+        allowed, tokens = _take_local(key, capacity, period)
+    return allowed, 0 if allowed else (1 - tokens) * period / capacity
+
+
+class TokenBucketThrottle(BaseThrottle): # Limitlar settings.THROTTLE_BUCKETS[view.throttle_scope][kind] dan olinadi
+    kind = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = getattr(view, 'throttle_scope', None)
+        rate = settings.THROTTLE_BUCKETS.get(scope, {}).get(self.kind)
+        if not rate:
+            return True
+        ident = self.get_ident_value(request)
+        if not ident:
+            return True
+
+        capacity, period = parse_rate(rate)
+        allowed, self.retry_after = take_token(f'{scope}:{self.kind}:{ident}', capacity, period)
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class PhoneTokenBucketThrottle(TokenBucketThrottle): # So‘rov tanasidagi telefon raqami bo‘yicha
+    kind = 'phone'
+
+    def get_ident_value(self, request):
+        phone = request.data.get('phone') if hasattr(request.data, 'get') else None
+        return str(phone).strip().lstrip('+') if phone else None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle): # Mijoz IP manzili bo‘yicha (NUM_PROXIES hisobga olinadi)
+    kind = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AppCoursesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_courses'
+
+    def ready(self):
+        import app_courses.signals  # noqa: F401
+        from app_common.conditional import track_m2m_changes
+        from app_common.response_cache import track_model_versions
+        from app_courses.models import Group, Subject, Course, TableType
+
+        track_model_versions(Subject, Course, TableType)  # Ro‘yxat javoblari keshi shu modellar o‘zgarganda eskiradi
+        track_m2m_changes(Group.teacher)  # Guruh o‘qituvchilari o‘zgarsa Group.updated_at (ETag) yangilanadi
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_courses', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='fee',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_homework_group(apps, schema_editor): # Mavjud topshiriqlar uchun guruh uy vazifasidan olinadi
+    HomeworkSubmission = apps.get_model('app_courses', 'HomeworkSubmission')
+    Homework = apps.get_model('app_courses', 'Homework')
+    HomeworkSubmission.objects.update(
+        group=models.Subquery(Homework.objects.filter(pk=models.OuterRef('homework')).values('group')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_courses', '0003_group_fee'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homeworksubmission',
+            name='group',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='app_courses.group'),
+        ),
+        migrations.RunPython(copy_homework_group, migrations.RunPython.noop),
+    ]
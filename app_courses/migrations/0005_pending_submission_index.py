@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_courses', '0004_homeworksubmission_group'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='homeworksubmission',
+            name='group',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='app_courses.group'),
+        ),
+        migrations.AddIndex(
+            model_name='homeworksubmission',
+            index=models.Index(condition=models.Q(('is_checked', False)), fields=['group', 'created_at', 'id'], name='submission_pending_idx'),
+        ),
+    ]
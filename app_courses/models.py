@@ -58,6 +58,7 @@ class Group(BaseModel):
     active = models.BooleanField(default=True)
     description = models.TextField(null=True, blank=True)
     table = models.ForeignKey('Table', on_delete=models.SET_NULL, null=True, blank=True, related_name='groups')
+    fee = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)  # Oylik to‘lov miqdori (qarzdorlik hisobi uchun)
 
     def __str__(self):
         return self.title
@@ -86,13 +87,26 @@ class HomeworkSubmission(BaseModel):
     student = models.ForeignKey('app_users.Student', on_delete=models.CASCADE, related_name='submissions')
     link = models.CharField(max_length=255)
     is_checked = models.BooleanField(default=False)
+    # homework.group nusxasi: o‘qituvchi navbati guruh bo‘yicha JOIN siz indeksdan o‘qiladi
+    group = models.ForeignKey('app_courses.Group', on_delete=models.CASCADE, related_name='submissions', editable=False,
+                              db_index=False)  # Alohida FK indeksi navbat so‘rovida submission_pending_idx bilan raqobatlashadi
 
     def __str__(self):
         return f"{self.student.user.full_name} - {self.homework.title}"
 
+    def save(self, *args, **kwargs):
+        self.group_id = self.homework.group_id
+        super().save(*args, **kwargs)
+
     verbose_name = 'Homework Submission'
     verbose_name_plural = 'Homework Submissions'
 
+    class Meta:
+        indexes = [
+            # O‘qituvchi navbati: faqat is_checked=False qatorlar, guruh ichida (created_at, id) kursorli sahifalash tartibida
+            models.Index(fields=['group', 'created_at', 'id'], condition=models.Q(is_checked=False), name='submission_pending_idx'),
+        ]
+
 class HomeworkReview(BaseModel):
     submission = models.OneToOneField(HomeworkSubmission, on_delete=models.CASCADE, related_name='review')
     teacher = models.ForeignKey('app_users.Teacher', on_delete=models.CASCADE, related_name='reviews')
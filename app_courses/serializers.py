@@ -1,4 +1,7 @@
 from rest_framework import serializers
+
+from app_common.batch import MAX_BATCH_IDS
+from app_common.serializers import BULK_MAX_ITEMS
 from app_courses.models import (
     Group, Subject, Course, Table, TableType,
     Homework, HomeworkSubmission, HomeworkReview
@@ -8,10 +11,11 @@ class GroupSerializer(serializers.ModelSerializer): # Guruh modeli uchun seriali
     class Meta:
         model = Group
         fields = '__all__'
+        prefetch_related = ('teacher',)
 
 
 class GetGroupByIdsSerializer(serializers.Serializer): # Berilgan ID'lar bo'yicha guruhlarni olish uchun serializer
-    group_ids = serializers.ListField(child=serializers.IntegerField())
+    group_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_BATCH_IDS)
 
 
 class SubjectSerializer(serializers.ModelSerializer): # Fan modeli uchun serializer
@@ -63,6 +67,27 @@ class HomeworkReviewSerializer(serializers.ModelSerializer): # Uyga vazifa bahol
             'teacher': {'read_only': True}  # O'qituvchi maydonini faqat o'qish uchun qilish
         }
 
+    def validate_submission(self, value): # Baho boshqa topshiriqqa ko‘chirilmaydi: eski topshiriqning is_checked holati qolib ketardi
+        if self.instance is not None and value != self.instance.submission:
+            raise serializers.ValidationError("Topshiriqni faqat yaratishda tanlash mumkin")
+        return value
+
+
+class GradeItemSerializer(serializers.Serializer): # Bitta topshiriq bahosi: (submission_id, grade, comment)
+    submission_id = serializers.IntegerField()
+    grade = serializers.IntegerField(min_value=0, allow_null=True, required=False)
+    comment = serializers.CharField(allow_blank=True, allow_null=True, required=False)
+
+
+class BulkGradeSerializer(serializers.Serializer): # bulk/grade: {"reviews": [{"submission_id": 1, "grade": 5, "comment": "..."}]}
+    reviews = GradeItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+    def validate_reviews(self, value):
+        submission_ids = [item['submission_id'] for item in value]
+        if len(submission_ids) != len(set(submission_ids)):
+            raise serializers.ValidationError("Bitta topshiriq bir necha marta baholanmoqda")
+        return value
+
 
 class RemoveStudentFromGroupSerializer(serializers.Serializer): # Guruhdan talabani olib tashlash uchun serializer
     student_id = serializers.IntegerField()
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from app_courses.models import Homework
+from app_courses.submissions import sync_submission_groups
+
+
+@receiver(post_save, sender=Homework)
+def homework_saved(sender, instance, created, **kwargs): # HomeworkSubmission.group nusxasi uy vazifasi guruhi bilan bir xil turadi
+    if not created:
+        sync_submission_groups([instance.pk])
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from app_common.response_cache import model_changed
+from app_courses.models import Group, Homework, HomeworkSubmission
+
+
+def teacher_groups(teacher): # O‘qituvchi guruhlari id lari (subquery), Group.teacher through jadvalidan
+    return Group.teacher.through.objects.filter(teacher=teacher).values('group_id')
+
+
+def fill_submission_groups(submissions): # bulk yozuvlarda save() chaqirilmaydi, guruh uy vazifasidan bitta so‘rov bilan olinadi
+    groups = dict(Homework.objects.filter(pk__in={submission.homework_id for submission in submissions})
+                  .values_list('pk', 'group_id'))
+    for submission in submissions:
+        submission.group_id = groups[submission.homework_id]
+
+
+def sync_submission_groups(homework_ids): # Uy vazifasi boshqa guruhga o‘tkazilganda topshiriqlar ham ko‘chiriladi
+    # post_save signali va HomeworkViewSet.bulk_updated ikkalasi shu yerdan o‘tadi; guruhi to‘g‘ri qatorlar yozilmaydi
+    group = Subquery(Homework.objects.filter(pk=OuterRef('homework')).values('group')[:1])
+    HomeworkSubmission.objects.filter(homework__in=homework_ids).exclude(group=group).update(group=group)
+
+
+def mark_checked(submission_ids, checked=True): # Topshiriqlar is_checked holati, chaqiruvchi tranzaksiyasi ichida
+    HomeworkSubmission.objects.filter(pk__in=submission_ids).update(is_checked=checked, updated_at=timezone.now())
+    transaction.on_commit(lambda: model_changed(HomeworkSubmission))
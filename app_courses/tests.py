@@ -1,3 +1,117 @@
-from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
 
-# Create your tests here.
+from app_courses.models import Course, Subject, Group, Homework, HomeworkSubmission, HomeworkReview
+from app_users.models import User, Student, Teacher
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ReviewQueueTests(APITestCase): # O‘qituvchi navbati va baholash
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(title='Matematika')
+        cls.course = Course.objects.create(title='Kurs')
+        cls.teacher = Teacher.objects.create(user=User.objects.create_user(phone='998900000010', password='x', is_teacher=True))
+        other = Teacher.objects.create(user=User.objects.create_user(phone='998900000011', password='x', is_teacher=True))
+        cls.student = Student.objects.create(user=User.objects.create_user(phone='998900000012', password='x', is_student=True))
+        cls.group = Group.objects.create(title='G1', subject=subject)
+        cls.group.teacher.add(cls.teacher)
+        cls.other_group = Group.objects.create(title='G2', subject=subject)
+        cls.other_group.teacher.add(other)
+        cls.homework = Homework.objects.create(title='H1', course=cls.course, group=cls.group, teacher=cls.teacher)
+        cls.other_homework = Homework.objects.create(title='H2', course=cls.course, group=cls.other_group, teacher=other)
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.teacher.user)
+
+    def submit(self, homework, count):
+        return [HomeworkSubmission.objects.create(homework=homework, student=self.student, link=str(i)) for i in range(count)]
+
+    def test_submission_group_follows_homework(self):
+        submission = self.submit(self.homework, 1)[0]
+        self.assertEqual(submission.group_id, self.group.pk)
+
+        self.homework.group = self.other_group
+        self.homework.save()
+        submission.refresh_from_db()
+        self.assertEqual(submission.group_id, self.other_group.pk)
+
+        # bulk/update signal yubormaydi: bir xil sync_submission_groups hook orqali chaqiriladi
+        self.client.force_authenticate(User.objects.create_user(phone='998900000014', password='x', is_admin=True))
+        response = self.client.put(reverse('courses:homework-bulk-update-items'),
+                                   {'items': [{'id': self.homework.pk, 'group': self.group.pk}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        submission.refresh_from_db()
+        self.assertEqual(submission.group_id, self.group.pk)
+
+    def test_pending_is_scoped_and_cursor_paged(self):
+        own = self.submit(self.homework, 25)
+        self.submit(self.other_homework, 3)
+        HomeworkSubmission.objects.filter(pk=own[0].pk).update(is_checked=True)
+
+        response = self.client.get(reverse('courses:homework-submission-pending'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first = [row['id'] for row in response.data['results']]
+        self.assertEqual(first, [submission.pk for submission in own[1:21]])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['id'] for row in response.data['results']], [submission.pk for submission in own[21:]])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(reverse('courses:homework-submission-pending'), {'group': self.other_group.pk})
+        self.assertEqual(response.data['results'], [])
+
+    def test_review_marks_submission_checked(self):
+        submission = self.submit(self.homework, 1)[0]
+        response = self.client.post(reverse('courses:homework-review-create-homeworkreview'),
+                                    {'submission': submission.pk, 'grade': 5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        submission.refresh_from_db()
+        self.assertTrue(submission.is_checked)
+
+    def test_bulk_grade_upserts_and_checks_ownership(self):
+        submissions = self.submit(self.homework, 3)
+        url = reverse('courses:homework-review-bulk-grade')
+        items = [{'submission_id': submission.pk, 'grade': 4} for submission in submissions]
+
+        response = self.client.post(url, {'reviews': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(HomeworkSubmission.objects.filter(is_checked=True).count(), 3)
+
+        items[0]['grade'] = 5
+        self.client.post(url, {'reviews': items[:1]}, format='json')
+        self.assertEqual(HomeworkReview.objects.count(), 3)
+        self.assertEqual(HomeworkReview.objects.get(submission=submissions[0]).grade, 5)
+
+        foreign = self.submit(self.other_homework, 1)[0]
+        response = self.client.post(url, {'reviews': [{'submission_id': foreign.pk, 'grade': 3}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(HomeworkReview.objects.filter(submission=foreign).exists())
+
+        self.client.force_authenticate(User.objects.create_user(phone='998900000015', password='x', is_staff=True))
+        response = self.client.post(url, {'reviews': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)  # O‘qituvchi profili yo‘q
+
+    def test_bulk_create_without_profile_is_forbidden(self):
+        submission = self.submit(self.homework, 1)[0]
+        self.client.force_authenticate(User.objects.create_user(phone='998900000013', password='x', is_staff=True))
+        response = self.client.post(reverse('courses:homework-review-bulk-create-items'),
+                                    {'items': [{'submission': submission.pk, 'grade': 5}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(HomeworkReview.objects.exists())
+
+    def test_review_submission_is_create_only(self):
+        first, second = self.submit(self.homework, 2)
+        response = self.client.post(reverse('courses:homework-review-bulk-create-items'),
+                                    {'items': [{'submission': first.pk, 'grade': 5}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        review = response.data['results'][0]['id']
+
+        response = self.client.put(reverse('courses:homework-review-bulk-update-items'),
+                                   {'items': [{'id': review, 'submission': second.pk}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('submission', response.data['results'][0]['errors'])
+        self.assertEqual(list(HomeworkSubmission.objects.filter(is_checked=True).values_list('pk', flat=True)), [first.pk])
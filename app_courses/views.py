@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets, status
@@ -6,27 +7,35 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from app_courses.models import Group, Subject, Course, Table, TableType, Homework, HomeworkSubmission, HomeworkReview
-from app_common.permissions import AdminUser, AdminOrTeacher, AdminOrStudent
-from app_common.paginations import Pagination
+from app_common.permissions import AdminUser, AdminOrTeacher, AdminOrStudent, request_profile
+from app_common.batch import fetch_by_ids, get_identity_map
+from app_common.bulk import BulkWriteMixin
+from app_common.conditional import conditional_retrieve
+from app_common.paginations import get_pagination, KeysetPagination
+from app_common.prefetch import prefetch_for
+from app_common.response_cache import versioned_response, model_changed
 from app_courses.serializers import GroupSerializer, GroupAddStudent, GroupAddTeacher, SubjectSerializer, \
     CourseSerializer, TableSerializer, TableTypeSerializer, RemoveStudentFromGroupSerializer, \
     RemoveTeacherFromGroupSerializer, HomeworkSerializer, HomeworkSubmissionSerializer, HomeworkReviewSerializer, \
-    GetGroupByIdsSerializer
+    GetGroupByIdsSerializer, BulkGradeSerializer
+from app_courses.submissions import teacher_groups, fill_submission_groups, sync_submission_groups, mark_checked
 from app_users.models import Student,Teacher
 
 #Group
-class GroupViewSet(viewsets.ViewSet):
+class GroupViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminUser]
+    bulk_serializer_class = GroupSerializer
 
     def list(self, request):
-        groups = Group.objects.all()
-        paginator = Pagination()
+        groups = prefetch_for(GroupSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(groups, request)
         serializer = GroupSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Group)
     def retrieve(self, request, pk=None):
-        group = get_object_or_404(Group, pk=pk)
+        group = get_object_or_404(prefetch_for(GroupSerializer), pk=pk)
         serializer = GroupSerializer(group)
         return Response(serializer.data)
 
@@ -132,29 +141,33 @@ class GetGroupByIds(APIView):
     permission_classes = [AdminUser]
     @swagger_auto_schema(request_body=GetGroupByIdsSerializer)
     def post(self, request):
-        group_ids = request.data.get("group_ids", [])
+        ids_serializer = GetGroupByIdsSerializer(data=request.data)
+        if not ids_serializer.is_valid():
+            return Response(ids_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        if not group_ids or not isinstance(group_ids, list):
-            return Response({"error": "group_ids ro‘yxati bo‘lishi kerak"}, status=status.HTTP_400_BAD_REQUEST)
+        # Tartib saqlanadi, takroriy id lar bir marta olinadi, topilmaganlari missing da qaytariladi
+        objects, missing = fetch_by_ids(GroupSerializer, ids_serializer.validated_data["group_ids"],
+                                        identity_map=get_identity_map(request))
+        serializer = GroupSerializer(objects, many=True)
 
-        groups = Group.objects.filter(id__in=group_ids)
-        serializer = GroupSerializer(groups, many=True)
-
-        return Response({"groups": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"groups": serializer.data, "missing": missing}, status=status.HTTP_200_OK)
 
 #Subject
-class SubjectViewSet(viewsets.ViewSet):
+class SubjectViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminUser]
+    bulk_serializer_class = SubjectSerializer
 
+    @versioned_response(Subject)
     def list(self, request):
-        subjects = Subject.objects.all()
-        paginator = Pagination()
+        subjects = prefetch_for(SubjectSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(subjects, request)
         serializer = SubjectSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Subject)
     def retrieve(self, request, pk=None):
-        subject = get_object_or_404(Subject, pk=pk)
+        subject = get_object_or_404(prefetch_for(SubjectSerializer), pk=pk)
         serializer = SubjectSerializer(subject)
         return Response(serializer.data)
 
@@ -184,19 +197,22 @@ class SubjectViewSet(viewsets.ViewSet):
         return Response({'status':True,'detail': 'Subject muaffaqiyatli uchirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 #course
-class CourseViewSet(viewsets.ViewSet):
+class CourseViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminUser]
+    bulk_serializer_class = CourseSerializer
 
+    @versioned_response(Course)
     def list(self, request):
-        courses = Course.objects.all()
-        paginator = Pagination()
+        courses = prefetch_for(CourseSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(courses, request)
         serializer = CourseSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Course)
     def retrieve(self, request, pk=None):
-        course = get_object_or_404(Course, pk=pk)
-        serializer = SubjectSerializer(course)
+        course = get_object_or_404(prefetch_for(CourseSerializer), pk=pk)
+        serializer = CourseSerializer(course)
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'], url_path='create/course')
@@ -225,18 +241,20 @@ class CourseViewSet(viewsets.ViewSet):
         return Response({'status':True,'detail': 'Cource muaffaqiyatli uchirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 #Table
-class TableViewSet(viewsets.ViewSet):
+class TableViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminUser]
+    bulk_serializer_class = TableSerializer
 
     def list(self, request):
-        tables = Table.objects.all()
-        paginator = Pagination()
+        tables = prefetch_for(TableSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(tables, request)
         serializer = TableSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Table)
     def retrieve(self, request, pk=None):
-        table = get_object_or_404(Table, pk=pk)
+        table = get_object_or_404(prefetch_for(TableSerializer), pk=pk)
         serializer = TableSerializer(table)
         return Response(serializer.data)
 
@@ -266,18 +284,21 @@ class TableViewSet(viewsets.ViewSet):
         return Response({'status':True,'detail': 'Table muaffaqiyatli uchirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 #TableType
-class TableTypeViewSet(viewsets.ViewSet):
+class TableTypeViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminUser]
+    bulk_serializer_class = TableTypeSerializer
 
+    @versioned_response(TableType)
     def list(self, request):
-        tabletypes = TableType.objects.all()
-        paginator = Pagination()
+        tabletypes = prefetch_for(TableTypeSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(tabletypes, request)
         serializer = TableTypeSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(TableType)
     def retrieve(self, request, pk=None):
-        tabletype = get_object_or_404(TableType, pk=pk)
+        tabletype = get_object_or_404(prefetch_for(TableTypeSerializer), pk=pk)
         serializer = TableTypeSerializer(tabletype)
         return Response(serializer.data)
 
@@ -307,18 +328,26 @@ class TableTypeViewSet(viewsets.ViewSet):
         return Response({'status':True,'detail': 'TableType muaffaqiyatli uchirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 #Homework
-class HomeworkViewSet(viewsets.ViewSet):
+class HomeworkViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminOrTeacher]
+    bulk_serializer_class = HomeworkSerializer
+
+    def get_bulk_extra_fields(self, request):
+        return {'teacher': request_profile(request, 'teacher')}
+
+    def bulk_updated(self, objects, previous): # bulk_update post_save yubormaydi, ko‘chirilgan uy vazifalari shu yerda
+        sync_submission_groups([homework.pk for homework in objects if homework.group_id != previous[homework.pk].group_id])
 
     def list(self, request):
-        homeworks = Homework.objects.all()
-        paginator = Pagination()
+        homeworks = prefetch_for(HomeworkSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(homeworks, request)
         serializer = HomeworkSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Homework)
     def retrieve(self, request, pk=None):
-        homework = get_object_or_404(Homework, pk=pk)
+        homework = get_object_or_404(prefetch_for(HomeworkSerializer), pk=pk)
         serializer = HomeworkSerializer(homework)
         return Response(serializer.data)
 
@@ -327,7 +356,7 @@ class HomeworkViewSet(viewsets.ViewSet):
     def create_homework(self, request):
         serializer = HomeworkSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.validated_data['teacher'] = request.user.teacher
+            serializer.validated_data['teacher'] = request_profile(request, 'teacher')
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -349,18 +378,29 @@ class HomeworkViewSet(viewsets.ViewSet):
         return Response({'status':True,'detail': 'Homework muaffaqiyatli uchirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 #HomeworkReview
-class HomeworkReviewViewSet(viewsets.ViewSet):
+class HomeworkReviewViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminOrTeacher]
+    bulk_serializer_class = HomeworkReviewSerializer
+
+    def get_bulk_extra_fields(self, request):
+        return {'teacher': request_profile(request, 'teacher')}
+
+    def bulk_created(self, objects):
+        mark_checked([homeworkreview.submission_id for homeworkreview in objects])
+
+    def bulk_deleted(self, objects):
+        mark_checked([homeworkreview.submission_id for homeworkreview in objects], checked=False)
 
     def list(self, request):
-        homeworkreviews = HomeworkReview.objects.all()
-        paginator = Pagination()
+        homeworkreviews = prefetch_for(HomeworkReviewSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(homeworkreviews, request)
         serializer = HomeworkReviewSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(HomeworkReview)
     def retrieve(self, request, pk=None):
-        homeworkreview = get_object_or_404(HomeworkReview, pk=pk)
+        homeworkreview = get_object_or_404(prefetch_for(HomeworkReviewSerializer), pk=pk)
         serializer = HomeworkReviewSerializer(homeworkreview)
         return Response(serializer.data)
 
@@ -369,15 +409,43 @@ class HomeworkReviewViewSet(viewsets.ViewSet):
     def create_homeworkreview(self, request):
         serializer = HomeworkReviewSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.validated_data['teacher'] = request.user.teacher
-            serializer.save()
+            serializer.validated_data['teacher'] = request_profile(request, 'teacher')
+            with transaction.atomic():  # Baho va topshiriqning is_checked holati birga saqlanadi
+                homeworkreview = serializer.save()
+                mark_checked([homeworkreview.submission_id])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], url_path='bulk/grade')
+    @swagger_auto_schema(request_body=BulkGradeSerializer)
+    def bulk_grade(self, request): # Guruh topshiriqlarini bitta so‘rovda baholash: mavjud baholar yangilanadi (upsert)
+        teacher = request_profile(request, 'teacher')
+        serializer = BulkGradeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        items = serializer.validated_data['reviews']
+
+        submission_ids = [item['submission_id'] for item in items]
+        allowed = set(HomeworkSubmission.objects.filter(pk__in=submission_ids, group__in=teacher_groups(teacher))
+                      .values_list('pk', flat=True))
+        forbidden = [submission_id for submission_id in submission_ids if submission_id not in allowed]
+        if forbidden:
+            return Response({'status': False, 'detail': "Topshiriqlar topilmadi yoki sizning guruhingizga tegishli emas",
+                             'submission_ids': forbidden}, status=status.HTTP_403_FORBIDDEN)
+
+        reviews = [HomeworkReview(submission_id=item['submission_id'], teacher=teacher,
+                                  grade=item.get('grade'), comment=item.get('comment')) for item in items]
+        with transaction.atomic():
+            HomeworkReview.objects.bulk_create(reviews, update_conflicts=True, unique_fields=['submission'],
+                                               update_fields=['teacher', 'grade', 'comment', 'updated_at'])
+            mark_checked(submission_ids)
+            transaction.on_commit(lambda: model_changed(HomeworkReview))
+        return Response({'status': True, 'detail': 'Topshiriqlar baholandi', 'graded': len(reviews)})
+
     @action(detail=True, methods=['put'], url_path='update/homework-review')
     @swagger_auto_schema(request_body=HomeworkReviewSerializer)
     def update_homeworkreview(self, request, pk=None):
-        homeworkreview = get_object_or_404(HomeworkReviewSerializer, pk=pk)
+        homeworkreview = get_object_or_404(HomeworkReview, pk=pk)
         serializer = HomeworkReviewSerializer(homeworkreview, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -386,32 +454,60 @@ class HomeworkReviewViewSet(viewsets.ViewSet):
 
     @action(detail=True, methods=['delete'], url_path='delete/homework-review')
     def delete_homeworkreview(self, request, pk=None):
-        homeworkreview = get_object_or_404(HomeworkReviewSerializer, pk=pk)
-        homeworkreview.delete()
+        homeworkreview = get_object_or_404(HomeworkReview, pk=pk)
+        with transaction.atomic():  # Baho o‘chirilsa topshiriq yana tekshirish navbatiga qaytadi
+            homeworkreview.delete()
+            mark_checked([homeworkreview.submission_id], checked=False)
         return Response({'status':True,'detail': 'HomeworkReview muaffaqiyatli uchirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 #HomeworkSubmission
-class HomeworkSubmissionViewSet(viewsets.ViewSet):
+class HomeworkSubmissionViewSet(BulkWriteMixin, viewsets.ViewSet):
     permission_classes = [AdminOrStudent]
+    bulk_serializer_class = HomeworkSubmissionSerializer
+
+    def get_bulk_extra_fields(self, request):
+        return {'student': request_profile(request, 'student')}
+
+    def prepare_bulk_objects(self, objects):
+        fill_submission_groups(objects)
+        return ('group',)
 
     def list(self, request):
-        homeworksubmissions = HomeworkSubmission.objects.all()
-        paginator = Pagination()
+        homeworksubmissions = prefetch_for(HomeworkSubmissionSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(homeworksubmissions, request)
         serializer = HomeworkSubmissionSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(HomeworkSubmission)
     def retrieve(self, request, pk=None):
-        homeworksubmission = get_object_or_404(HomeworkSubmission, pk=pk)
+        homeworksubmission = get_object_or_404(prefetch_for(HomeworkSubmissionSerializer), pk=pk)
         serializer = HomeworkSubmissionSerializer(homeworksubmission)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='pending', permission_classes=[AdminOrTeacher])
+    def pending(self, request): # O‘qituvchi guruhlaridagi tekshirilmagan topshiriqlar, eng eskisidan boshlab kursor bilan
+        # ?group=<id> bitta guruh navbati: sahifa submission_pending_idx dan tartiblangan holda o‘qiladi
+        homeworksubmissions = prefetch_for(HomeworkSubmissionSerializer).filter(is_checked=False)
+        teacher = request_profile(request, 'teacher', required=False)
+        if teacher is not None:  # Admin (o‘qituvchi profili yo‘q) barcha guruhlar navbatini ko‘radi
+            homeworksubmissions = homeworksubmissions.filter(group__in=teacher_groups(teacher))
+        group_id = request.query_params.get('group')
+        if group_id is not None:
+            if not group_id.isdigit():
+                return Response({'status': False, 'detail': "group butun son bo‘lishi kerak"}, status=status.HTTP_400_BAD_REQUEST)
+            homeworksubmissions = homeworksubmissions.filter(group_id=group_id)
+        paginator = KeysetPagination()
+        result_page = paginator.paginate_queryset(homeworksubmissions, request)
+        serializer = HomeworkSubmissionSerializer(result_page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['post'], url_path='create/homework-submission')
     @swagger_auto_schema(request_body=HomeworkSubmissionSerializer)
     def create_homeworksubmission(self, request):
         serializer = HomeworkSubmissionSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.validated_data['student'] = request.user.student
+            serializer.validated_data['student'] = request_profile(request, 'student')
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AppPaymentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_payment'
+
+    def ready(self):
+        from app_common.response_cache import track_model_versions
+        from app_payment.models import Month, PaymentType
+
+        track_model_versions(Month, PaymentType)  # Ro‘yxat javoblari keshi shu modellar o‘zgarganda eskiradi
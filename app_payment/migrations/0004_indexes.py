@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_courses', '0003_group_fee'),
+        ('app_payment', '0003_created_id_index'),
+        ('app_users', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['student', 'group', 'month', 'price'], name='payment_student_month_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_payment', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='month',
+            name='period',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
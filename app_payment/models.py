@@ -7,6 +7,7 @@ from app_courses.models import Group
 
 class Month(BaseModel): # Oylarni saqlash uchun model
     title = models.CharField(max_length=128)  # Oy nomini saqlovchi maydon
+    period = models.DateField(null=True, blank=True)  # Hisob oyi (oyning 1-sanasi); bo‘sh bo‘lsa qarzdorlikka kirmaydi
 
     def __str__(self):
         return self.title
@@ -65,3 +66,8 @@ class Payment(BaseModel): # Talabaning to'lovlarini saqlash uchun model
     class Meta:
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='payment_created_id_idx'),  # Kursorli sahifalash (created_at, id) uchun
+            # Qarzdorlik hisoboti: (talaba, guruh, oy) bo‘yicha to‘langan summa jadvalga murojaatsiz, indeksdan olinadi
+            models.Index(fields=['student', 'group', 'month', 'price'], name='payment_student_month_idx'),
+        ]
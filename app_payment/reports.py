@@ -0,0 +1,73 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import groupby, islice
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from app_payment.models import Payment, Month
+from app_users.models import StudentGroup
+
+# group_by kaliti -> (id maydoni, nom maydoni)
+REPORT_KEYS = {
+    'month': ('month', 'month__title'),
+    'group': ('group', 'group__title'),
+    'payment_type': ('payment_type', 'payment_type__title'),
+    'student': ('student', 'student__user__full_name'),
+}
+
+CENT = Decimal('0.01')
+
+DEBT_HEADER = ('student', 'student_name', 'group', 'group_title', 'month', 'month_title', 'fee', 'paid', 'debt')
+
+
+def payment_report(group_by, filters): # To‘lovlar yig‘indisi tanlangan kalitlar kesimida, bazada hisoblanadi
+    fields = [field for key in group_by for field in REPORT_KEYS[key]]
+    payments = Payment.objects.filter(**filters)
+    totals = payments.aggregate(paid=Sum('price'), payments=Count('id'))
+    rows = (payments.values(*fields)
+            .annotate(paid=Sum('price'), payments=Count('id'))
+            .order_by(*(REPORT_KEYS[key][0] for key in group_by)))
+    return totals, rows
+
+
+def debt_rows(month_ids=None, group_ids=None, chunk_size=1000): # (talaba, guruh, oy) bo‘yicha qarzdorlik qatorlari generatori
+    # Guruh a'zoliklari chunk bo‘lib o‘qiladi, har bir chunk uchun to‘lovlar bitta so‘rovda yig‘iladi,
+    # shuning uchun xotira talabalar soniga emas, chunk_size ga bog‘liq.
+    # Faqat hisob oyi (period) berilgan, joriy oydan kech bo‘lmagan oylar olinadi; talaba a'zolik boshlangan oydan qarzdor
+    months = Month.objects.filter(period__lte=timezone.localdate().replace(day=1)).order_by('period', 'id')
+    if month_ids:
+        months = months.filter(id__in=month_ids)
+    months = list(months.values_list('id', 'title', 'period'))
+    if not months:
+        return
+
+    memberships = StudentGroup.objects.filter(group__fee__isnull=False)
+    if group_ids:
+        memberships = memberships.filter(group_id__in=group_ids)
+    memberships = (memberships.order_by('student_id', 'group_id')
+                   .values_list('student_id', 'student__user__full_name', 'group_id', 'group__title', 'group__fee',
+                                'joined_on')
+                   .iterator(chunk_size=chunk_size))
+
+    while chunk := list(islice(memberships, chunk_size)):
+        paid = defaultdict(Decimal)
+        for student_id, group_id, month_id, total in (
+                Payment.objects.filter(student_id__in={row[0] for row in chunk},
+                                       group_id__in={row[2] for row in chunk},
+                                       month_id__in=[month[0] for month in months])
+                .values_list('student_id', 'group_id', 'month_id')
+                .annotate(total=Sum('price'))
+                .order_by()):
+            paid[(student_id, group_id, month_id)] = total
+
+        for (student_id, student_name), rows in groupby(chunk, key=lambda row: row[:2]):
+            for _, _, group_id, group_title, fee, joined_on in rows:
+                joined = joined_on.replace(day=1)
+                for month_id, month_title, period in months:
+                    if period < joined:
+                        continue
+                    amount = paid[(student_id, group_id, month_id)].quantize(CENT)
+                    if amount < fee:
+                        yield (student_id, student_name, group_id, group_title,
+                               month_id, month_title, fee, amount, fee - amount)
@@ -1,11 +1,17 @@
 from rest_framework import serializers
+from app_common.streaming import STREAM_FORMATS
 from app_payment.models import Month, Payment, PaymentType
+from app_payment.reports import REPORT_KEYS
 
 
 class MonthSerializer(serializers.ModelSerializer):
     class Meta:
         model = Month
         fields = '__all__'
+        extra_kwargs = {'period': {'required': True, 'allow_null': False}}
+
+    def validate_period(self, value): # Hisob oyi har doim oyning birinchi kuni sifatida saqlanadi
+        return value.replace(day=1)
 
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -16,3 +22,13 @@ class PaymentTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = PaymentType
         fields = '__all__'
+
+class PaymentReportSerializer(serializers.Serializer): # To‘lovlar hisobotining parametrlari
+    group_by = serializers.MultipleChoiceField(choices=list(REPORT_KEYS))
+    month = serializers.ListField(child=serializers.IntegerField(), required=False)
+    group = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+class DebtReportSerializer(serializers.Serializer): # Qarzdorlik hisobotining parametrlari
+    month = serializers.ListField(child=serializers.IntegerField(), required=False)
+    group = serializers.ListField(child=serializers.IntegerField(), required=False)
+    output = serializers.ChoiceField(choices=STREAM_FORMATS, default='ndjson')
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_courses.models import Subject, Group
+from app_payment.models import Month, PaymentType, Payment
+from app_payment.reports import debt_rows
+from app_users.models import User, Student, StudentGroup
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PaymentReportTests(APITestCase): # Qarzdorlik a'zolik boshlanishidan hisoblanadi, hisobot sahifalanadi
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+        cls.group = Group.objects.create(title='G1', subject=Subject.objects.create(title='Fizika'), fee=Decimal('100'))
+        cls.student = Student.objects.create(user=User.objects.create_user(phone='998900000030', password='x',
+                                                                           full_name='Ali', is_student=True))
+        cls.student.group.add(cls.group, through_defaults={'joined_on': date(2025, 3, 10)})
+        cls.months = [Month.objects.create(title=title, period=period) for title, period in (
+            ('Yanvar', date(2025, 1, 1)), ('Mart', date(2025, 3, 1)), ('Aprel', date(2025, 4, 1)))]
+        next_month = (timezone.localdate().replace(day=1) + timedelta(days=32)).replace(day=1)
+        Month.objects.create(title='Kelasi oy', period=next_month)  # Hali boshlanmagan oy qarzga kirmaydi
+        Month.objects.create(title='Eski')  # Hisob oyi berilmagan
+        cash = PaymentType.objects.create(title='cash')
+        for month in cls.months:
+            Payment.objects.create(student=cls.student, group=cls.group, month=month, payment_type=cash,
+                                   price=Decimal('100') if month is cls.months[2] else Decimal('40'))
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+
+    def test_debts_start_from_membership(self):
+        rows = list(debt_rows())
+        self.assertEqual([(row[5], row[8]) for row in rows], [('Mart', Decimal('60'))])  # Yanvar a'zolikdan oldin
+
+        StudentGroup.objects.filter(student=self.student).update(joined_on=date(2024, 12, 31))
+        self.assertEqual([(row[5], row[8]) for row in debt_rows()], [('Yanvar', Decimal('60')), ('Mart', Decimal('60'))])
+
+    def test_month_period_is_normalized(self):
+        response = self.client.post(reverse('payments:month-create-month'), {'title': 'May', 'period': '2025-05-17'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['period'], '2025-05-01')
+        response = self.client.post(reverse('payments:month-create-month'), {'title': 'Iyun'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_report_is_paginated(self):
+        response = self.client.get(reverse('payments:payment-report'), {'group_by': 'month', 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['paid'], Decimal('180'))
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([row['month__title'] for row in response.data['results']], ['Yanvar', 'Mart'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['month__title'] for row in response.data['results']], ['Aprel'])
+        self.assertIsNone(response.data['next'])
@@ -1,26 +1,39 @@
 from django.shortcuts import get_object_or_404
+from django.utils.timezone import localdate
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from app_common.paginations import Pagination
+from app_common.bulk import BulkWriteMixin
+from app_common.conditional import conditional_retrieve
+from app_common.paginations import Pagination, get_pagination
+from app_common.prefetch import prefetch_for
 from app_common.permissions import AdminUser
+from app_common.response_cache import versioned_response
+from app_common.serializers import ExportSerializer
+from app_common.streaming import streaming_response, export_response
 from app_payment.models import Payment, Month, PaymentType
-from app_payment.serializers import MonthSerializer, PaymentTypeSerializer, PaymentSerializer
+from app_payment.reports import REPORT_KEYS, DEBT_HEADER, payment_report, debt_rows
+from app_payment.serializers import MonthSerializer, PaymentTypeSerializer, PaymentSerializer, \
+    PaymentReportSerializer, DebtReportSerializer
+from app_statistics.timeseries import invalidate_buckets
 
-class MonthViewSet(viewsets.ViewSet): #Oylarni boshqarish uchun API
+class MonthViewSet(BulkWriteMixin, viewsets.ViewSet): #Oylarni boshqarish uchun API
     permission_classes = [AdminUser]
+    bulk_serializer_class = MonthSerializer
 
+    @versioned_response(Month)
     def list(self, request): # Barcha oylarni olish
-        months = Month.objects.all()
-        paginator = Pagination()
+        months = prefetch_for(MonthSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(months, request)
         serializer = MonthSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Month)
     def retrieve(self, request, pk=None):  # Bitta oy haqida ma'lumot olish
-        month = get_object_or_404(Month, pk=pk)
+        month = get_object_or_404(prefetch_for(MonthSerializer), pk=pk)
         serializer = MonthSerializer(month)
         return Response(serializer.data)
 
@@ -53,18 +66,21 @@ class MonthViewSet(viewsets.ViewSet): #Oylarni boshqarish uchun API
         return Response({'status': True, 'detail': 'Month muvaffaqiyatli o‘chirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class PaymentTypeViewSet(viewsets.ViewSet): #To'lov turlarini boshqarish API
+class PaymentTypeViewSet(BulkWriteMixin, viewsets.ViewSet): #To'lov turlarini boshqarish API
     permission_classes = [AdminUser]
+    bulk_serializer_class = PaymentTypeSerializer
 
+    @versioned_response(PaymentType)
     def list(self, request):  # Barcha to‘lov turlarini olish
-        types = PaymentType.objects.all()
-        paginator = Pagination()
+        types = prefetch_for(PaymentTypeSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(types, request)
         serializer = PaymentTypeSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(PaymentType)
     def retrieve(self, request, pk=None): # Bitta to‘lov turi haqida ma’lumot olish
-        type = get_object_or_404(PaymentType, pk=pk)
+        type = get_object_or_404(prefetch_for(PaymentTypeSerializer), pk=pk)
         serializer = PaymentTypeSerializer(type)
         return Response(serializer.data)
 
@@ -97,19 +113,24 @@ class PaymentTypeViewSet(viewsets.ViewSet): #To'lov turlarini boshqarish API
         return Response({'status': True, 'detail': 'PaymentType muvaffaqiyatli o‘chirildi'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class PaymentViewSet(viewsets.ViewSet): #To'lovlarni boshqarish uchun API
+class PaymentViewSet(BulkWriteMixin, viewsets.ViewSet): #To'lovlarni boshqarish uchun API
     permission_classes = [AdminUser]
+    bulk_serializer_class = PaymentSerializer
+
+    def bulk_updated(self, objects, previous): # bulk_update post_save yubormaydi, yopilgan davrlar shu yerda eskiradi
+        invalidate_buckets('revenue', [localdate(payment.created_at) for payment in objects])
 
 
     def list(self, request):  # Barcha to‘lovlarni olish
-        payments = Payment.objects.all()
-        paginator = Pagination()
+        payments = prefetch_for(PaymentSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(payments, request)
         serializer = PaymentSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Payment)
     def retrieve(self, request, pk=None): # Bitta to‘lov haqida ma’lumot olish
-        payment = get_object_or_404(Payment, pk=pk)
+        payment = get_object_or_404(prefetch_for(PaymentSerializer), pk=pk)
         serializer = PaymentSerializer(payment)
         return Response(serializer.data)
 
@@ -140,3 +161,53 @@ class PaymentViewSet(viewsets.ViewSet): #To'lovlarni boshqarish uchun API
         payment = get_object_or_404(Payment, pk=pk)
         payment.delete()
         return Response({'status': True, 'detail': 'Payment muvaffaqiyatli o‘chirildi'}, status=status.HTTP_204_NO_CONTENT)
+
+    # To‘lovlar hisobotini oy, guruh, to‘lov turi va talaba kesimida olish
+    @action(detail=False, methods=['get'], url_path='report')
+    @swagger_auto_schema(query_serializer=PaymentReportSerializer)
+    def report(self, request):
+        serializer = PaymentReportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        group_by = [key for key in REPORT_KEYS if key in serializer.validated_data['group_by']]
+        filters = {}
+        if serializer.validated_data.get('month'):
+            filters['month_id__in'] = serializer.validated_data['month']
+        if serializer.validated_data.get('group'):
+            filters['group_id__in'] = serializer.validated_data['group']
+
+        totals, rows = payment_report(group_by, filters)
+        paginator = Pagination()  # Kesimlar soni (masalan talaba × oy) katta bo‘lishi mumkin, qatorlar sahifalab qaytariladi
+        page = paginator.paginate_queryset(rows, request)
+        return Response({
+            'group_by': group_by,
+            'paid': totals['paid'] or 0,
+            'payments': totals['payments'],
+            'count': paginator.page.paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': page,
+        })
+
+    # Guruh oylik to‘lovi (Group.fee) bo‘yicha talabalarning qarzdorligi, oqim (stream) ko‘rinishida
+    @action(detail=False, methods=['get'], url_path='debts')
+    @swagger_auto_schema(query_serializer=DebtReportSerializer)
+    def debts(self, request):
+        serializer = DebtReportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = debt_rows(month_ids=serializer.validated_data.get('month'),
+                         group_ids=serializer.validated_data.get('group'))
+        return streaming_response(DEBT_HEADER, rows, serializer.validated_data['output'], 'debts')
+
+    # To‘lovlarni CSV yoki NDJSON ko‘rinishida oqim (stream) bilan eksport qilish
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[AdminUser])
+    @swagger_auto_schema(query_serializer=ExportSerializer)
+    def export(self, request):
+        serializer = ExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        fields = ('id', 'student', 'group', 'month', 'payment_type', 'price', 'created_at', 'updated_at')
+        return export_response(Payment.objects.all(), fields, serializer.validated_data['output'], 'payments')
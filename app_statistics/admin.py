@@ -1,3 +1,5 @@
 from django.contrib import admin
 
-# Register your models here.
+from app_statistics.models import TimeSeriesBucket
+
+admin.site.register(TimeSeriesBucket)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppStatisticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_statistics'
+
+    def ready(self):
+        import app_statistics.signals  # noqa: F401
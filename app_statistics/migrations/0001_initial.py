@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeSeriesBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('metric', models.CharField(max_length=50)),
+                ('period', models.CharField(max_length=10)),
+                ('start', models.DateField()),
+                ('value', models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True)),
+            ],
+            options={
+                'verbose_name': 'Time series bucket',
+                'verbose_name_plural': 'Time series buckets',
+                'constraints': [models.UniqueConstraint(fields=('metric', 'period', 'start'), name='unique_timeseries_bucket')],
+            },
+        ),
+    ]
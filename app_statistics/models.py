@@ -0,0 +1,21 @@
+from django.db import models
+
+from app_common.models import BaseModel
+
+
+class TimeSeriesBucket(BaseModel): # Yopilgan (o‘tib ketgan) davr uchun bir marta hisoblangan statistika qiymati
+
+    metric = models.CharField(max_length=50)  # registrations, revenue, homework_completion
+    period = models.CharField(max_length=10)  # day, week, month
+    start = models.DateField()  # Davrning birinchi kuni
+    value = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True)  # Ma'lumot bo‘lmasa null
+
+    def __str__(self):
+        return f"{self.metric} {self.period} {self.start}: {self.value}"
+
+    class Meta:
+        verbose_name = 'Time series bucket'
+        verbose_name_plural = 'Time series buckets'
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'period', 'start'], name='unique_timeseries_bucket'),
+        ]
@@ -1,7 +1,25 @@
-from rest_framework.fields import DateField
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateField, ChoiceField, MultipleChoiceField
 from rest_framework.serializers import Serializer
 
+from app_statistics.timeseries import PERIODS, METRICS, MAX_BUCKETS, MIN_DATE, MAX_DATE, bucket_count
+
 
 class DateFilterSerializer(Serializer):
     start_date = DateField(required=True)
-    end_date = DateField(required=True)
\ No newline at end of file
+    end_date = DateField(required=True)
+
+class TimeSeriesSerializer(Serializer): # statistics/timeseries/ uchun so‘rov parametrlari
+    period = ChoiceField(choices=PERIODS, default='day')
+    start_date = DateField(required=True)
+    end_date = DateField(required=True)
+    metrics = MultipleChoiceField(choices=list(METRICS), required=False)
+
+    def validate(self, data):
+        if data['start_date'] > data['end_date']:
+            raise ValidationError("start_date end_date dan katta bo‘lmasligi kerak")
+        if data['start_date'] < MIN_DATE or data['end_date'] > MAX_DATE:
+            raise ValidationError(f"Sanalar {MIN_DATE} – {MAX_DATE} oralig‘ida bo‘lishi kerak")
+        if bucket_count(data['start_date'], data['end_date'], data['period']) > MAX_BUCKETS:
+            raise ValidationError(f"Bir so‘rovda {MAX_BUCKETS} tadan ortiq davr bo‘lmasligi kerak")
+        return data
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils.timezone import localdate
+
+from app_payment.models import Payment
+from app_statistics.timeseries import invalidate_buckets
+from app_users.models import Student, HomeworkHistory
+
+
+# Yopilgan davrlarga ta'sir qiladigan o‘zgarishlarda saqlangan qiymatlar o‘chiriladi,
+# keyingi so‘rovda ular qayta hisoblanadi.
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    invalidate_buckets('registrations', [localdate(instance.created_at)])
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def payment_changed(sender, instance, **kwargs):
+    invalidate_buckets('revenue', [localdate(instance.created_at)])
+
+
+@receiver(pre_save, sender=HomeworkHistory)
+def homework_history_saving(sender, instance, **kwargs): # Muddat o‘zgarsa eski davr ham yangilanishi kerak
+    instance._old_due_date = (HomeworkHistory.objects.filter(pk=instance.pk)
+                              .values_list('due_date', flat=True).first() if instance.pk else None)
+
+
+@receiver(post_save, sender=HomeworkHistory)
+@receiver(post_delete, sender=HomeworkHistory)
+def homework_history_changed(sender, instance, **kwargs):
+    invalidate_buckets('homework_completion', [instance.due_date, getattr(instance, '_old_due_date', None)])
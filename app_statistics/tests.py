@@ -1,3 +1,108 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_courses.models import Subject, Group
+from app_statistics.models import TimeSeriesBucket
+from app_statistics.timeseries import MAX_BUCKETS, bucket_count, bucket_range, bucket_start, get_series
+from app_users.models import User, Student
+
+
+def registered_on(day, phone): # Signal yubormasdan created_at orqaga suriladi
+    student = Student.objects.create(user=User.objects.create_user(phone=phone, password='x', is_student=True))
+    Student.objects.filter(pk=student.pk).update(
+        created_at=timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(hours=12))
+    return student
+
+
+class BucketTests(TestCase): # Davr chegaralari va davrlar soni
+    def test_bucket_boundaries(self):
+        self.assertEqual(bucket_start(date(2026, 10, 18), 'week'), date(2026, 10, 12))  # Dushanba
+        self.assertEqual(bucket_start(date(2026, 10, 18), 'month'), date(2026, 10, 1))
+        self.assertEqual(bucket_range(date(2026, 1, 31), date(2026, 3, 1), 'month'),
+                         [date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)])
+        self.assertEqual(bucket_range(date(2026, 10, 18), date(2026, 10, 19), 'week'),
+                         [date(2026, 10, 12), date(2026, 10, 19)])
+
+    def test_bucket_count_matches_range(self):
+        for period in ('day', 'week', 'month'):
+            for start, end in ((date(2026, 1, 1), date(2026, 1, 1)), (date(2025, 12, 28), date(2026, 3, 2)),
+                               (date(2024, 2, 29), date(2026, 2, 28))):
+                with self.subTest(period=period, start=start, end=end):
+                    self.assertEqual(bucket_count(start, end, period), len(bucket_range(start, end, period)))
+
+    def test_closed_buckets_are_served_from_storage(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        registered_on(yesterday, '998900000050')
+        self.assertEqual(get_series('registrations', 'day', yesterday, yesterday), {yesterday: 1})
+        self.assertTrue(TimeSeriesBucket.objects.filter(metric='registrations', start=yesterday).exists())
+
+        registered_on(yesterday, '998900000051')  # update() signal yubormaydi: saqlangan qiymat o‘zgarmaydi
+        with self.assertNumQueries(1):
+            self.assertEqual(get_series('registrations', 'day', yesterday, yesterday), {yesterday: 1})
+
+    def test_open_bucket_is_not_stored(self):
+        today = timezone.localdate()
+        get_series('registrations', 'day', today, today)
+        self.assertFalse(TimeSeriesBucket.objects.filter(start=today).exists())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TimeSeriesViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+
+    def get(self, **params):
+        return self.client.get(reverse('statistics:timeseries'), params)
+
+    def test_range_limits_are_validation_errors(self):
+        for params in ({'start_date': '9999-12-30', 'end_date': '9999-12-31', 'period': 'day'},
+                       {'start_date': '9999-12-30', 'end_date': '9999-12-31', 'period': 'month'},
+                       {'start_date': '0001-01-01', 'end_date': '0001-01-02', 'period': 'week'},
+                       {'start_date': '1900-01-01', 'end_date': '2999-12-31', 'period': 'day'}):
+            with self.subTest(**params):
+                self.assertEqual(self.get(**params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_max_buckets(self):
+        start = date(2020, 1, 1)
+        response = self.get(start_date=str(start), end_date=str(start + timedelta(days=MAX_BUCKETS - 1)),
+                            metrics='registrations')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['series']), MAX_BUCKETS)
+        response = self.get(start_date=str(start), end_date=str(start + timedelta(days=MAX_BUCKETS)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StudentFilterViewTests(APITestCase): # Bir nechta guruhdagi talaba bir marta sanaladi
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+        subject = Subject.objects.create(title='Fizika')
+        active = [Group.objects.create(title=f'A{i}', subject=subject, active=True) for i in range(2)]
+        finished = Group.objects.create(title='F', subject=subject, active=False)
+        day = date(2026, 9, 1)
+        registered_on(day, '998900000060').group.add(*active)  # Ikki faol guruhda
+        registered_on(day, '998900000061').group.add(active[0], finished)  # Faol va tugagan guruhda
+        registered_on(day + timedelta(days=1), '998900000062').group.add(finished)
+        registered_on(date(2026, 1, 1), '998900000063').group.add(*active)  # Oraliqdan tashqarida
+
+    def test_students_in_several_groups_are_counted_once(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(reverse('statistics:recent-students'),
+                                    {'start_date': '2026-09-01', 'end_date': '2026-09-30'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['total_students'], response.data['registered_students'],
+                          response.data['studying_students'], response.data['graduated_students']), (4, 3, 2, 2))
+        self.assertEqual([(row['day'], row['count']) for row in response.data['registrations_per_day']],
+                         [(date(2026, 9, 1), 2), (date(2026, 9, 2), 1)])
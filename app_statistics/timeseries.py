@@ -0,0 +1,142 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.timezone import make_aware
+
+from app_attendance.models import GroupDailyAttendance
+from app_payment.models import Payment
+from app_statistics.models import TimeSeriesBucket
+from app_users.models import Student, HomeworkHistory
+
+PERIODS = ('day', 'week', 'month')
+MAX_BUCKETS = 1000  # Bitta so‘rovdagi davrlar soni chegarasi
+# Qabul qilinadigan sanalar oralig‘i: hafta boshi va keyingi davr date.min / date.max dan chiqib ketmaydi
+MIN_DATE = date(1900, 1, 1)
+MAX_DATE = date(2999, 12, 31)
+
+
+def bucket_start(day, period): # Sana tushadigan davrning birinchi kuni
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, period):
+    if period == 'week':
+        return start + timedelta(days=7)
+    if period == 'month':
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_count(start_date, end_date, period): # bucket_range uzunligi, ro‘yxat qurmasdan hisoblanadi
+    if period == 'month':
+        return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    days = (bucket_start(end_date, period) - bucket_start(start_date, period)).days
+    return days // 7 + 1 if period == 'week' else days + 1
+
+
+def bucket_range(start_date, end_date, period): # [start_date, end_date] oralig‘idagi barcha davrlar boshlari
+    buckets = []
+    current = bucket_start(start_date, period)
+    while current <= end_date:
+        buckets.append(current)
+        current = next_bucket(current, period)
+    return buckets
+
+
+def _aggregate(queryset, field, period, start, end, **aggregates): # Davrlar bazada Trunc orqali guruhlanadi
+    # end – oxirgi davrdan keyingi kun (kiritilmaydi)
+    if queryset.model._meta.get_field(field).get_internal_type() == 'DateTimeField':
+        start = make_aware(datetime.combine(start, datetime.min.time()))
+        end = make_aware(datetime.combine(end, datetime.min.time()))
+    rows = (queryset.filter(**{f'{field}__gte': start, f'{field}__lt': end})
+            .annotate(bucket=Trunc(field, period, output_field=DateField()))
+            .values('bucket')
+            .annotate(**aggregates)
+            .order_by('bucket'))
+    return {row.pop('bucket'): row for row in rows}
+
+
+def _rate(part, whole):
+    return round(Decimal(part) * 100 / whole, 2) if whole else None
+
+
+def registrations(period, start, end):
+    rows = _aggregate(Student.objects.all(), 'created_at', period, start, end, count=Count('id'))
+    return {bucket: row['count'] for bucket, row in rows.items()}
+
+
+def revenue(period, start, end):
+    rows = _aggregate(Payment.objects.all(), 'created_at', period, start, end, total=Sum('price'))
+    return {bucket: row['total'] for bucket, row in rows.items()}
+
+
+def attendance_rate(period, start, end): # GroupDailyAttendance rollup jadvalidan hisoblanadi
+    rows = _aggregate(GroupDailyAttendance.objects.all(), 'date', period, start, end,
+                      present=Sum('present'), total=Sum('total'))
+    return {bucket: _rate(row['present'], row['total']) for bucket, row in rows.items()}
+
+
+def homework_completion(period, start, end): # Muddati shu davrga to‘g‘ri keladigan uy vazifalaridan bajarilganlari foizi
+    rows = _aggregate(HomeworkHistory.objects.all(), 'due_date', period, start, end,
+                      completed=Count('id', filter=Q(completed=True)), total=Count('id'))
+    return {bucket: _rate(row['completed'], row['total']) for bucket, row in rows.items()}
+
+
+# metric -> (hisoblash funksiyasi, ma'lumot yo‘q davr qiymati, yopilgan davrlar TimeSeriesBucket da saqlanadimi)
+# Davomat allaqachon GroupDailyAttendance rollup jadvalida yig‘ilgani uchun alohida saqlanmaydi.
+METRICS = {
+    'registrations': (registrations, 0, True),
+    'revenue': (revenue, Decimal('0'), True),
+    'attendance_rate': (attendance_rate, None, False),
+    'homework_completion': (homework_completion, None, True),
+}
+
+
+def get_series(metric, period, start_date, end_date): # {davr boshi: qiymat}, faqat ochiq va hali saqlanmagan davrlar hisoblanadi
+    compute, empty, cacheable = METRICS[metric]
+    buckets = bucket_range(start_date, end_date, period)
+    current = bucket_start(timezone.localdate(), period)
+
+    stored = {}
+    if cacheable:
+        stored = dict(TimeSeriesBucket.objects.filter(
+            metric=metric, period=period, start__gte=buckets[0], start__lte=buckets[-1], start__lt=current,
+        ).values_list('start', 'value'))
+        if isinstance(empty, int):
+            stored = {bucket: int(value) for bucket, value in stored.items()}
+
+    missing = [bucket for bucket in buckets if bucket not in stored]
+    if not missing:
+        return stored
+
+    computed = compute(period, missing[0], next_bucket(missing[-1], period))
+    values = dict(stored)
+    for bucket in missing:
+        values[bucket] = computed.get(bucket, empty)
+
+    if cacheable:
+        TimeSeriesBucket.objects.bulk_create([
+            TimeSeriesBucket(metric=metric, period=period, start=bucket, value=values[bucket])
+            for bucket in missing if bucket < current
+        ], ignore_conflicts=True)
+
+    return values
+
+
+def invalidate_buckets(metric, days): # O‘tgan sanaga tegishli ma'lumot o‘zgarganda saqlangan davrlar o‘chiriladi
+    # Bugungi sana barcha davrlarda hali ochiq, ular saqlanmaydi
+    today = timezone.localdate()
+    days = {day for day in days if day is not None and day < today}
+    if not days:
+        return
+    condition = Q()
+    for period in PERIODS:
+        condition |= Q(period=period, start__in={bucket_start(day, period) for day in days})
+    TimeSeriesBucket.objects.filter(condition, metric=metric).delete()
@@ -1,10 +1,12 @@
 from django.urls import path
 
-from app_statistics.views import StudentFilterView
+from app_statistics.views import StudentFilterView, TimeSeriesView, CacheStatsView
 
 app_name = 'statistics'
 
 urlpatterns = [
     path('students-statistic/', StudentFilterView.as_view(), name='recent-students'),
+    path('timeseries/', TimeSeriesView.as_view(), name='timeseries'),
+    path('cache/', CacheStatsView.as_view(), name='cache-stats'),
 
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from django.db.models import Count, Q, Sum
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
 from django.utils.timezone import make_aware
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -8,8 +9,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAdminUser
 
+from app_common.cache import cache_stats
 from app_users.models import Student
-from app_statistics.serializers import DateFilterSerializer
+from app_statistics.serializers import DateFilterSerializer, TimeSeriesSerializer
+from app_statistics.timeseries import METRICS, bucket_range, get_series
 
 
 
@@ -28,14 +31,60 @@ class StudentFilterView(APIView):
         start_date = make_aware(datetime.combine(start_date, datetime.min.time()))
         end_date = make_aware(datetime.combine(end_date, datetime.max.time()))
 
-        total_students = Student.objects.count()
-        graduated_students = Student.objects.filter(group__active=False, created_at__range=[start_date, end_date]).count()
-        studying_students = Student.objects.filter(group__active=True, created_at__range=[start_date, end_date]).count()
-        registered_students = Student.objects.filter(created_at__range=[start_date, end_date]).count()
+        # To‘rtala ko‘rsatkich Student/Group JOIN ustidan bitta so‘rovda hisoblanadi.
+        # distinct=True bir nechta guruhdagi talabani ikki marta sanamaslik uchun kerak.
+        in_range = Q(created_at__range=[start_date, end_date])
+        figures = Student.objects.aggregate(
+            total_students=Count('id', distinct=True),
+            registered_students=Count('id', distinct=True, filter=in_range),
+            studying_students=Count('id', distinct=True, filter=in_range & Q(group__active=True)),
+            graduated_students=Count('id', distinct=True, filter=in_range & Q(group__active=False)),
+        )
+
+        # Kunlar kesimida ro‘yxatdan o‘tgan talabalar
+        registrations = (Student.objects.filter(in_range)
+                         .annotate(day=TruncDate('created_at'))
+                         .values('day')
+                         .annotate(count=Count('id'))
+                         .order_by('day'))
+
+        return Response({
+            "total_students": figures['total_students'],
+            "registered_students": figures['registered_students'],
+            "studying_students": figures['studying_students'],
+            "graduated_students": figures['graduated_students'],
+            "registrations_per_day": list(registrations),
+        }, status=status.HTTP_200_OK)
+
+
+class TimeSeriesView(APIView): # Ro‘yxatdan o‘tish, tushum, davomat va uy vazifasi statistikasi kun/hafta/oy kesimida
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(query_serializer=TimeSeriesSerializer)
+    def get(self, request):
+        serializer = TimeSeriesSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        period = serializer.validated_data['period']
+        start_date = serializer.validated_data['start_date']
+        end_date = serializer.validated_data['end_date']
+        metrics = [metric for metric in METRICS if metric in (serializer.validated_data.get('metrics') or METRICS)]
+
+        values = {metric: get_series(metric, period, start_date, end_date) for metric in metrics}
+        series = [
+            {'start': bucket, **{metric: values[metric][bucket] for metric in metrics}}
+            for bucket in bucket_range(start_date, end_date, period)
+        ]
 
         return Response({
-            "total_students": total_students,
-            "registered_students": registered_students,
-            "studying_students": studying_students,
-            "graduated_students": graduated_students,
+            "period": period,
+            "series": series,
         }, status=status.HTTP_200_OK)
+
+
+class CacheStatsView(APIView): # Kesh nomlar fazolari bo‘yicha hit/miss statistikasi
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"namespaces": cache_stats()}, status=status.HTTP_200_OK)
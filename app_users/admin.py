@@ -3,4 +3,15 @@ from django.contrib import admin
 from app_courses.models import Homework
 from app_users.models import *
 
-admin.site.register([User,Student,Teacher,Parent,HomeworkHistory])
+admin.site.register([User,Teacher,Parent,HomeworkHistory])
+
+
+class StudentGroupInline(admin.TabularInline): # Aniq through modelli guruhlar inline orqali tahrirlanadi
+    model = StudentGroup
+    extra = 0
+
+
+@admin.register(Student)
+class StudentAdmin(admin.ModelAdmin):
+    inlines = [StudentGroupInline]
+
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AppUsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_users'
+
+    def ready(self):
+        from app_common.conditional import track_m2m_changes
+        from app_users.models import User, Student, Teacher, Parent
+
+        # M2M bog‘lanishlar o‘zgarsa egasining updated_at (ETag) qiymati yangilanadi
+        track_m2m_changes(User.groups, User.user_permissions, Student.group, Student.cource, Teacher.cource,
+                          Parent.students)
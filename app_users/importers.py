@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction, DatabaseError
+
+from app_courses.models import Group, Course
+from app_users.models import User, Student, Teacher
+
+IMPORT_CHUNK_SIZE = 500  # Bitta tranzaksiyada yaratiladigan foydalanuvchilar soni
+ROLES = ('student', 'teacher')
+
+
+def parse_rows(content, filename=''): # CSV yoki JSON matnini qatorlar ro‘yxatiga aylantiradi
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if filename.endswith('.json') or content.lstrip().startswith(('[', '{')):
+        data = json.loads(content)
+        rows = data.get('rows', []) if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            raise ValueError('JSON qatorlar ro‘yxati bo‘lishi kerak')
+        return rows
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def _text(row, field, row_errors, numbers=False): # Qator maydoni matn (numbers=True bo‘lsa son ham) bo‘lishi kerak
+    value = row.get(field)
+    if value is None:
+        return ''
+    if isinstance(value, str) or (numbers and isinstance(value, int) and not isinstance(value, bool)):
+        return str(value).strip()
+    row_errors[field] = 'Matn bo‘lishi kerak'
+    return ''
+
+
+def _ids(value): # "1;2;3" yoki [1, 2, 3] -> {1, 2, 3}
+    if value in (None, ''):
+        return set()
+    if isinstance(value, str):
+        value = [part for part in value.replace(',', ';').split(';') if part.strip()]
+    return {_id(part) for part in value}
+
+
+def _id(part): # Faqat butun son yoki raqamli matn: int(1.5) kabi jim yaxlitlash yo‘q
+    if isinstance(part, bool) or not isinstance(part, (int, str)):
+        raise TypeError(part)
+    return int(part)
+
+
+def _hash_passwords(passwords, workers=1): # PBKDF2 og‘ir: import_users buyrug‘ida parollar protsesslar pulida xeshlanadi
+    if workers <= 1 or len(passwords) < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        return [make_password(password) for password in passwords]
+
+    # fork: bola protsesslarda Django qayta sozlanmaydi; ular os._exit bilan tugagani uchun
+    # meros qolgan DB ulanishlari yopilmaydi va ota protsessga ta'sir qilmaydi.
+    # Ko‘p oqimli web workerda fork xavfli (qulflar nusxalanadi), shuning uchun API har doim workers=1 bilan chaqiradi
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+        return list(executor.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def validate_rows(rows, role): # Har bir qator tekshiriladi, mavjud telefonlar bitta so‘rovda aniqlanadi
+    errors = {}
+    valid = []
+    seen = set()
+
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors[index] = {'non_field_errors': 'Qator obyekt bo‘lishi kerak'}
+            continue
+        row_errors = {}
+        phone = _text(row, 'phone', row_errors, numbers=True)
+        password = _text(row, 'password', row_errors, numbers=True)
+        full_name = _text(row, 'full_name', row_errors) or None
+        description = _text(row, 'description', row_errors) or None
+
+        if not phone:
+            row_errors.setdefault('phone', 'Telefon raqami kiritilishi shart')
+        else:
+            try:
+                User.phone_regex(phone)
+            except ValidationError as e:
+                row_errors['phone'] = e.messages[0]
+            if phone in seen:
+                row_errors['phone'] = 'Telefon raqami faylda takrorlangan'
+            seen.add(phone)
+        if not password:
+            row_errors.setdefault('password', 'Parol kiritilishi shart')
+        if full_name and len(full_name) > 50:
+            row_errors['full_name'] = 'Maksimal 50 ta belgi'
+        try:
+            groups = _ids(row.get('groups')) if role == 'student' else set()
+            courses = _ids(row.get('courses'))
+        except (TypeError, ValueError):
+            row_errors['ids'] = 'groups va courses butun sonlar bo‘lishi kerak'
+            groups, courses = set(), set()
+        if not courses and 'ids' not in row_errors:
+            row_errors['courses'] = 'Kamida bitta kurs kiritilishi shart'
+
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            valid.append({'row': index, 'phone': phone, 'password': password, 'full_name': full_name,
+                          'description': description, 'groups': groups, 'courses': courses})
+
+    existing_phones = set(User.objects.filter(phone__in=[row['phone'] for row in valid]).values_list('phone', flat=True))
+    existing_groups = set(Group.objects.filter(id__in=set().union(*(row['groups'] for row in valid)))
+                          .values_list('id', flat=True))
+    existing_courses = set(Course.objects.filter(id__in=set().union(*(row['courses'] for row in valid)))
+                           .values_list('id', flat=True))
+
+    checked = []
+    for row in valid:
+        row_errors = {}
+        if row['phone'] in existing_phones:
+            row_errors['phone'] = 'Bu telefon raqami bilan foydalanuvchi mavjud'
+        if row['groups'] - existing_groups:
+            row_errors['groups'] = f"Guruh topilmadi: {sorted(row['groups'] - existing_groups)}"
+        if row['courses'] - existing_courses:
+            row_errors['courses'] = f"Kurs topilmadi: {sorted(row['courses'] - existing_courses)}"
+        if row_errors:
+            errors[row['row']] = row_errors
+        else:
+            checked.append(row)
+    return checked, errors
+
+
+def _create_chunk(rows, role): # Foydalanuvchi, profil va M2M bog‘lanishlar bulk_create bilan yaratiladi
+    users = User.objects.bulk_create([
+        User(phone=row['phone'], password=row['password'], full_name=row['full_name'],
+             is_student=role == 'student', is_teacher=role == 'teacher')
+        for row in rows
+    ])
+
+    if role == 'student':
+        profiles = Student.objects.bulk_create([
+            Student(user=user, description=row['description']) for user, row in zip(users, rows)])
+        Student.group.through.objects.bulk_create([
+            Student.group.through(student_id=profile.id, group_id=group_id)
+            for profile, row in zip(profiles, rows) for group_id in row['groups']])
+        Student.cource.through.objects.bulk_create([
+            Student.cource.through(student_id=profile.id, course_id=course_id)
+            for profile, row in zip(profiles, rows) for course_id in row['courses']])
+    else:
+        profiles = Teacher.objects.bulk_create([
+            Teacher(user=user, description=row['description']) for user, row in zip(users, rows)])
+        Teacher.cource.through.objects.bulk_create([
+            Teacher.cource.through(teacher_id=profile.id, course_id=course_id)
+            for profile, row in zip(profiles, rows) for course_id in row['courses']])
+    return profiles
+
+
+def import_users(rows, role, chunk_size=IMPORT_CHUNK_SIZE, hash_workers=1): # Talaba yoki o‘qituvchilarni ommaviy yaratadi va qatorlar bo‘yicha hisobot qaytaradi
+    valid, errors = validate_rows(rows, role)
+
+    for row, password in zip(valid, _hash_passwords([row['password'] for row in valid], hash_workers)):
+        row['password'] = password
+
+    created = []
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            with transaction.atomic():
+                profiles = _create_chunk(chunk, role)
+        except DatabaseError as e:
+            # Masalan, tekshiruvdan keyin parallel so‘rov shu telefonni band qilgan bo‘lsa
+            for row in chunk:
+                errors[row['row']] = {'non_field_errors': str(e)}
+            continue
+        created += [{'row': row['row'], 'phone': row['phone'], 'id': profile.id} for row, profile in zip(chunk, profiles)]
+
+    return {
+        'created': len(created),
+        'failed': len(errors),
+        'results': created,
+        'errors': [{'row': index, 'errors': errors[index]} for index in sorted(errors)],
+    }
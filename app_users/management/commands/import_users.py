@@ -0,0 +1,29 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app_users.importers import import_users, parse_rows, ROLES, IMPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand): # CSV/JSON fayldan talaba yoki o‘qituvchilarni ommaviy import qiladi
+    help = "Bulk import students or teachers from a CSV or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--role', choices=ROLES, required=True)
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--hash-workers', type=int, default=settings.USER_IMPORT_HASH_WORKERS)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as f:
+                rows = parse_rows(f.read(), options['path'])
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f"Faylni o‘qib bo‘lmadi: {e}")
+
+        report = import_users(rows, options['role'], chunk_size=options['chunk_size'],
+                              hash_workers=options['hash_workers'])
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        self.stdout.write(self.style.SUCCESS(f"Created {report['created']} {options['role']}s, {report['failed']} rows failed"))
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_courses', '0003_group_fee'),
+        ('app_users', '0003_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='homeworkhistory',
+            index=models.Index(fields=['due_date', 'completed'], name='hwhistory_due_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['created_at', 'id'], name='student_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['created_at', 'id'], name='teacher_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Greatest, TruncDate
+
+
+def backfill_joined_on(apps, schema_editor): # Mavjud a'zoliklar uchun eng yaxshi taxmin: talaba va guruhning kechroq yaratilgan sanasi
+    StudentGroup = apps.get_model('app_users', 'StudentGroup')
+    created = {name: Subquery(apps.get_model(label).objects.filter(pk=OuterRef(f'{name}_id')).values('created_at')[:1])
+               for name, label in (('student', 'app_users.Student'), ('group', 'app_courses.Group'))}
+    StudentGroup.objects.update(joined_on=TruncDate(Greatest(created['student'], created['group'])))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_courses', '0003_group_fee'),
+        ('app_users', '0004_indexes'),
+    ]
+
+    operations = [
+        # app_users_student_group jadvali allaqachon mavjud: faqat holat (state) aniq through modelga o‘tkaziladi
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='StudentGroup',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app_courses.group')),
+                        ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app_users.student')),
+                    ],
+                    options={
+                        'db_table': 'app_users_student_group',
+                        'unique_together': {('student', 'group')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='student',
+                    name='group',
+                    field=models.ManyToManyField(blank=True, related_name='g_student', through='app_users.StudentGroup', to='app_courses.group'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='studentgroup',
+            name='joined_on',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.RunPython(backfill_joined_on, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.contrib.auth.base_user import BaseUserManager, AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
 from app_common.models import BaseModel
 
@@ -68,7 +69,7 @@ class User(AbstractBaseUser, PermissionsMixin): #Foydalanuvchi modeli. Telefon r
 class Student(BaseModel): # Talaba modeli. Bir foydalanuvchi faqat bitta talabaga tegishli bo‘lishi mumkin.
 
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    group = models.ManyToManyField('app_courses.Group', related_name='g_student', blank=True)
+    group = models.ManyToManyField('app_courses.Group', related_name='g_student', blank=True, through='StudentGroup')
     cource = models.ManyToManyField('app_courses.Course', related_name='c_student')
     description = models.TextField(null=True, blank=True)
 
@@ -78,8 +79,20 @@ class Student(BaseModel): # Talaba modeli. Bir foydalanuvchi faqat bitta talabag
     class Meta:
         verbose_name = 'Student'
         verbose_name_plural = 'Students'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='student_created_id_idx'),  # Kursorli sahifalash va ro‘yxatdan o‘tish statistikasi (created_at oralig‘i)
+        ]
 
 
+class StudentGroup(models.Model): # Talaba-guruh a'zoligi (Student.group through jadvali), a'zolik boshlangan sana bilan
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    group = models.ForeignKey('app_courses.Group', on_delete=models.CASCADE)
+    joined_on = models.DateField(default=timezone.localdate)  # Qarzdorlik shu sananing oyidan boshlab hisoblanadi
+
+    class Meta:
+        db_table = 'app_users_student_group'  # Avtomatik through jadvali nomi saqlanadi
+        unique_together = ('student', 'group')
+
 
 class Teacher(BaseModel): #O‘qituvchi modeli. Har bir o‘qituvchiga bir foydalanuvchi tegishli bo‘ladi
 
@@ -93,6 +106,9 @@ class Teacher(BaseModel): #O‘qituvchi modeli. Har bir o‘qituvchiga bir foyda
     class Meta:
         verbose_name = 'Teacher'
         verbose_name_plural = 'Teachers'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='teacher_created_id_idx'),  # Kursorli sahifalash (created_at, id) uchun
+        ]
 
 
 # Ota-ona modeli
@@ -128,3 +144,6 @@ class HomeworkHistory(BaseModel): #Talabaning uy vazifalari bo‘yicha tarixi.
     class Meta:
         verbose_name = "Homework History"
         verbose_name_plural = "Homework Histories"
+        indexes = [
+            models.Index(fields=['due_date', 'completed'], name='hwhistory_due_completed_idx'),  # Uy vazifasi bajarilishi statistikasi (jadvalga murojaatsiz)
+        ]
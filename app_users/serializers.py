@@ -1,5 +1,9 @@
+from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
+
+from app_common.batch import MAX_BATCH_IDS
+from app_courses.models import Group
 from app_users.models import Teacher, User, Student, Parent
 
 
@@ -7,6 +11,7 @@ class UserAllSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = "__all__"
+        prefetch_related = ('groups', 'user_permissions')
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -25,14 +30,18 @@ class TeacherSerializer(serializers.ModelSerializer):
     class Meta:
         model = Teacher
         fields = ('id', 'user', 'cource', 'description')
+        prefetch_related = ('cource',)
 
 
 class StudentSerializer(serializers.ModelSerializer): #Talabalar uchun serializer
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    # through modeli aniq bo‘lgani uchun DRF maydonni read_only qiladi; joined_on standart qiymat bilan yoziladi
+    group = serializers.PrimaryKeyRelatedField(many=True, queryset=Group.objects.all(), required=False)
 
     class Meta:
         model = Student
         fields = ("id", "user", "group", "cource", "description")
+        prefetch_related = ('group', 'cource')
 
 
 class ParentSerializer(serializers.ModelSerializer):
@@ -44,11 +53,11 @@ class ParentSerializer(serializers.ModelSerializer):
 
 
 class GetStudentsByIdsSerializer(serializers.Serializer):
-    student_ids = serializers.ListField(child=serializers.IntegerField())
+    student_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_BATCH_IDS)
 
 
 class GetTeachersByIdsSerializer(serializers.Serializer):
-    teacher_ids = serializers.ListField(child=serializers.IntegerField())
+    teacher_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_BATCH_IDS)
 
 
 class UserAndTeacherSerializer(serializers.Serializer):
@@ -60,3 +69,30 @@ class UserAndStudentSerializer(serializers.Serializer):
     user = UserSerializer()
     student = StudentSerializer()
 
+
+
+def check_import_size(rows): # API orqali bitta so‘rovda import qilinadigan qatorlar chegarasi
+    if len(rows) > settings.USER_IMPORT_API_MAX_ROWS:
+        raise serializers.ValidationError(
+            f"Ko‘pi bilan {settings.USER_IMPORT_API_MAX_ROWS} ta qator: katta importlar uchun manage.py import_users buyrug‘idan foydalaning")
+
+
+class UserImportSerializer(serializers.Serializer): # CSV/JSON fayl (multipart) yoki JSON tanadagi rows ro‘yxati
+    file = serializers.FileField(required=False)
+    rows = serializers.ListField(child=serializers.DictField(), required=False)
+
+    # Parollar so‘rov ichida ketma-ket xeshlanadi: katta importlar manage.py import_users buyrug‘i orqali
+    def validate_file(self, value):
+        if value.size > settings.USER_IMPORT_API_MAX_FILE_SIZE:
+            raise serializers.ValidationError(
+                f"Fayl {settings.USER_IMPORT_API_MAX_FILE_SIZE} baytdan katta: manage.py import_users buyrug‘idan foydalaning")
+        return value
+
+    def validate_rows(self, value):
+        check_import_size(value)
+        return value
+
+    def validate(self, attrs):
+        if not attrs.get('file') and not attrs.get('rows'):
+            raise serializers.ValidationError('file yoki rows kiritilishi shart')
+        return attrs
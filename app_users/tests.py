@@ -1,3 +1,70 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_courses.models import Course
+from app_users.models import User, Teacher
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportTests(APITestCase): # Noto‘g‘ri turdagi qatorlar 500 emas, qator xatosi sifatida qaytadi
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(phone='998900000001', password='x', is_admin=True, is_staff=True)
+        cls.course = Course.objects.create(title='Kurs')
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='127.0.0.1')
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, content, name='teachers.json'):
+        upload = SimpleUploadedFile(name, content.encode(), content_type='application/octet-stream')
+        return self.client.post(reverse('users:teachers-import'), {'file': upload}, format='multipart')
+
+    def test_rows_of_wrong_type_are_reported(self):
+        rows = [
+            1,
+            {'phone': '998900000002', 'password': 'x', 'full_name': 123, 'courses': [self.course.pk]},
+            {'phone': 998900000003, 'password': 'x', 'full_name': 'Ali', 'courses': str(self.course.pk)},
+        ]
+        response = self.upload(json.dumps(rows))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertIn('non_field_errors', response.data['errors'][0]['errors'])
+        self.assertIn('full_name', response.data['errors'][1]['errors'])
+        self.assertTrue(Teacher.objects.filter(user__phone='998900000003', cource=self.course).exists())
+
+    def test_json_that_is_not_a_list_is_rejected(self):
+        for content in ('5', '{"rows": 5}', '"rows"'):
+            with self.subTest(content=content):
+                response = self.upload(content)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertFalse(response.data['status'])
+
+    def test_non_integer_ids_are_reported(self):
+        rows = [{'phone': '998900000004', 'password': 'x', 'courses': [1.5]},
+                {'phone': '998900000005', 'password': 'x', 'courses': '1.5'}]
+        response = self.upload(json.dumps(rows))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([list(error['errors']) for error in response.data['errors']], [['ids'], ['ids']])
+
+    @override_settings(USER_IMPORT_API_MAX_ROWS=2, USER_IMPORT_API_MAX_FILE_SIZE=200)
+    def test_api_import_size_is_limited(self):
+        rows = [{'phone': f'99890000004{i}', 'password': 'x', 'courses': [self.course.pk]} for i in range(3)]
+        response = self.client.post(reverse('users:teachers-import'), {'rows': rows}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('import_users', str(response.data['rows']))
+
+        response = self.upload(json.dumps(rows[:1] * 3))  # Fayl hajmi chegaradan kichik, qatorlar ko‘p
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('import_users', response.data['detail'])
+
+        response = self.upload(json.dumps(rows * 2))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', response.data)
+        self.assertFalse(Teacher.objects.exists())
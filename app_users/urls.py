@@ -4,7 +4,8 @@ from rest_framework.routers import DefaultRouter
 from app_users.views import TeacherCreateAPIView, TeacherListView, TeacherUpdateView, StudentListView, \
     StudentUpdateView, StudentCreateAPIView, TeacherRetrieveAPIView, StudentRetrieveAPIView, \
     UserListView, UserDetailView, UserCreateView, UserUpdateView, UserDeleteView, ParentViewSet, \
-    TeacherGroupsAPIView, StudentGroupsAPIView, GetStudentsByIds, GetTeachersByIds
+    TeacherGroupsAPIView, StudentGroupsAPIView, GetStudentsByIds, GetTeachersByIds, UserExportView, StudentExportView, \
+    StudentImportView, TeacherImportView
 
 app_name = 'users'
 
@@ -18,6 +19,7 @@ urlpatterns = [
     path('create/user/', UserCreateView.as_view(), name='user-create'),
     path('update/user/<int:id>/', UserUpdateView.as_view(), name='user-update'),
     path('delete/user/<int:id>/', UserDeleteView.as_view(), name='user-delete'),
+    path('export/users/', UserExportView.as_view(), name='user-export'),
     path('teachers/',TeacherListView.as_view(),name="all_teachers"),
     path('teacher/<int:id>/',TeacherRetrieveAPIView.as_view(),name="teacher"),
     path('create/teacher/',TeacherCreateAPIView.as_view(),name='add_teacher'),
@@ -30,6 +32,9 @@ urlpatterns = [
     path('update/student/<int:id>/',StudentUpdateView.as_view(),name="update_student"),
     path('student-groups/<int:student_id>/', StudentGroupsAPIView.as_view(), name="student_groups"),
     path('get-students-by-ids/',GetStudentsByIds.as_view(),name='students-by-id'),
+    path('export/students/',StudentExportView.as_view(),name='students-export'),
+    path('import/students/',StudentImportView.as_view(),name='students-import'),
+    path('import/teachers/',TeacherImportView.as_view(),name='teachers-import'),
     path('',include(router.urls)),
 
 ]
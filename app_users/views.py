@@ -1,34 +1,58 @@
 from rest_framework.decorators import action
 from rest_framework.views import APIView
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.generics import ListAPIView, UpdateAPIView, RetrieveAPIView, get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status, generics, viewsets
+from rest_framework.exceptions import ValidationError
 from drf_yasg.utils import swagger_auto_schema
 
 from app_common.permissions import AdminUser, AdminOrOwner
-from app_common.paginations import Pagination
+from app_common.batch import fetch_by_ids, get_identity_map
+from app_common.conditional import conditional_retrieve
+from app_common.paginations import Pagination, get_pagination
+from app_common.prefetch import prefetch_for, PrefetchPlanMixin
+from app_common.serializers import ExportSerializer
+from app_common.streaming import export_response
 from app_courses.models import Group
 from app_courses.serializers import GroupSerializer
 from app_users.serializers import TeacherSerializer, UserSerializer, StudentSerializer, UserAndTeacherSerializer, \
     UserAndStudentSerializer, ParentSerializer, UserAllSerializer, GetStudentsByIdsSerializer, \
-    GetTeachersByIdsSerializer
+    GetTeachersByIdsSerializer, UserImportSerializer, check_import_size
+from app_users.importers import import_users, parse_rows
 from app_users.models import Teacher,Student,User,Parent
 
 
 #User
 
-class UserListView(generics.ListAPIView):
+class UserListView(PrefetchPlanMixin, generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserAllSerializer
     pagination_class = Pagination
     permission_classes = [AdminUser]
 
-class UserDetailView(generics.RetrieveAPIView):
+class UserDetailView(PrefetchPlanMixin, generics.RetrieveAPIView):
     queryset = User.objects.all()
     serializer_class = UserAllSerializer
     lookup_field = 'id'
     permission_classes = [AdminUser]
 
+    @conditional_retrieve(User, field='updated', lookup='id')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+class UserExportView(APIView): # Foydalanuvchilarni CSV yoki NDJSON ko‘rinishida eksport qilish (parolsiz)
+    permission_classes = [AdminUser]
+
+    @swagger_auto_schema(query_serializer=ExportSerializer)
+    def get(self, request):
+        serializer = ExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        fields = ('id', 'phone', 'full_name', 'is_active', 'is_staff', 'is_admin', 'is_student', 'is_teacher',
+                  'last_login', 'created', 'updated')
+        return export_response(User.objects.all(), fields, serializer.validated_data['output'], 'users')
+
 class UserCreateView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserAllSerializer
@@ -47,7 +71,7 @@ class UserDeleteView(generics.DestroyAPIView):
     permission_classes = [AdminUser]
 
 #Teacher
-class TeacherListView(ListAPIView):
+class TeacherListView(PrefetchPlanMixin, ListAPIView):
     queryset = Teacher.objects.all()
     serializer_class = TeacherSerializer
     pagination_class = Pagination
@@ -59,7 +83,7 @@ class TeacherUpdateView(UpdateAPIView):
     lookup_field = 'id'
     permission_classes = [AdminUser]
 
-class TeacherRetrieveAPIView(RetrieveAPIView):
+class TeacherRetrieveAPIView(PrefetchPlanMixin, RetrieveAPIView):
     queryset = Teacher.objects.all()
     serializer_class = TeacherSerializer
     lookup_field = 'id'
@@ -69,15 +93,16 @@ class GetTeachersByIds(APIView):
     permission_classes = [AdminUser]
     @swagger_auto_schema(request_body=GetTeachersByIdsSerializer)
     def post(self, request):
-        teacher_ids = request.data.get("teacher_ids", [])
-
-        if not teacher_ids or not isinstance(teacher_ids, list):
-            return Response({"error": "teacher_ids ro‘yxati bo‘lishi kerak"}, status=status.HTTP_400_BAD_REQUEST)
+        ids_serializer = GetTeachersByIdsSerializer(data=request.data)
+        if not ids_serializer.is_valid():
+            return Response(ids_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        teachers = Teacher.objects.filter(id__in=teacher_ids)
-        serializer = TeacherSerializer(teachers, many=True)
+        # Tartib saqlanadi, takroriy id lar bir marta olinadi, topilmaganlari missing da qaytariladi
+        objects, missing = fetch_by_ids(TeacherSerializer, ids_serializer.validated_data["teacher_ids"],
+                                        identity_map=get_identity_map(request))
+        serializer = TeacherSerializer(objects, many=True)
 
-        return Response({"teachers": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"teachers": serializer.data, "missing": missing}, status=status.HTTP_200_OK)
 
 class TeacherCreateAPIView(APIView):
     permission_classes = [AdminUser]
@@ -115,25 +140,67 @@ class TeacherGroupsAPIView(APIView):
         except Teacher.DoesNotExist:
             return Response({"error": "Teacher not found"}, status=404)
 
-        groups = teacher.groups.all()
+        groups = prefetch_for(GroupSerializer, teacher.groups.all())
         serializer = GroupSerializer(groups, many=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 #Student
-class StudentListView(ListAPIView):
+class StudentListView(PrefetchPlanMixin, ListAPIView):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
     pagination_class = Pagination
     permission_classes = [AdminUser]
 
+class StudentExportView(APIView): # Talabalarni CSV yoki NDJSON ko‘rinishida eksport qilish
+    permission_classes = [AdminUser]
+
+    @swagger_auto_schema(query_serializer=ExportSerializer)
+    def get(self, request):
+        serializer = ExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        fields = ('id', 'user', 'user__phone', 'user__full_name', 'description', 'created_at', 'updated_at')
+        return export_response(Student.objects.all(), fields, serializer.validated_data['output'], 'students')
+
+class UserImportView(APIView): # Talaba yoki o‘qituvchilarni CSV/JSON orqali ommaviy import qilish
+    permission_classes = [AdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+    role = None
+
+    @swagger_auto_schema(request_body=UserImportSerializer)
+    def post(self, request):
+        serializer = UserImportSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        upload = serializer.validated_data.get('file')
+        try:
+            rows = parse_rows(upload.read(), upload.name) if upload else serializer.validated_data['rows']
+        except (ValueError, UnicodeDecodeError):
+            return Response({'status': False, 'detail': 'Fayl CSV yoki JSON formatida bo‘lishi kerak'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            check_import_size(rows)
+        except ValidationError as e:
+            return Response({'status': False, 'detail': e.detail[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_users(rows, self.role)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST)
+
+class StudentImportView(UserImportView):
+    role = 'student'
+
+class TeacherImportView(UserImportView):
+    role = 'teacher'
+
 class StudentUpdateView(UpdateAPIView):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
     lookup_field = 'id'
     permission_classes = [AdminUser]
 
-class StudentRetrieveAPIView(RetrieveAPIView):
+class StudentRetrieveAPIView(PrefetchPlanMixin, RetrieveAPIView):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
     lookup_field = 'id'
@@ -144,15 +211,16 @@ class GetStudentsByIds(APIView):
     permission_classes = [AdminUser]
     @swagger_auto_schema(request_body=GetStudentsByIdsSerializer)
     def post(self, request):
-        student_ids = request.data.get("student_ids", [])
-
-        if not student_ids or not isinstance(student_ids, list):
-            return Response({"error": "student_ids ro‘yxati bo‘lishi kerak"}, status=status.HTTP_400_BAD_REQUEST)
+        ids_serializer = GetStudentsByIdsSerializer(data=request.data)
+        if not ids_serializer.is_valid():
+            return Response(ids_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        students = Student.objects.filter(id__in=student_ids)
-        serializer = StudentSerializer(students, many=True)
+        # Tartib saqlanadi, takroriy id lar bir marta olinadi, topilmaganlari missing da qaytariladi
+        objects, missing = fetch_by_ids(StudentSerializer, ids_serializer.validated_data["student_ids"],
+                                        identity_map=get_identity_map(request))
+        serializer = StudentSerializer(objects, many=True)
 
-        return Response({"students": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"students": serializer.data, "missing": missing}, status=status.HTTP_200_OK)
 
 
 class StudentCreateAPIView(APIView):
@@ -190,7 +258,7 @@ class StudentGroupsAPIView(APIView):
         except Teacher.DoesNotExist:
             return Response({"error": "Student not found"}, status=404)
 
-        groups = Group.objects.filter(g_student=student)
+        groups = prefetch_for(GroupSerializer, Group.objects.filter(g_student=student))
         serializer = GroupSerializer(groups, many=True)
 
         return Response(serializer.data, status=200)
@@ -200,14 +268,15 @@ class ParentViewSet(viewsets.ViewSet):
     permission_classes = [AdminUser]
 
     def list(self, request):
-        parents = Parent.objects.all()
-        paginator = Pagination()
+        parents = prefetch_for(ParentSerializer)
+        paginator = get_pagination(request)
         result_page = paginator.paginate_queryset(parents, request)
         serializer = ParentSerializer(result_page, many=True)
-        return Response(serializer.data)
+        return paginator.get_list_response(serializer.data)
 
+    @conditional_retrieve(Parent, related=('students',))
     def retrieve(self, request, pk=None):
-        parent = get_object_or_404(Parent, pk=pk)
+        parent = get_object_or_404(prefetch_for(ParentSerializer), pk=pk)
         serializer = ParentSerializer(parent)
         return Response(serializer.data)
 
@@ -1,3 +1,5 @@
+import sys
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from decouple import config
@@ -28,6 +30,7 @@ INSTALLED_APPS = [
     
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'drf_yasg',
 
     
@@ -41,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app_common.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,14 +77,177 @@ WSGI_APPLICATION = 'conf.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# DB_ENGINE=postgres – production (doimiy ulanishlar yoki psycopg pool), aks holda SQLite (test va lokal ishlash)
+
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = config('DB_POOL', default=False, cast=bool)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME'),
+            'USER': config('DB_USER'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            # Pool ishlatilsa ulanishlarni pool boshqaradi, CONN_MAX_AGE 0 bo‘lishi shart
+            'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+            # PgBouncer transaction rejimida server-side kursorlar ishlamaydi
+            'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+    }
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'OPTIONS': {
+                # WAL: o‘qishlar yozuvni kutmaydi; IMMEDIATE: yozuv tranzaksiyasi boshidanoq qulf oladi,
+                # shuning uchun parallel yozuvlar "database is locked" o‘rniga busy_timeout davomida kutadi
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    f"PRAGMA busy_timeout={config('DB_BUSY_TIMEOUT_MS', default=5000, cast=int)};"
+                ),
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Cache
+# REDIS_URL berilsa barcha gunicorn workerlar uchun umumiy Redis (production uchun tavsiya etiladi), aks holda
+# fayl asosidagi kesh (bitta serverdagi protsesslar o‘rtasida umumiy, lokal ishlash uchun). Testlar har bir
+# ishga tushishda yangi LocMemCache oladi, shuning uchun oldingi ishga tushishdan qolgan kalitlar ko‘rinmaydi.
+# Fayl keshida JWT foydalanuvchi holati, blacklist, throttle va model versiyalari ham saqlanadi: CACHE_MAX_ENTRIES
+# ularni siqib chiqarmaydigan darajada katta, to‘lganda CACHE_CULL_FREQUENCY bo‘yicha yozuvlarning 1/N qismi o‘chadi.
+
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default='n57')
+CACHE_TIMEOUT = config('CACHE_TIMEOUT', default=300, cast=int)
+
+if TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'n57-test',
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'TIMEOUT': CACHE_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
     }
+elif REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=str(Path(tempfile.gettempdir()) / 'n57-cache')),
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'TIMEOUT': CACHE_TIMEOUT,
+            'OPTIONS': {
+                'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=50000, cast=int),
+                'CULL_FREQUENCY': config('CACHE_CULL_FREQUENCY', default=10, cast=int),
+            },
+        }
+    }
+
+
+# Password hashing
+# PASSWORD_HASHER – yangi parollar uchun algoritm (pbkdf2, scrypt yoki argon2; argon2-cffi requirements da bor). Qolganlari ro‘yxatda qoladi,
+# shuning uchun eski xeshlar tekshiriladi va login paytida check_password ularni avtomatik qayta xeshlaydi.
+
+_PASSWORD_HASHERS = {
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+AUTH_USER_CACHE_SECONDS = config('AUTH_USER_CACHE_SECONDS', default=60, cast=int)  # JWT so‘rovlarida foydalanuvchi holati keshi
+
+# Token bucket cheklovlari: endpoint (throttle_scope) -> {'phone': 'N/period', 'ip': 'N/period'}
+THROTTLE_BUCKETS = {
+    'login': {
+        'phone': config('THROTTLE_LOGIN_PHONE', default='5/min'),
+        'ip': config('THROTTLE_LOGIN_IP', default='30/min'),
+    },
+    'otp': {
+        'phone': config('THROTTLE_OTP_PHONE', default='5/min'),
+        'ip': config('THROTTLE_OTP_IP', default='30/min'),
+    },
+    'password-reset': {
+        'phone': config('THROTTLE_PASSWORD_RESET_PHONE', default='3/min'),
+        'ip': config('THROTTLE_PASSWORD_RESET_IP', default='20/min'),
+    },
 }
 
+# SQL instrumentatsiyasi (app_common.middleware): Server-Timing header, query_stats log va so‘rovlar byudjeti.
+# QUERY_BUDGETS – view nomi (resolver_match.view_name) -> ruxsat etilgan so‘rovlar soni.
+# QUERY_BUDGET_STRICT – byudjetdan oshgan so‘rov xato bilan tugaydi (testlarda avtomatik yoqiladi).
+
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=True, cast=bool)
+QUERY_DUPLICATE_THRESHOLD = config('QUERY_DUPLICATE_THRESHOLD', default=5, cast=int)
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', default=0, cast=int)
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=TESTING, cast=bool)
+QUERY_BUDGETS = {
+    # Ro‘yxatlar sahifadagi yozuvlar sonidan qat’i nazar o‘zgarmas miqdordagi so‘rov bilan olinadi
+    'users:user-list': 5,
+    'users:all_students': 5,
+    'users:all_teachers': 4,
+    'users:parent-list': 6,
+    'courses:group-list': 4,
+    'courses:homework-list': 3,
+    'courses:homework-submission-list': 3,
+    'courses:homework-submission-pending': 3,
+    'courses:homework-review-list': 3,
+    'courses:table-list': 3,
+    'payments:payment-list': 3,
+    'attendances:attendance-list': 3,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'app_common.queries': {
+            'handlers': ['console'],
+            'level': config('QUERY_LOG_LEVEL', default='WARNING'),  # INFO – har bir so‘rov loglanadi
+            'propagate': False,
+        },
+    },
+}
+
+# Login/refresh shu vaqtdan oshsa app_auth logger bosqichlar bo‘yicha ogohlantiradi. 0 – o‘chirilgan: standart PBKDF2 ning o‘zi
+# 1 s dan ortiq davom etadi, shuning uchun byudjet serverda o‘lchangan p95 dan kelib chiqib beriladi
+LOGIN_LATENCY_BUDGET_MS = config('LOGIN_LATENCY_BUDGET_MS', default=0, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -134,7 +301,7 @@ AUTH_USER_MODEL = 'app_users.User'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'app_auth.authentication.CachedJWTAuthentication',
     ),
 
     'DEFAULT_PARSER_CLASSES': [
@@ -147,10 +314,11 @@ REST_FRAMEWORK = {
 }
 
 SIMPLE_JWT = {
-    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=3),
-    "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=config('ACCESS_TOKEN_LIFETIME_MINUTES', default=15, cast=int)),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=config('REFRESH_TOKEN_LIFETIME_DAYS', default=1, cast=int)),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "app_auth.serializers.CachedTokenRefreshSerializer",
 }
 
 SWAGGER_SETTINGS = {
@@ -166,3 +334,11 @@ SWAGGER_SETTINGS = {
 }
 
 
+
+# import_users buyrug‘i: parollar shuncha protsessda xeshlanadi (1 – protsess puli ishlatilmaydi).
+# API orqali import har doim so‘rov protsessining o‘zida xeshlaydi
+USER_IMPORT_HASH_WORKERS = config('USER_IMPORT_HASH_WORKERS', default=4, cast=int)
+# API orqali import: parollar so‘rov ichida ketma-ket xeshlanadi (PBKDF2 ~0.4 s), shuning uchun hajm cheklanadi.
+# Bundan katta fayllar import_users buyrug‘i bilan yuklanadi
+USER_IMPORT_API_MAX_ROWS = config('USER_IMPORT_API_MAX_ROWS', default=100, cast=int)
+USER_IMPORT_API_MAX_FILE_SIZE = config('USER_IMPORT_API_MAX_FILE_SIZE', default=256 * 1024, cast=int)